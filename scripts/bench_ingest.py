@@ -0,0 +1,109 @@
+"""
+MIDI ingestion benchmark: the pretty_midi + VisualBlock path against the
+structure-of-arrays path (read_note_array + argsort, colors looked up only
+when blocks are rendered).
+
+Runs over the bundled MIDI files and a generated orchestral-size file, and
+reports wall time and peak Python memory for each path.
+Run: python scripts/bench_ingest.py [notes per track] [tracks]
+"""
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+import contextlib
+import io
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import mido  # type: ignore
+import pretty_midi  # type: ignore
+from logic.services.midi_ingestor import MidiIngestor, notes_to_blocks, PITCH_CLASS_COLORS, MIN_BLOCK_DURATION  # type: ignore
+
+project_root = Path(__file__).parent.parent
+
+def write_big_midi(path: Path, notes_per_track: int, n_tracks: int):
+    """A type-1 file with a tempo track and n_tracks dense instrument tracks."""
+    mid = mido.MidiFile(type=1, ticks_per_beat=480)
+    tempo = mido.MidiTrack()
+    for i in range(64):
+        tempo.append(mido.MetaMessage("set_tempo", tempo=mido.bpm2tempo(90 + i % 40), time=0 if i == 0 else 1920))
+    mid.tracks.append(tempo)
+    for t in range(n_tracks):
+        track = mido.MidiTrack()
+        track.append(mido.MetaMessage("track_name", name=f"Part {t + 1}", time=0))
+        track.append(mido.Message("program_change", channel=t % 9, program=40 + t, time=0))
+        for i in range(notes_per_track):
+            pitch = 36 + (t * 7 + i * 5) % 60
+            track.append(mido.Message("note_on", channel=t % 9, note=pitch, velocity=64 + i % 40, time=120 if i else 0))
+            track.append(mido.Message("note_off", channel=t % 9, note=pitch, velocity=0, time=100))
+        mid.tracks.append(track)
+    mid.save(str(path))
+
+@dataclass
+class VisualBlock:
+    pitch: int
+    start_time: float
+    duration: float
+    color: str
+
+def legacy_select_piano_track(pm: pretty_midi.PrettyMIDI):
+    """The old pretty_midi heuristic: first non-drum program 0, else the non-drum instrument with most notes."""
+    for inst in pm.instruments:
+        if not inst.is_drum and inst.program == 0:
+            return inst
+    candidates = [inst for inst in pm.instruments if not inst.is_drum and inst.notes]
+    return max(candidates, key=lambda inst: len(inst.notes), default=None)
+
+def legacy_ingest(ingestor: MidiIngestor, path: Path) -> list:
+    """The pretty_midi + VisualBlock path the ingestor used before the array rewrite."""
+    pm = pretty_midi.PrettyMIDI(str(path))
+    track = legacy_select_piano_track(pm)
+    blocks = [VisualBlock(n.pitch, n.start, max(n.end - n.start, MIN_BLOCK_DURATION),
+                          str(PITCH_CLASS_COLORS[n.pitch % 12])) for n in track.notes]
+    blocks.sort(key=lambda b: b.start_time)
+    return [asdict(b) for b in blocks]
+
+def array_ingest(ingestor: MidiIngestor, path: Path) -> list:
+    notes, _ = ingestor.load_notes(str(path))
+    return notes_to_blocks(notes)
+
+def array_only(ingestor: MidiIngestor, path: Path):
+    return ingestor.load_notes(str(path))[0]
+
+def measure(fn, *args):
+    """Times one run, then repeats it under tracemalloc (which slows it down) for peak memory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    notes_per_track = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_tracks = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    ingestor = MidiIngestor()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big = Path(tmp) / "orchestral.mid"
+        write_big_midi(big, notes_per_track, n_tracks)
+        files = [project_root / "database" / "repertoire" / "Fur_Elise.mid",
+                 project_root / "database" / "test_song.mid", big]
+
+        print(f"{'file':<16} {'path':<20} {'notes':>8} {'time ms':>9} {'peak MB':>8}")
+        for path in files:
+            for name, fn in (("pretty_midi+blocks", legacy_ingest), ("arrays+blocks", array_ingest),
+                             ("arrays only", array_only)):
+                result, elapsed, peak = measure(fn, ingestor, path)
+                print(f"{path.name:<16} {name:<20} {len(result):>8} {elapsed * 1000:>9.1f} {peak / 1e6:>8.1f}")
+
+if __name__ == "__main__":
+    main()
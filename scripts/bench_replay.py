@@ -0,0 +1,46 @@
+"""
+Throughput benchmark for the exercise flow.
+Replays a synthetic 120-step lesson and the onboarding evaluation through the
+real services on a virtual clock (no QApplication, no real timers) and reports
+events/sec and per-event handler latency.
+Run: python scripts/bench_replay.py [steps]
+"""
+import sys
+import os
+import tempfile
+import contextlib
+import io
+from pathlib import Path
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logic.services.database_manager import DatabaseManager  # type: ignore
+from logic.services.chord_trainer import ChordTrainerService  # type: ignore
+from logic.services.evaluation_service import EvaluationService  # type: ignore
+from logic.services.clock import VirtualClock  # type: ignore
+from logic.services.midi_replay import LessonReplay, EvaluationReplay, build_synthetic_lesson  # type: ignore
+
+project_root = Path(__file__).parent.parent
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(Path(tmp) / "bench.db")
+
+        clock = VirtualClock()
+        trainer = ChordTrainerService(db, clock=clock)
+        # The services log every step; keep that out of the timing
+        with contextlib.redirect_stdout(io.StringIO()):
+            lesson = LessonReplay(trainer, clock).run(build_synthetic_lesson(steps))
+        print(f"Lesson     : {lesson.summary()}")
+
+        clock = VirtualClock()
+        engine = EvaluationService(db, project_root, Path(tmp) / "sequences.pack", clock=clock)
+        with contextlib.redirect_stdout(io.StringIO()):
+            evaluation = EvaluationReplay(engine, clock).run()
+        print(f"Evaluation : {evaluation.summary()}")
+
+if __name__ == "__main__":
+    main()
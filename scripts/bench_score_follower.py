@@ -0,0 +1,91 @@
+"""
+Score-following benchmark: can ScoreFollower keep up with fast passages?
+
+Generates a dense song (sixteenth notes at 160 BPM with four-note chords on
+every beat, about 19 notes a second as written) and a performance of it that drifts
+between 60% and 130% of the written tempo, with timing jitter, dropped notes
+and wrong notes. Reports the cost per played note (mean, 99th percentile,
+max) for songs of growing length, and how far the follower's song time is
+from the true one.
+Run: python scripts/bench_score_follower.py [seconds of music]
+"""
+import sys
+import os
+import time
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from logic.services.midi_ingestor import NOTE_DTYPE  # type: ignore
+from logic.services.score_follower import ScoreFollower  # type: ignore
+
+STEP = 60.0 / 160 / 4  # A sixteenth at 160 BPM
+
+
+def dense_song(seconds: float, rng) -> np.ndarray:
+    starts, pitches = [], []
+    for k in range(int(seconds / STEP)):
+        t = k * STEP
+        starts.append(t)
+        pitches.append(60 + int(rng.integers(0, 24)))
+        if k % 4 == 0:
+            root = 36 + int(rng.integers(0, 12))
+            starts += [t] * 3
+            pitches += [root, root + 4, root + 7]
+    notes = np.zeros(len(starts), dtype=NOTE_DTYPE)
+    notes["start"], notes["pitch"], notes["duration"] = starts, pitches, STEP
+    return notes[np.argsort(notes["start"], kind="stable")]
+
+
+def performance(notes: np.ndarray, rng):
+    """(pitch, performance time, score time); wrong notes have score time NaN."""
+    played, perf, last = [], 0.0, 0.0
+    for pitch, t in zip(notes["pitch"].tolist(), notes["start"].tolist()):
+        rate = 0.95 + 0.35 * np.sin(t / 20.0)  # Between 60% and 130% of the written tempo
+        perf += (t - last) / rate
+        last = t
+        when = perf + rng.normal(0.0, 0.01)
+        if rng.random() < 0.03:
+            continue  # Dropped
+        if rng.random() < 0.03:
+            played.append((pitch + int(rng.choice([-1, 1])), when - 0.005, float("nan")))
+        played.append((pitch, when, t))
+    played.sort(key=lambda p: p[1])
+    return played
+
+
+def run(seconds: float):
+    rng = np.random.default_rng(7)
+    notes = dense_song(seconds, rng)
+    played = performance(notes, rng)
+
+    begin = time.perf_counter()
+    follower = ScoreFollower(notes)
+    setup = time.perf_counter() - begin
+
+    costs, errors = np.empty(len(played)), []
+    for i, (pitch, when, t) in enumerate(played):
+        start = time.perf_counter()
+        follower.note_on(pitch, when)
+        costs[i] = time.perf_counter() - start
+        if t == t:
+            errors.append(abs(follower.score_time_at(when) - t))
+
+    span = played[-1][1] - played[0][1]
+    errors = np.array(errors)
+    print(f"{seconds:>6.0f} s of music, {len(notes):>7} notes ({len(played) / span:.0f} notes/s played): "
+          f"setup {setup * 1e3:6.1f} ms | per note mean {costs.mean() * 1e6:5.1f} us, "
+          f"p99 {np.percentile(costs, 99) * 1e6:5.1f} us, max {costs.max() * 1e6:6.1f} us | "
+          f"error median {np.median(errors) * 1e3:4.1f} ms, p95 {np.percentile(errors, 95) * 1e3:5.1f} ms | "
+          f"final event {follower.event_index + 1}/{follower.n_events}")
+
+
+def main():
+    longest = float(sys.argv[1]) if len(sys.argv) > 1 else 600.0
+    for seconds in (30.0, longest / 10, longest):
+        run(seconds)
+
+
+if __name__ == "__main__":
+    main()
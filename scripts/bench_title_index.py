@@ -0,0 +1,66 @@
+"""
+Title search benchmark: how long does a query take as the repertoire grows?
+
+Fills a temporary repertoire folder with generated file names (Composer/
+sonata_prelude_in_C_No123.mid and so on), refreshes the index over it, and
+reports the refresh time and the mean and worst time per search() and per
+local_match() for a few typical queries.
+Run: python scripts/bench_title_index.py [files]
+"""
+import sys
+import os
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logic.services.title_index import TitleIndex  # type: ignore
+
+WORDS = ["sonata", "prelude", "etude", "waltz", "nocturne", "minuet", "march", "rondo", "fugue", "suite"]
+KEYS = ["C", "D", "E", "F", "G", "A", "B"]
+QUERIES = ["moonlight", "fur elise", "waltz in e", "prelude fugue no 1281", "composer7 rondo"]
+
+
+def timed(fn, queries, rounds=20):
+    costs = []
+    for _ in range(rounds):
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            costs.append(time.perf_counter() - start)
+    return sum(costs) / len(costs), max(costs)
+
+
+def run(n_files: int):
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        root = tmp / "repertoire"
+        for k in range(n_files):
+            path = root / f"Composer{k % 40}" / f"{WORDS[k % 10]}_{WORDS[(k // 10) % 10]}_in_{KEYS[k % 7]}_No{k}.mid"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"MThd")
+        index = TitleIndex(root, tmp / "title_index.json")
+        begin = time.perf_counter()
+        index.refresh()
+        refresh = time.perf_counter() - begin
+        index.search("warm up")
+        search_mean, search_max = timed(index.search, QUERIES)
+        local_mean, local_max = timed(index.local_match, QUERIES)
+        print(f"{n_files:>7} files: refresh {refresh * 1e3:7.1f} ms | "
+              f"search mean {search_mean * 1e6:6.1f} us, max {search_max * 1e6:6.1f} us | "
+              f"local_match mean {local_mean * 1e6:6.1f} us, max {local_max * 1e6:6.1f} us")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for n_files in (largest // 20, largest // 4, largest):
+        run(n_files)
+
+
+if __name__ == "__main__":
+    main()
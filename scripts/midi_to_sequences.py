@@ -0,0 +1,53 @@
+"""
+Convert MIDI files into evaluation / play-along sequences.
+
+Each file is converted at every requested difficulty and written as one
+sequences.json-style list. Conversions are cached by file hash under
+database/cache/sequences/, so re-running over an unchanged repertoire is
+near-instant.
+
+Run: python scripts/midi_to_sequences.py [files or dirs ...] [--difficulty 1 5 8] [--output levels.json]
+     (defaults to every .mid in database/repertoire/)
+"""
+import sys
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logic.services.sequence_builder import SequenceBuilder  # type: ignore
+
+project_root = Path(__file__).parent.parent
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path, default=[project_root / "database" / "repertoire"])
+    parser.add_argument("--difficulty", nargs="+", type=int, default=[1, 3, 5, 7])
+    parser.add_argument("--output", type=Path, help="Write the levels here (e.g. a copy of sequences.json)")
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        files.extend(sorted(path.glob("*.mid")) if path.is_dir() else [path])
+
+    builder = SequenceBuilder(project_root / "database" / "cache" / "sequences")
+    start = time.perf_counter()
+    levels = builder.convert_all(files, args.difficulty)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for level in levels:
+        hands = "".join(sorted({n["hand"] for n in level["notes"]}))
+        print(f"Level {level['level']:>2}: {level['title']:<30} {level['tempo_bpm']:>3} BPM  "
+              f"{len(level['notes']):>3} notes  hands {hands}")
+    print(f"{len(levels)} levels from {len(files)} files in {elapsed_ms:.1f}ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(levels, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
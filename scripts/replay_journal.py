@@ -0,0 +1,74 @@
+"""
+Inspect and replay a recorded MIDI journal (database/journals/*.ccmj).
+
+Prints every note event with the set of keys held at that moment, which is
+usually enough to answer "it didn't register my chord". With --chord, the
+journal is also pushed through a ChordTrainerService on a virtual clock with
+that chord as the fixed target, to see exactly what the trainer made of it.
+
+Run: python scripts/replay_journal.py <journal> [--chord "Eb Minor"]
+"""
+import sys
+import os
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logic.services.midi_journal import MidiJournalReader  # type: ignore
+from logic.services.midi_replay import ReplayHarness, NoteEvent  # type: ignore
+from logic.services.clock import VirtualClock  # type: ignore
+from logic.services.database_manager import DatabaseManager  # type: ignore
+from logic.services.chord_trainer import ChordTrainerService  # type: ignore
+
+NOTE_NAMES = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+
+def note_name(pitch: int) -> str:
+    return f"{NOTE_NAMES[pitch % 12]}{pitch // 12 - 1}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("journal", type=Path)
+    parser.add_argument("--chord", help='Replay against a fixed target, e.g. "C Major"')
+    args = parser.parse_args()
+
+    with MidiJournalReader(args.journal) as reader:
+        print(f"{args.journal.name}: {len(reader)} messages")
+        events = reader.note_events()
+
+    held = set()
+    for ev in events:
+        if isinstance(ev, NoteEvent):
+            (held.add if ev.is_on else held.discard)(ev.pitch)
+            action = "ON " if ev.is_on else "OFF"
+            keys = " ".join(note_name(p) for p in sorted(held))
+            print(f"{ev.time:10.3f}s  {action} {note_name(ev.pitch):<4}  held: [{keys}]")
+        else:
+            print(f"{ev.time:10.3f}s  PEDAL {'DOWN' if ev.is_down else 'UP'}")
+
+    if not args.chord:
+        return
+
+    root_name, _, type_name = args.chord.partition(" ")
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = VirtualClock()
+        trainer = ChordTrainerService(DatabaseManager(Path(tmp) / "replay.db"), clock=clock)
+        if root_name not in trainer.ROOT_NOTES or type_name not in trainer.CHORD_TYPES:
+            print(f"Unknown chord '{args.chord}'")
+            sys.exit(1)
+        trainer.chordSuccess.connect(lambda name, ms: print(f"  -> SUCCESS {name} at {clock.now():.3f}s ({ms:.0f}ms)"))
+        trainer.chordFailed.connect(lambda: print(f"  -> FAILED at {clock.now():.3f}s, held {sorted(trainer._active_pitches)}"))
+
+        # Fixed-target free practice: every new target is the requested chord
+        root_idx = trainer.ROOT_NOTES.index(root_name)
+        intervals = trainer.CHORD_TYPES[type_name]
+        trainer._apply_random_step = lambda: trainer._setup_target(root_idx, type_name, intervals, 4)
+        trainer.start_session()
+
+        print(f"\nReplaying against target {args.chord}:")
+        ReplayHarness(clock, trainer.handle_midi_note, trainer.handle_pedal_event).play(events)
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,8 @@ from logic.services.repertoire_crawler import RepertoireCrawler
 
 class TestCrawlerHarness:
     def __init__(self):
-        self.crawler = RepertoireCrawler()
+        self.crawler = RepertoireCrawler(project_root / "database" / "repertoire",
+                                         project_root / "database" / "cache" / "http")
         self.crawler.downloadComplete.connect(self.on_success)
         self.crawler.downloadFailed.connect(self.on_fail)
         self.finished = False
@@ -7,18 +7,22 @@ sys.path.append(str(project_root / "src"))
 
 from logic.services.midi_ingestor import MidiIngestor
 
-def on_parsed(blocks):
-    if not blocks:
+def on_parsed(count):
+    if not count:
         print("Empty blocks returned!")
         sys.exit(1)
-        
-    print(f"\n--- Output of {len(blocks)} Visual Blocks ---")
-    
-    # Print the first 10
-    for i, b in enumerate(blocks[:10]):
-        print(f"Block {i+1}: Note {b['pitch']} | Time: {b['start_time']:.2f}s | Dur: {b['duration']:.2f}s | Color: {b['color']}")
-        
-    if len(blocks) > 10:
+
+    # Blocks are served through the model, a time window at a time
+    model = ingestor.block_model
+    first = float(ingestor.notes["start"][0])
+    model.setWindow(first, first + 10.0)
+    print(f"\n--- {count} Visual Blocks, {model.count} in the first 10s from {first:.2f}s ---")
+    for i in range(min(model.count, 10)):
+        index = model.index(i)
+        print(f"Block {i+1}: Note {model.data(index, model.PitchRole)} | Time: {model.data(index, model.StartTimeRole):.2f}s | "
+              f"Dur: {model.data(index, model.DurationRole):.2f}s | Color: {model.data(index, model.ColorRole)}")
+
+    if model.count > 10:
         print("...[truncated]")
 
 def on_metadata(meta):
@@ -32,6 +36,7 @@ def main():
         print(f"Error: Could not find {test_file}")
         sys.exit(1)
         
+    global ingestor
     ingestor = MidiIngestor()
     
     # Connect signals
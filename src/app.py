@@ -12,6 +12,8 @@ import os
 import time
 import random
 import ctypes
+import threading
+import multiprocessing
 from PySide6.QtWebEngineQuick import QtWebEngineQuick # type: ignore
 from pathlib import Path
 # --- Platform Helpers ---
@@ -137,20 +139,27 @@ class LowLevelMidiOutput:
 
 from logic.services.gemini_service import GeminiService # type: ignore
 from logic.services.midi_ingestor import MidiIngestor # type: ignore
-# from logic.services.repertoire_crawler import RepertoireCrawler # type: ignore
+from logic.services.repertoire_indexer import RepertoireIndexer # type: ignore
+from logic.services.repertoire_crawler import RepertoireCrawler # type: ignore
+from logic.services.title_index import TitleIndex # type: ignore
 from logic.services.database_manager import DatabaseManager # type: ignore
 from logic.services.chord_trainer import ChordTrainerService # type: ignore
 from logic.services.evaluation_service import EvaluationService # type: ignore
+from logic.services.play_along import PlayAlongService # type: ignore
 from logic.services.adaptive_engine import AdaptiveEngineService # type: ignore
 from logic.services.settings_service import SettingsService # type: ignore
 from logic.services.curriculum_service import CurriculumService # type: ignore
+from logic.services.midi_journal import MidiJournalWriter, MidiJournalReader, JournalPlayback # type: ignore
+from logic.services.onset_grouper import ChordOnsetGrouper # type: ignore
 
 class AppState(QObject):
-    midiNoteReceived = Signal(int, bool)
+    midiNoteReceived = Signal(int, bool, int, float)
     aiTranscriptReceived = Signal(str)
     aiConnectedChanged = Signal(bool)
     evalIntroPendingChanged = Signal(bool)
     sustainPedalChanged = Signal(bool)
+    songFetched = Signal(str)  # Path of the requested song, found locally or downloaded
+    songFetchFailed = Signal(str)
     
     def __init__(self):
         super().__init__()
@@ -159,16 +168,46 @@ class AppState(QObject):
         self._eval_audio_received = False
         self._is_sustain_pedal_down = False
         self._gemini = GeminiService()
-        self.midi_ingestor = MidiIngestor()
-        # self.crawler = RepertoireCrawler()
+        self.midi_ingestor = MidiIngestor(project_root / "database" / "cache" / "midi")
+        self.crawler = RepertoireCrawler(project_root / "database" / "repertoire", project_root / "database" / "cache" / "http")
+        self.crawler.downloadComplete.connect(self._on_song_downloaded)
+        self.crawler.downloadFailed.connect(self.songFetchFailed)
         self.db = DatabaseManager(project_root / "database" / "userdata.db")
+        # Searches are answered from the on-disk title index right away; the refresh catches up with new files
+        self.title_index = TitleIndex(project_root / "database" / "repertoire",
+                                      project_root / "database" / "cache" / "title_index.json")
+        # Index new or changed repertoire MIDI files in the background (a process pool does the parsing)
+        self.repertoire_indexer = RepertoireIndexer(self.db, project_root / "database" / "repertoire")
+        threading.Thread(target=self._index_repertoire, daemon=True).start()
         self.settings = SettingsService(self.db, project_root)
         self.curriculum = CurriculumService(self.db, project_root / "src" / "resources")
+        self.curriculum.midi_ingestor = self.midi_ingestor
+        self.settings.curriculum = self.curriculum
         self.chord_trainer = ChordTrainerService(self.db, self.curriculum, self.settings)
-        self.evaluation_engine = EvaluationService(self.db, project_root)
+        self.evaluation_engine = EvaluationService(self.db, project_root,
+                                                   project_root / "database" / "cache" / "sequences.pack")
+        self.play_along = PlayAlongService(self.db, self.midi_ingestor)
         self.adaptive_engine = AdaptiveEngineService(self.db, self.settings)
         self._lesson_plan_waiting = False
         
+        # Coalesce the note-ons of one chord strike so the trainer evaluates it once
+        self.onset_grouper = ChordOnsetGrouper(
+            self.chord_trainer.handle_chord_strike,
+            lambda pitch: self.chord_trainer.handle_midi_note(pitch, False),
+            window_ms=self.settings.chordOnsetWindowMs,
+        )
+        self.settings.inputSettingsChanged.connect(self._sync_input_settings)
+        
+        # Raw MIDI journal: every input message with its hardware timestamp, one file per session
+        self._midi_clock = 0.0
+        self._journal_playback = None
+        self.journal = MidiJournalWriter(project_root / "database" / "journals")
+        try:
+            print(f"AppState: Recording MIDI journal to {self.journal.start()}")
+        except OSError as e:
+            print(f"AppState: MIDI journal disabled: {e}")
+            self.journal = None
+        
         # Low-level MIDI output for hardware feedback
         self._ll_midi_out = None
         try:
@@ -523,17 +562,22 @@ class AppState(QObject):
         """Called by C++ RtMidi thread."""
         if not message:
             return
+        
+        # RtMidi reports the time since the previous message; accumulate it into a session clock
+        self._midi_clock += deltatime
+        if self.journal:
+            self.journal.append(self._midi_clock, message)
             
         status = message[0] & 0xF0
         if status == 0x90: # Note On
             pitch = message[1]
             velocity = message[2] if len(message) > 2 else 0
             is_on = velocity > 0
-            self.midiNoteReceived.emit(pitch, is_on)
+            self.midiNoteReceived.emit(pitch, is_on, velocity, self._midi_clock)
                 
         elif status == 0x80: # Note Off
             pitch = message[1]
-            self.midiNoteReceived.emit(pitch, False)
+            self.midiNoteReceived.emit(pitch, False, 0, self._midi_clock)
 
         elif status == 0xB0: # Control Change
             controller = message[1]
@@ -544,13 +588,47 @@ class AppState(QObject):
                     self._is_sustain_pedal_down = is_down
                     self.sustainPedalChanged.emit(is_down)
 
-    @Slot(int, bool)
-    def _dispatch_midi_note(self, pitch: int, is_on: bool):
+    @Slot(int, bool, int, float)
+    def _dispatch_midi_note(self, pitch: int, is_on: bool, velocity: int, hw_time: float):
         """Called on main UI thread via queued connection from midiNoteReceived signal."""
         if self.evaluation_engine.isRunning:
+            self.onset_grouper.flush()
             self.evaluation_engine.handle_midi_note(pitch, is_on)
+        elif self.play_along.isRunning:
+            # Song notes are matched one by one, chords included
+            self.onset_grouper.flush()
+            self.play_along.handle_midi_note(pitch, is_on)
+        elif self.chord_trainer.exerciseType == "pentascale":
+            # Scale steps are timed per note; don't hold them back for a window
+            self.onset_grouper.flush()
+            self.chord_trainer.handle_midi_note(pitch, is_on, velocity)
+        elif is_on:
+            self.onset_grouper.note_on(pitch, hw_time, velocity)
         else:
-            self.chord_trainer.handle_midi_note(pitch, is_on)
+            self.onset_grouper.note_off(pitch, hw_time)
+
+    def _sync_input_settings(self):
+        self.onset_grouper.window_ms = self.settings.chordOnsetWindowMs
+
+    @Slot(str)
+    def replayJournal(self, path: str):
+        """Pushes a recorded MIDI journal back through the normal note dispatch with its original timing."""
+        try:
+            with MidiJournalReader(Path(path)) as reader:
+                events = reader.note_events()
+        except (OSError, ValueError) as e:
+            print(f"AppState: Could not read MIDI journal {path}: {e}")
+            return
+        print(f"AppState: Replaying {len(events)} journal events from {path}")
+        if self._journal_playback:
+            self._journal_playback.stop()
+        self._journal_playback = JournalPlayback(events, self._dispatch_midi_note, self._replay_pedal)
+        self._journal_playback.start()
+
+    def _replay_pedal(self, is_down: bool):
+        if is_down != self._is_sustain_pedal_down:
+            self._is_sustain_pedal_down = is_down
+            self.sustainPedalChanged.emit(is_down)
 
     @Slot(str)
     def _on_ai_text(self, text: str):
@@ -592,6 +670,10 @@ class AppState(QObject):
     def evaluationEngine(self):
         return self.evaluation_engine
 
+    @Property(QObject, constant=True)
+    def playAlong(self):
+        return self.play_along
+
     @Property(QObject, constant=True)
     def adaptiveEngine(self):
         return self.adaptive_engine
@@ -603,12 +685,36 @@ class AppState(QObject):
     @Property(QObject, constant=True)
     def settingsService(self):
         return self.settings
+
+    @Property(QObject, constant=True)
+    def midiIngestor(self):
+        return self.midi_ingestor
+
+    # Blocks of the ingested song inside the view's time window (call noteBlocks.setWindow while scrolling)
+    @Property(QObject, constant=True)
+    def noteBlocks(self):
+        return self.midi_ingestor.block_model
             
+    def _index_repertoire(self):
+        self.title_index.refresh()
+        self.repertoire_indexer.scan()
+
     @Slot(str)
     def fetch_song(self, query: str):
         print(f"AppState: UI requested song fetch for '{query}'")
+        # Only go to the network when no file on disk clearly is the song asked for
+        hit = self.title_index.local_match(query)
+        if hit and os.path.exists(hit["path"]):
+            print(f"AppState: Found '{hit['title']}' locally")
+            self.songFetched.emit(hit["path"])
+            return
         self.crawler.search_and_download(query)
 
+    def _on_song_downloaded(self, path: str):
+        self.title_index.update_file(path)
+        self.title_index.save()
+        self.songFetched.emit(path)
+
 def main():
     # Load env vars manually for local testing
     env_file = project_root / ".env"
@@ -633,6 +739,10 @@ def main():
 
     app_state = AppState()
     engine.rootContext().setContextProperty("appState", app_state)
+    # Sessions closed by quitting the app still merge their stats into the DB
+    app.aboutToQuit.connect(app_state.chord_trainer._flush_session_stats)
+    if app_state.journal:
+        app.aboutToQuit.connect(app_state.journal.close)
     
     # Add UI components path
     engine.addImportPath(str(project_root / "src" / "ui" if not getattr(sys, 'frozen', False) else project_root / "ui"))
@@ -649,4 +759,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Frozen builds: pool workers re-enter here
     main()
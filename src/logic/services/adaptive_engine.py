@@ -2,6 +2,7 @@ import os
 import json
 import urllib.request
 import threading
+from typing import Optional
 from PySide6.QtCore import QObject, Signal, Slot, Property # type: ignore
 
 class AdaptiveEngineService(QObject):
@@ -47,11 +48,12 @@ class AdaptiveEngineService(QObject):
         
         # Fetch the real raw skill matrix from the database
         user_context = self.db.get_coach_context()
+        confusions = self.db.get_top_confusions(limit=1)
         
         # Query Gemini in a background thread to prevent UI freezing
-        threading.Thread(target=self._query_gemini_for_lesson, args=(user_context,), daemon=True).start()
+        threading.Thread(target=self._query_gemini_for_lesson, args=(user_context, confusions), daemon=True).start()
 
-    def _query_gemini_for_lesson(self, user_context: str):
+    def _query_gemini_for_lesson(self, user_context: str, confusions: Optional[list] = None):
         api_key = self.settings.apiKey if self.settings else os.environ.get("GOOGLE_API_KEY")
         if not api_key:
             self._set_error("No API key found. Cannot connect to AI Coach.")
@@ -65,6 +67,7 @@ Here is the user's current skill matrix based on recent practice sessions:
 {user_context}
 
 Analyze this context to determine the single most pressing bottleneck or weakness the user has right now. 
+If the context lists frequent wrong notes, treat a repeated wrong note in a chord as strong evidence of the bottleneck.
 If the context is empty or shows no struggles, assume they are a beginner who needs to learn basic pop chord transitions.
 
 Return ONLY a raw JSON object (no markdown formatting, no backticks) with two keys:
@@ -86,6 +89,12 @@ Return ONLY a raw JSON object (no markdown formatting, no backticks) with two ke
                 # Default fallback values
                 desc = "It looks like you're struggling with the C to G pivot. Let's watch this quick tip!"
                 search_query = "piano tutorial transition C major G major"
+                if confusions:
+                    # A measured, repeated wrong note is a better fallback than a generic tip
+                    top = confusions[0]
+                    desc = (f"You often play {top['played']} instead of {top['expected']} in {top['target']}. "
+                            f"Let's look at how that chord is built so your fingers find the right key.")
+                    search_query = f"piano how to play {top['target']} chord"
                 
                 from urllib.parse import quote
                 import re
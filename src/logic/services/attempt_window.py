@@ -0,0 +1,96 @@
+"""
+AttemptWindows — rolling in-memory record of the last N attempts per item.
+
+One fixed-size ring buffer per chord and per curriculum milestone holds the
+most recent outcomes and latencies with running sums, so rolling accuracy and
+mean latency are O(1) reads. DatabaseManager owns the instance: it warms it
+from attempt_history (pruned to the same N rows per item) once at startup
+and writes through on every recorded attempt, so milestone-advancement
+checks during a lesson run without SQL.
+"""
+from array import array
+from typing import Dict, Iterable, Tuple
+
+
+class RollingWindow:
+    __slots__ = ("size", "total", "_success", "_latency", "_pos", "_count",
+                 "_successes", "_latency_sum", "_latency_n")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.total = 0  # Lifetime attempts, not just those still in the window
+        self._success = array('B', bytes(size))
+        self._latency = array('d', bytes(8 * size))
+        self._pos = 0
+        self._count = 0
+        self._successes = 0
+        self._latency_sum = 0.0
+        self._latency_n = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, success: bool, latency_ms: float = 0.0):
+        """Records one attempt; latency is averaged over successful attempts only."""
+        i = self._pos
+        if self._count == self.size:
+            # Evict the oldest attempt from the running sums
+            self._successes -= self._success[i]
+            if self._success[i]:
+                self._latency_sum -= self._latency[i]
+                self._latency_n -= 1
+        else:
+            self._count += 1
+        self._success[i] = 1 if success else 0
+        self._latency[i] = latency_ms if success else 0.0
+        if success:
+            self._successes += 1
+            self._latency_sum += latency_ms
+            self._latency_n += 1
+        self._pos = (i + 1) % self.size
+        self.total += 1
+
+    def seed(self, attempts: int, successes: int):
+        """Approximates a window from lifetime counts when no per-attempt history exists."""
+        n = min(self.size, attempts)
+        hits = round(n * successes / attempts) if attempts else 0
+        for k in range(n):
+            self.add(k >= n - hits)
+        self.total = attempts
+
+    @property
+    def accuracy(self) -> float:
+        return self._successes / self._count if self._count else 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self._latency_sum / self._latency_n if self._latency_n else 0.0
+
+
+class AttemptWindows:
+    DEFAULT_SIZE = 20  # Larger than any milestone's min_attempts_to_advance
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        self.size = size
+        self._windows: Dict[Tuple[str, str], RollingWindow] = {}
+
+    def get(self, item_type: str, item_id: str) -> RollingWindow:
+        key = (item_type, item_id)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = RollingWindow(self.size)
+        return window
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._windows
+
+    def record(self, item_type: str, item_id: str, success: bool, latency_ms: float = 0.0):
+        self.get(item_type, item_id).add(success, latency_ms)
+
+    def warm(self, rows: Iterable[Tuple[str, str, int, float]]):
+        """Replays (item_type, item_id, success, latency_ms) rows, oldest first."""
+        for item_type, item_id, success, latency_ms in rows:
+            self.get(item_type, item_id).add(bool(success), latency_ms or 0.0)
+
+    def clear(self):
+        self._windows.clear()
@@ -0,0 +1,177 @@
+"""
+ChordAnalyzer — a time-stamped chord chart for a song's piano part.
+
+The time-sorted NOTE_DTYPE array MidiIngestor produces is cut into frames of
+half a beat. Each frame gets a 12-bin pitch-class histogram (seconds each
+pitch class sounds in it) and its lowest sounding pitch. A window of
+WINDOW_FRAMES frames slides over the song one frame at a time; the pitch
+classes carrying at least MASK_THRESHOLD of the window's note time (each
+frame's histogram normalised first) form a 12-bit mask. Masks are labelled
+by table lookup: every one of the 4096 masks is scored once against every
+root x CHORD_TYPES template (chord tones present, minus tones missing, minus
+extra tones; root and third required), and a template whose root is in the
+bass gets a bonus. Up to a window's worth of frames that fit nothing but
+aren't silent keep the chord before them. Runs of the same label become
+chart segments; segments shorter than MIN_SEGMENT_FRAMES are folded into
+their neighbour.
+"""
+from typing import Dict, List
+import numpy as np
+from logic.services.confusion import PITCH_CLASS_NAMES  # type: ignore
+
+# Chords by their intervals from the root (0); ChordTrainerService drills from the same vocabulary
+CHORD_TYPES = {
+    "Major": {0, 4, 7},
+    "Minor": {0, 3, 7},
+    "Diminished": {0, 3, 6},
+    "Augmented": {0, 4, 8},
+    "Dominant 7th": {0, 4, 7, 10},
+    "Major 7th": {0, 4, 7, 11},
+    "Minor 7th": {0, 3, 7, 10},
+    "Single": {0},
+}
+
+CHART_VERSION = 1            # Bump when labelling changes; cached charts are keyed by it
+WINDOW_FRAMES = 6            # Three beats
+MASK_THRESHOLD = 0.12        # Share of the window's note time a pitch class needs to count
+MIN_SEGMENT_FRAMES = 3
+BASS_BONUS = 0.75
+MIN_FRAME_SECONDS = 0.1
+MAX_FRAME_SECONDS = 0.5
+NO_CHORD = -1
+
+# One row per labellable chord: every root with every type except "Single"
+_TEMPLATE_NAMES = [(root, name) for name in CHORD_TYPES if name != "Single" for root in range(12)]
+_TEMPLATE_ROOTS = np.array([root for root, _ in _TEMPLATE_NAMES])
+_mask_scores = None
+
+
+def interval_mask(root: int, intervals) -> int:
+    return sum(1 << ((root + i) % 12) for i in set(intervals))
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    return np.unpackbits(values.astype(">u2").view(np.uint8).reshape(-1, 2), axis=1).sum(axis=1)
+
+
+def _score_table() -> np.ndarray:
+    """(4096, templates) score of every pitch-class mask against every chord template."""
+    global _mask_scores
+    if _mask_scores is None:
+        masks = np.arange(4096)[:, None]
+        templates = np.array([interval_mask(r, CHORD_TYPES[name]) for r, name in _TEMPLATE_NAMES])[None, :]
+        hits = _popcount(masks & templates).reshape(masks.shape[0], -1)
+        missing = _popcount(templates & ~masks & 0xFFF).reshape(masks.shape[0], -1)
+        extra = _popcount(masks & ~templates & 0xFFF).reshape(masks.shape[0], -1)
+        scores = hits - 1.0 * missing - 0.5 * extra
+        # A chord needs its root and its third (a bare fifth can't tell major from minor);
+        # ties go to smaller, more common chords (dict order)
+        thirds = np.array([(r + (3 if 3 in CHORD_TYPES[name] else 4)) % 12 for r, name in _TEMPLATE_NAMES])
+        root_present = (masks >> _TEMPLATE_ROOTS[None, :]) & 1
+        third_present = (masks >> thirds[None, :]) & 1
+        scores = np.where((root_present == 1) & (third_present == 1), scores, -np.inf)
+        order = np.array([list(CHORD_TYPES).index(name) for _, name in _TEMPLATE_NAMES])
+        _mask_scores = scores - 0.01 * order[None, :]
+    return _mask_scores
+
+
+def frame_histograms(notes: np.ndarray, frame_seconds: float):
+    """Per-frame pitch-class note time (frames, 12) and lowest sounding pitch (128 = silence)."""
+    starts = notes["start"].astype(np.float64)
+    ends = starts + notes["duration"]
+    first = np.floor(starts / frame_seconds).astype(np.int64)
+    last = np.maximum(np.floor((ends - 1e-9) / frame_seconds).astype(np.int64), first)
+    n_frames = int(last.max()) + 1
+
+    # One row per (note, frame it overlaps)
+    counts = last - first + 1
+    note = np.repeat(np.arange(len(notes)), counts)
+    frame = first[note] + np.arange(len(note)) - np.repeat(np.cumsum(counts) - counts, counts)
+    overlap = (np.minimum(ends[note], (frame + 1) * frame_seconds)
+               - np.maximum(starts[note], frame * frame_seconds))
+    pitches = notes["pitch"].astype(np.int64)
+
+    energy = np.bincount(frame * 12 + pitches[note] % 12, weights=overlap,
+                         minlength=n_frames * 12).reshape(n_frames, 12)
+    bass = np.full(n_frames, 128, dtype=np.int64)
+    np.minimum.at(bass, frame, pitches[note])
+    return energy, bass
+
+
+def window_masks(energy: np.ndarray, bass: np.ndarray, window: int = WINDOW_FRAMES):
+    """12-bit pitch-class mask and bass pitch class of the window centred on each frame."""
+    n_frames = len(energy)
+    # Every sounding frame weighs the same, so held block chords don't drown out broken ones
+    shares = energy / np.maximum(energy.sum(axis=1, keepdims=True), 1e-9)
+    padded = np.vstack((np.zeros((1, 12)), np.cumsum(shares, axis=0)))
+    lo = np.clip(np.arange(n_frames) - window // 2, 0, n_frames)
+    hi = np.clip(lo + window, 0, n_frames)
+    windowed = padded[hi] - padded[lo]
+    totals = windowed.sum(axis=1, keepdims=True)
+    present = windowed >= MASK_THRESHOLD * np.maximum(totals, 1e-9)
+    present &= totals > 0
+    masks = (present * (1 << np.arange(12))).sum(axis=1)
+
+    # Lowest pitch anywhere in the window, via a running minimum over its frames
+    low = bass.copy()
+    for shift in range(1, window):
+        low[:-shift] = np.minimum(low[:-shift], bass[shift:])
+    window_bass = low[lo]
+    return masks, np.where(window_bass < 128, window_bass % 12, -1)
+
+
+def label_frames(masks: np.ndarray, bass_pc: np.ndarray) -> np.ndarray:
+    """Template index per frame, NO_CHORD where nothing fits."""
+    scores = _score_table()[masks] + BASS_BONUS * (_TEMPLATE_ROOTS[None, :] == bass_pc[:, None])
+    best = np.argmax(scores, axis=1)
+    return np.where(np.isfinite(scores[np.arange(len(best)), best]) & (scores.max(axis=1) > 0), best, NO_CHORD)
+
+
+def _runs(labels: np.ndarray):
+    bounds = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1], True])
+    return [[int(labels[a]), int(a), int(b)] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def chord_chart(notes: np.ndarray, tempo_bpm: float = 120.0) -> List[Dict]:
+    """Chord segments as {start, end, chord, root_idx, chord_type_name}, in time order."""
+    if len(notes) == 0:
+        return []
+    frame_seconds = float(np.clip(30.0 / max(tempo_bpm, 1.0), MIN_FRAME_SECONDS, MAX_FRAME_SECONDS))
+    energy, bass = frame_histograms(notes, frame_seconds)
+    masks, bass_pc = window_masks(energy, bass)
+    labels = label_frames(masks, bass_pc)
+
+    # Short passages that fit no template (a few melody notes) keep the chord before them; silence doesn't
+    frames = np.arange(len(labels))
+    last_labelled = np.maximum.accumulate(np.where(labels != NO_CHORD, frames, -1))
+    carry = (labels == NO_CHORD) & (masks > 0) & (last_labelled >= 0) & (frames - last_labelled <= WINDOW_FRAMES)
+    labels[carry] = labels[last_labelled[carry]]
+
+    runs = _runs(labels)
+    # Fold short runs into the previous segment (or the next one at the start), then re-merge
+    for i, run in enumerate(runs):
+        if run[2] - run[1] < MIN_SEGMENT_FRAMES and len(runs) > 1:
+            run[0] = runs[i - 1][0] if i > 0 else runs[i + 1][0]
+    merged = np.concatenate([np.full(b - a, label) for label, a, b in runs])
+
+    chart = []
+    for label, a, b in _runs(merged):
+        if label == NO_CHORD:
+            continue
+        root, name = _TEMPLATE_NAMES[label]
+        chart.append({
+            "start": round(a * frame_seconds, 3),
+            "end": round(b * frame_seconds, 3),
+            "chord": f"{PITCH_CLASS_NAMES[root]} {name}",
+            "root_idx": root,
+            "chord_type_name": name,
+        })
+    return chart
+
+
+def chart_chords(chart: List[Dict]) -> List[str]:
+    """Distinct chords of a chart, most time first."""
+    seconds: Dict[str, float] = {}
+    for segment in chart:
+        seconds[segment["chord"]] = seconds.get(segment["chord"], 0.0) + segment["end"] - segment["start"]
+    return sorted(seconds, key=lambda chord: -seconds[chord])
@@ -5,8 +5,16 @@ import urllib.request
 import json
 import threading
 import re
-from typing import Set, List, Dict, Tuple
-from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, Qt # type: ignore
+from typing import Set, List, Dict, Tuple, Optional
+from PySide6.QtCore import QObject, Signal, Slot, Property, Qt # type: ignore
+from logic.services.latency_sketch import LatencySketch # type: ignore
+from logic.services.clock import SystemClock # type: ignore
+from logic.services.dynamics import VelocityLog # type: ignore
+from logic.services.confusion import NoteConfusion, expected_lookup # type: ignore
+from logic.services.weakness_index import WeaknessIndex # type: ignore
+from logic.services.strike_analyzer import StrikeAnalyzer # type: ignore
+from logic.services.key_heatmap import KeyHeatmap # type: ignore
+from logic.services.chord_analyzer import CHORD_TYPES # type: ignore
 
 class ChordTrainerService(QObject):
     # Signals for QML
@@ -22,10 +30,13 @@ class ChordTrainerService(QObject):
     lessonPlanGenerated = Signal()
     midiOutRequested = Signal(list)
     metronomeTick = Signal()
+    keyHeatmapChanged = Signal()
     
-    def __init__(self, db_manager, curriculum_service=None, settings_manager=None):
+    def __init__(self, db_manager, curriculum_service=None, settings_manager=None, clock=None):
         super().__init__()
         self.db = db_manager
+        # Time source for all interaction timing; a VirtualClock drives headless replays
+        self._clock = clock or SystemClock()
         self.curriculum = curriculum_service
         self.settings = settings_manager
         self._is_active = False
@@ -44,8 +55,9 @@ class ChordTrainerService(QObject):
         
         # Performance Tracking State
         self._wrong_notes_count = 0
-        self._first_note_time = 0.0
         self._is_simultaneous = False
+        # Onset/release timing of the keys making up the current chord strike
+        self._strike = StrikeAnalyzer()
         
         # Dashboard and Performance Review
         self._struggled_items: List[Dict] = []
@@ -64,14 +76,27 @@ class ChordTrainerService(QObject):
         self._is_loading = False
         self._loading_status_text = ""
         self._is_paused_for_speech = False
-        self._session_stats: Dict[str, List[float]] = {}
+        self._session_stats: Dict[str, LatencySketch] = {}
+        # Key velocities for the session, and evenness per completed step
+        self._velocity_log = VelocityLog()
+        self._step_velocity_start = 0
+        self._session_dynamics: Dict[str, List[Dict]] = {}
+        self._last_dynamics: Dict = {}
+        # Which pitch class was played instead of which, per target; flushed with the session stats
+        self._note_confusion = NoteConfusion()
+        self._expected_pc: List[int] = list(range(12))
+        # Per-key hits/misses/wrong-presses for this session, and the last 30 days from the DB (loaded on demand)
+        self._session_heatmap = KeyHeatmap()
+        self._history_heatmap: KeyHeatmap | None = None
+        # Free-practice sampler weights; seeded from the DB on first use, then updated per attempt
+        self._weakness_index: WeaknessIndex | None = None
         self._estimated_gen_ms = 5000.0
         
         # Pentascale State
         self._pentascale_sequence: List[int] = []  # Exact MIDI pitches for the 5-note sequence
         self._pentascale_index = 0
         self._pentascale_beat_count = 0
-        self._metronome_timer = QTimer()
+        self._metronome_timer = self._clock.create_timer()
         self._metronome_timer.setTimerType(Qt.PreciseTimer)
         self._metronome_timer.timeout.connect(self._play_metronome_click)
         self._scale_name = ""
@@ -91,22 +116,13 @@ class ChordTrainerService(QObject):
         self._is_holding = False
         self._hold_start_time = 0.0
         
-        self._hold_tick_timer = QTimer(self)
+        self._hold_tick_timer = self._clock.create_timer(self)
         self._hold_tick_timer.setInterval(33) # ~30fps update for smooth progress bar
         self._hold_tick_timer.timeout.connect(self._on_hold_tick)
         
         # A simple library of chords defined by their intervals from a root note (0)
-        # 0 = Root, 4 = Major 3rd, 7 = Perfect 5th, etc.
-        self.CHORD_TYPES = {
-            "Major": {0, 4, 7},
-            "Minor": {0, 3, 7},
-            "Diminished": {0, 3, 6},
-            "Augmented": {0, 4, 8},
-            "Dominant 7th": {0, 4, 7, 10},
-            "Major 7th": {0, 4, 7, 11},
-            "Minor 7th": {0, 3, 7, 10},
-            "Single": {0},
-        }
+        # 0 = Root, 4 = Major 3rd, 7 = Perfect 5th, etc. Shared with the song chord analyzer.
+        self.CHORD_TYPES = CHORD_TYPES
         
         # Pentascale patterns: intervals from root for each scale type
         self.PENTASCALE_PATTERNS = {
@@ -200,6 +216,33 @@ class ChordTrainerService(QObject):
         """List of items where user performance was below threshold."""
         return self._struggled_items
 
+    @Property("QVariantMap", notify=lessonStateChanged)
+    def lastDynamics(self):
+        """Velocity evenness of the most recently completed step (empty if unknown)."""
+        return self._last_dynamics
+
+    @Property("QVariantList", notify=lessonStateChanged)
+    def sessionDynamics(self):
+        """Average velocity evenness per chord/scale played this session, least even first."""
+        summary = []
+        for name, steps in self._session_dynamics.items():
+            summary.append({
+                "name": name,
+                "attempts": len(steps),
+                "evenness": sum(d["evenness"] for d in steps) / len(steps),
+                "spread": sum(d["spread"] for d in steps) / len(steps),
+                "mean_velocity": sum(d["mean_velocity"] for d in steps) / len(steps),
+            })
+        return sorted(summary, key=lambda d: d["evenness"])
+
+    @Property(list, notify=keyHeatmapChanged)
+    def keyHeatmap(self) -> list:
+        """Error rate per MIDI pitch (0-127) over the last 30 days including this session; -1 = no data."""
+        if self._history_heatmap is None:
+            self._history_heatmap = self.db.get_key_heatmap(days=30)
+        combined = KeyHeatmap(self._history_heatmap.data + self._session_heatmap.data)
+        return combined.error_rates()
+
     @Property(int, notify=targetChordChanged)
     def currentNoteIndex(self) -> int:
         return self._pentascale_index
@@ -235,6 +278,7 @@ class ChordTrainerService(QObject):
             self.activeChanged.emit(self._is_active)
             
         self._active_pitches.clear()
+        self._weakness_index = None  # Re-seed from the DB once per session
         self._next_chord()
         
     @Slot()
@@ -262,8 +306,13 @@ class ChordTrainerService(QObject):
             self.activeChanged.emit(self._is_active)
             
         self._active_pitches.clear()
-        self._session_stats.clear()
+        # A restarted or changed lesson keeps what the previous one measured
+        self._flush_session_stats()
         self._struggled_items.clear()
+        self._session_dynamics.clear()
+        self._last_dynamics = {}
+        self._velocity_log.clear()
+        self._step_velocity_start = 0
         
         # New Curriculum-Aware Planning
         user_context = ""
@@ -311,6 +360,8 @@ class ChordTrainerService(QObject):
                     blocks_text += f"- Goal: {b['milestone_description']}\n"
                     blocks_text += f"- Target Keys: {b['target_keys']}\n"
                     blocks_text += f"- Target Chords: {b['target_chords']}\n"
+                    if b.get("song_chords"):
+                        blocks_text += f"- Song: '{b['song_title']}'. Its Target Chords were read from the score; drill exactly these, in this order of importance\n"
                     blocks_text += f"- Target exercise count for this block: {b['step_count']}\n"
                 
                 if session_plan.get("review_items"):
@@ -679,6 +730,25 @@ BEGINNER SAFETY RULES:
             self.targetChordChanged.emit(self._target_chord_name)
             self._hold_tick_timer.stop()
             self._is_holding = False
+            self._flush_session_stats()
+
+    def _pitch_name(self, pitch: int) -> str:
+        return f"{self.ROOT_NOTES[pitch % 12]}{pitch // 12 - 1}"
+
+    def _flush_session_stats(self):
+        """Merges this session's latency sketches and note confusions into the lifetime stats in the DB."""
+        if self._session_stats:
+            self.db.merge_latency_sketches(self._session_stats)
+            self._session_stats.clear()
+        if self._note_confusion:
+            self.db.merge_note_confusions(self._note_confusion.rows())
+            self._note_confusion.clear()
+        if self._session_heatmap:
+            self.db.merge_key_heatmap(self._session_heatmap)
+            if self._history_heatmap is not None:
+                self._history_heatmap.merge(self._session_heatmap)
+            self._session_heatmap.clear()
+            self.keyHeatmapChanged.emit()
 
     def _next_chord(self):
         if self._is_lesson_mode:
@@ -688,15 +758,27 @@ BEGINNER SAFETY RULES:
                 
                 # Format session stats for the AI
                 stats_lines: List[str] = []
-                for chord, latencies in self._session_stats.items():
-                    if latencies:
-                        avg_lat = sum(latencies) / len(latencies)
-                        stats_lines.append(f"- {chord}: {len(latencies)} attempts, Average Latency {avg_lat:.0f}ms\n")
+                for chord, sketch in self._session_stats.items():
+                    if sketch.count:
+                        stats_lines.append(f"- {chord}: {sketch.count} attempts, Median Latency {sketch.p50:.0f}ms, "
+                                           f"Slowest 10% above {sketch.p90:.0f}ms\n")
                         
                 if not stats_lines:
                     stats_str = "No successful chords recorded."
                 else:
                     stats_str = "".join(stats_lines)
+
+                dynamics_lines: List[str] = []
+                for chord, steps in self._session_dynamics.items():
+                    evenness = sum(d["evenness"] for d in steps) / len(steps)
+                    spread = sum(d["spread"] for d in steps) / len(steps)
+                    worst = min(steps, key=lambda d: d["evenness"])
+                    dynamics_lines.append(f"- {chord}: evenness {evenness:.2f} (1.0 = all fingers equal), "
+                                          f"velocity spread {spread:.0f}/127, in the least even attempt "
+                                          f"finger {worst['loudest_finger']} ({self._pitch_name(worst['loudest_pitch'])}) was loudest and "
+                                          f"finger {worst['softest_finger']} ({self._pitch_name(worst['softest_pitch'])}) softest\n")
+                if dynamics_lines:
+                    stats_str += "\nKey velocity evenness (measured from MIDI velocity):\n" + "".join(dynamics_lines)
                     
                     
                 if self.coach_personality == "Old-School":
@@ -711,6 +793,7 @@ Here are their performance statistics for this specific session:
 Analyze this data and provide a constructive 2-3 sentence verbal feedback message.
 DO NOT just say 'Great job!'. {feedback_style}"""
                 self.speakInstruction.emit(prompt)
+                self._flush_session_stats()
                 
                 if self.curriculum:
                     self.curriculum.finish_session()
@@ -795,16 +878,27 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             self._setup_target(root_idx, chord_type_name, intervals, octave, preview_chord=preview)
 
     def _apply_random_step(self):
-        root_idx = random.randint(0, 11)
-        # Filter out non-playable types for random practice
-        playable = {k: v for k, v in self.CHORD_TYPES.items() if k != "Single"}
-        chord_type_name, intervals = random.choice(list(playable.items()))
+        # Weighted towards weak, slow and stale chords; no DB query per draw
+        root_name, chord_type_name = self._get_weakness_index().sample().split(" ", 1)
+        root_idx = self.ROOT_NOTES.index(root_name)
+        intervals = self.CHORD_TYPES[chord_type_name]
         octave = random.randint(4, 5)  # Right-hand range only
         self._required_hold_ms = 0
         self._exercise_type = "chord"
         self._current_hand = "right"
         self._setup_target(root_idx, chord_type_name, intervals, octave)
 
+    def _get_weakness_index(self) -> WeaknessIndex:
+        if self._weakness_index is None:
+            # Filter out non-playable types for random practice
+            candidates = [f"{root} {chord_type}" for chord_type in self.CHORD_TYPES if chord_type != "Single"
+                          for root in self.ROOT_NOTES]
+            self._weakness_index = WeaknessIndex(candidates)
+            self._weakness_index.load(self.db.get_all_chord_stats())
+            focus = ", ".join(name for name, _ in self._weakness_index.weakest(3))
+            print(f"ChordTrainer: Free practice weighted towards {focus}")
+        return self._weakness_index
+
     def _setup_pentascale_target(self, chord_data):
         """Sets up a pentascale exercise: 5 sequential single-note targets."""
         root_idx = int(chord_data.get("root_idx", 0)) # type: ignore
@@ -835,12 +929,13 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         self._is_holding = False
         self._waiting_for_release = False
         self._hold_tick_timer.stop()
-        self._prompt_time = time.time()
+        self._prompt_time = self._clock.now()
         self._metronome_start_time = 0.0 # Track precise start for timing feedback
         self._pentascale_bpm = 0
         self._wrong_notes_count = 0
-        self._first_note_time = 0.0
         self._is_simultaneous = False
+        self._strike.reset()
+        self._step_velocity_start = len(self._velocity_log)
         
         # Determine if we should optionally use the metronome
         bpm = chord_data.get("bpm", 0)  # Defaults to 0 (free-play)
@@ -849,7 +944,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             self._pentascale_bpm = bpm
             self._pentascale_beat_count = -4  # 4-beat lead in (-4, -3, -2, -1)
             # The beat starts immediately on tick 0
-            self._metronome_start_time = time.time() + (interval_ms / 1000.0 * 4) # Time when beat 0 will hit
+            self._metronome_start_time = self._clock.now() + (interval_ms / 1000.0 * 4) # Time when beat 0 will hit
             self._metronome_timer.start(interval_ms)
             print(f"ChordTrainer: Started pentascale metronome at {bpm} BPM")
         else:
@@ -974,7 +1069,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             if self._pedal_type == "direct":
                 # Pedal should be pressed around the same time as the chord
                 if is_down and self._is_holding:
-                    pedal_timing = (time.time() * 1000.0) - self._hold_start_time
+                    pedal_timing = (self._clock.now() * 1000.0) - self._hold_start_time
                     if pedal_timing <= 400: # generous 400ms window
                         self._pedal_satisfied = True
                         self._check_input()
@@ -1045,11 +1140,13 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         # Calculate the absolute intervals (0-11) for the logic evaluator
         self._target_intervals = {(root_idx + interval) % 12 for interval in intervals}
         
-        self._prompt_time = time.time()
+        self._prompt_time = self._clock.now()
         # Reset performance counters for the new target
         self._wrong_notes_count = 0
-        self._first_note_time = 0.0
         self._is_simultaneous = False
+        self._strike.reset()
+        self._step_velocity_start = len(self._velocity_log)
+        self._expected_pc = expected_lookup(self._target_intervals)
         
         self.targetChordChanged.emit(self._target_chord_name)
         print(f"ChordTrainer: Next target is {self._target_chord_name} (intervals: {self._target_intervals}, pitches: {self._target_pitches}, hold={self._required_hold_ms}ms)")
@@ -1112,39 +1209,81 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         self._is_holding = False
         self._waiting_for_release = False
         self._hold_tick_timer.stop()
-        self._prompt_time = time.time()
+        self._prompt_time = self._clock.now()
         self._wrong_notes_count = 0
-        self._first_note_time = 0.0
         self._is_simultaneous = False
+        self._strike.reset()
+        self._step_velocity_start = len(self._velocity_log)
+        self._expected_pc = expected_lookup(self._target_intervals)
         
         self.targetChordChanged.emit(self._target_chord_name)
         print(f"ChordTrainer: Progression chord {self._progression_index + 1}/{len(self._progression_steps)}: {self._target_chord_name}")
 
     @Slot(int, bool)
-    def handle_midi_note(self, pitch: int, is_on: bool):
+    def handle_midi_note(self, pitch: int, is_on: bool, velocity: int = 0):
         """Called by AppState when a MIDI note event occurs."""
         if not self._is_active or self._is_lesson_complete:
             return
 
         if is_on:
-            self._active_pitches.add(pitch)
-            
-            # Record first note time for simultaneity detection
-            if self._first_note_time == 0.0:
-                self._first_note_time = time.time() * 1000.0
-                
-            # Track wrong notes (notes not in target intervals)
-            if self._exercise_type == "pentascale":
-                # For pentascale, check against the exact current target pitch
-                if self._pentascale_sequence and self._pentascale_index < len(self._pentascale_sequence):
-                    if pitch != self._pentascale_sequence[self._pentascale_index]:
-                        self._wrong_notes_count += 1
-            elif self._target_intervals:
-                if (pitch % 12) not in self._target_intervals:
-                    self._wrong_notes_count += 1
+            self._register_note_on(pitch, velocity)
         else:
             self._active_pitches.discard(pitch)
+            released = self._strike.note_off(pitch, self._clock.now())
+            if released:
+                self.db.record_chord_strike(released)
             
+        self._on_held_keys_changed()
+
+    def handle_chord_strike(self, pitches: list, onset_times: list, velocities: Optional[list] = None):
+        """
+        Called by AppState's onset grouper with every note-on that landed inside
+        one onset window, so a chord strike is evaluated once instead of per note.
+        """
+        if not self._is_active or self._is_lesson_complete:
+            return
+        velocities = velocities or [0] * len(pitches)
+
+        if self._exercise_type == "pentascale":
+            # Scales are sequential single notes; each onset is its own step
+            for pitch, velocity in zip(pitches, velocities):
+                self.handle_midi_note(pitch, True, velocity)
+            return
+
+        # The strike is delivered after its window closes; place each onset back on our clock
+        now = self._clock.now()
+        last_onset = max(onset_times)
+        for pitch, onset, velocity in zip(pitches, onset_times, velocities):
+            self._register_note_on(pitch, velocity, now - (last_onset - onset))
+        self._on_held_keys_changed()
+
+    def _register_note_on(self, pitch: int, velocity: int = 0, onset: float | None = None):
+        self._active_pitches.add(pitch)
+        self._strike.note_on(pitch, self._clock.now() if onset is None else onset)
+        if velocity > 0:
+            self._velocity_log.append(pitch, velocity, self._clock.now())
+        
+        # Track wrong notes (notes not in target intervals)
+        if self._exercise_type == "pentascale":
+            # For pentascale, check against the exact current target pitch
+            if self._pentascale_sequence and self._pentascale_index < len(self._pentascale_sequence):
+                expected = self._pentascale_sequence[self._pentascale_index]
+                self._note_confusion.record(self._scale_name, expected % 12, pitch % 12)
+                if pitch != expected:
+                    self._wrong_notes_count += 1
+                    self._session_heatmap.wrong(pitch, velocity)
+                    self._session_heatmap.miss(expected)
+                else:
+                    self._session_heatmap.hit(pitch, (self._clock.now() - self._prompt_time) * 1000.0, velocity)
+        elif self._target_intervals:
+            self._note_confusion.record(self._target_chord_name, self._expected_pc[pitch % 12], pitch % 12)
+            if (pitch % 12) not in self._target_intervals:
+                self._wrong_notes_count += 1
+                self._session_heatmap.wrong(pitch, velocity)
+            else:
+                self._session_heatmap.hit(pitch, (self._clock.now() - self._prompt_time) * 1000.0, velocity)
+
+    def _on_held_keys_changed(self):
         if self._waiting_for_release:
             if len(self._active_pitches) == 0:
                 self._waiting_for_release = False
@@ -1153,12 +1292,12 @@ DO NOT just say 'Great job!'. {feedback_style}"""
                         # Still in the pentascale sequence — just continue, don't call _next_chord
                         pass
                     else:
-                        QTimer.singleShot(700, self._next_chord)
+                        self._clock.single_shot(700, self._next_chord)
                 elif self._exercise_type == "progression" and self._progression_index < len(self._progression_steps):
                     # Advance to next chord in progression, adding a short pause so user can reset hands
-                    QTimer.singleShot(700, self._advance_progression_chord)
+                    self._clock.single_shot(700, self._advance_progression_chord)
                 else:
-                    QTimer.singleShot(700, self._next_chord)
+                    self._clock.single_shot(700, self._next_chord)
             return
             
         self._check_input()
@@ -1192,7 +1331,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             if self._pentascale_bpm > 0 and self._metronome_start_time > 0:
                 interval_ms = 60000 / self._pentascale_bpm
                 expected_time_sec = self._metronome_start_time + (self._pentascale_index * (interval_ms / 1000.0))
-                actual_time_sec = time.time()
+                actual_time_sec = self._clock.now()
                 diff_ms = (actual_time_sec - expected_time_sec) * 1000.0
                 
                 if diff_ms < -150:
@@ -1208,7 +1347,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             
             # Record success for this individual note
             note_name = f"{self.ROOT_NOTES[target_pitch % 12]} (Pentascale)"
-            latency_ms = (time.time() - self._prompt_time) * 1000.0
+            latency_ms = (self._clock.now() - self._prompt_time) * 1000.0
             self.db.record_chord_attempt(note_name, True, latency_ms, 0, False)
             
             self._pentascale_index += 1
@@ -1221,7 +1360,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
                 # Update target intervals to next note (no release wait — allows legato)
                 next_pitch = self._pentascale_sequence[self._pentascale_index]
                 self._target_intervals = {next_pitch % 12}
-                self._prompt_time = time.time()  # Reset timing for next note
+                self._prompt_time = self._clock.now()  # Reset timing for next note
                 self.targetChordChanged.emit(self._target_chord_name)
 
     def _check_chord(self):
@@ -1242,12 +1381,12 @@ DO NOT just say 'Great job!'. {feedback_style}"""
 
             if not self._is_holding:
                 self._is_holding = True
-                self._hold_start_time = time.time() * 1000.0
+                self._hold_start_time = self._clock.now() * 1000.0
                 
-                # Calculate simultaneity: if all notes reached within 100ms of first note
-                if self._first_note_time > 0:
-                    delta = self._hold_start_time - self._first_note_time
-                    self._is_simultaneous = (delta < 150) # 150ms is a generous 'block chord' threshold
+                # Simultaneity from the onsets of exactly the keys that form the chord
+                strike = self._strike.capture(self._active_pitches)
+                if strike:
+                    self._is_simultaneous = (strike.onset_spread_ms < 150) # 150ms is a generous 'block chord' threshold
                 
                 if self._required_hold_ms > 0:
                     if self._exercise_type == "sustain_pedal" and not self._pedal_satisfied:
@@ -1269,10 +1408,15 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             # we consider this a "failed attempt" and emit a subtle feedback signal.
             if len(active_intervals) == len(self._target_intervals) and not self._is_holding:
                 self.chordFailed.emit()
+                for target_pitch in self._target_pitches:
+                    if target_pitch % 12 not in active_intervals:
+                        self._session_heatmap.miss(target_pitch)
                 # Record a failure in the DB (pass false for success)
-                latency_ms = (time.time() - self._prompt_time) * 1000.0
+                latency_ms = (self._clock.now() - self._prompt_time) * 1000.0
                 self.db.record_chord_attempt(self._target_chord_name, False, latency_ms, 
                                            self._wrong_notes_count, False)
+                if self._weakness_index:
+                    self._weakness_index.record(self._target_chord_name, False)
                 if self.curriculum:
                     self.curriculum.complete_exercise(self._target_chord_name, False, 
                                                      self._current_track, self._current_milestone_id)
@@ -1290,7 +1434,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             self._hold_tick_timer.stop()
             return
             
-        elapsed = (time.time() * 1000.0) - self._hold_start_time
+        elapsed = (self._clock.now() * 1000.0) - self._hold_start_time
         
         if elapsed >= self._required_hold_ms:
             self._hold_progress = 1.0
@@ -1302,12 +1446,18 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         self.lessonStateChanged.emit() # update progress bar
 
     def _complete_chord(self):
-        latency_ms = (time.time() - self._prompt_time) * 1000.0
+        latency_ms = (self._clock.now() - self._prompt_time) * 1000.0
         print(f"ChordTrainer: SUCCESS! {self._target_chord_name} matched in {latency_ms:.1f}ms")
         
         # Record success in DB and local session stats
         self.db.record_chord_attempt(self._target_chord_name, True, latency_ms, 
                                    self._wrong_notes_count, self._is_simultaneous)
+        strike = self._strike.commit(self._target_chord_name)
+        if strike:
+            print(f"ChordTrainer: Onset spread {strike.onset_spread_ms:.0f}ms, arrival order {strike.arrival_order}, "
+                  f"finger {strike.lagging_finger} lagged {strike.lag_ms:.0f}ms")
+        if self._weakness_index:
+            self._weakness_index.record(self._target_chord_name, True, latency_ms)
         if self.curriculum:
             self.curriculum.complete_exercise(self._target_chord_name, True, 
                                              self._current_track, self._current_milestone_id)
@@ -1317,8 +1467,16 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         if self._exercise_type == "pentascale":
             stat_key = self._scale_name
         if stat_key not in self._session_stats:
-            self._session_stats[stat_key] = []
-        self._session_stats[stat_key].append(latency_ms)
+            self._session_stats[stat_key] = LatencySketch()
+        self._session_stats[stat_key].add(latency_ms)
+
+        # Velocity evenness across the fingers that made up this step
+        fingers = self._pentascale_sequence if self._exercise_type == "pentascale" else sorted(self._active_pitches)
+        dynamics = self._velocity_log.step_metrics(self._step_velocity_start, fingers)
+        self._last_dynamics = dynamics or {}
+        if dynamics:
+            self._session_dynamics.setdefault(stat_key, []).append(dynamics)
+            print(f"ChordTrainer: Dynamics for {stat_key}: velocities {dynamics['velocities']}, evenness {dynamics['evenness']:.2f}")
         
         # Track items for Dashboard "Quick Review" 
         # Threshold: Latency > 4s OR > 2 wrong notes
@@ -1336,6 +1494,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         
         # Notify UI
         self.chordSuccess.emit(self._target_chord_name, latency_ms)
+        self.keyHeatmapChanged.emit()
         
         # Reset hold state
         self._hold_progress = 0.0
@@ -1344,7 +1503,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
         
         # Pause briefly before advancing if in lesson mode to avoid double-triggers
         if self._is_lesson_mode:
-            time.sleep(0.1)
+            self._clock.sleep(0.1)
         
         # Handle progression sub-step advancement
         if self._exercise_type == "progression":
@@ -1359,7 +1518,7 @@ DO NOT just say 'Great job!'. {feedback_style}"""
             
         if self._exercise_type == "listen":
             # For listening quizzes, the user answers via UI, not keys. Pause briefly then move on.
-            QTimer.singleShot(700, self._next_chord)
+            self._clock.single_shot(700, self._next_chord)
         else:
             print("ChordTrainer: Waiting for user to release all keys...")
             self._waiting_for_release = True
@@ -0,0 +1,129 @@
+"""
+Clock — the time source and timer factory shared by the interactive services.
+
+ChordTrainerService and EvaluationService never call time.time(), time.sleep()
+or QTimer directly; they go through a clock object instead. SystemClock is the
+production implementation (perf_counter + real QTimers). VirtualClock runs the
+same services against simulated time with no real timers, which is what the
+headless replay harness uses to push a whole lesson through in milliseconds.
+"""
+import heapq
+import itertools
+import time
+from typing import Callable, List
+from PySide6.QtCore import QTimer # type: ignore
+
+
+class SystemClock:
+    """Real time: perf_counter seconds, blocking sleep and Qt timers."""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def single_shot(self, delay_ms: int, callback: Callable):
+        QTimer.singleShot(delay_ms, callback)
+
+    def create_timer(self, parent=None):
+        return QTimer(parent) if parent is not None else QTimer()
+
+
+class _VirtualSignal:
+    """Just enough of a Qt signal for timer.timeout.connect()."""
+
+    def __init__(self):
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable):
+        self._slots.append(slot)
+
+    def emit(self):
+        for slot in list(self._slots):
+            slot()
+
+
+class VirtualTimer:
+    """QTimer look-alike whose ticks are scheduled on a VirtualClock."""
+
+    def __init__(self, clock: "VirtualClock"):
+        self._clock = clock
+        self._interval_ms = 0
+        self._active = False
+        self._generation = 0
+        self.timeout = _VirtualSignal()
+
+    def setInterval(self, interval_ms: int):
+        self._interval_ms = int(interval_ms)
+
+    def setTimerType(self, timer_type):
+        pass
+
+    def interval(self) -> int:
+        return self._interval_ms
+
+    def isActive(self) -> bool:
+        return self._active
+
+    def start(self, interval_ms: int | None = None):
+        if interval_ms is not None:
+            self._interval_ms = int(interval_ms)
+        self._active = True
+        self._generation += 1
+        self._schedule(self._generation)
+
+    def stop(self):
+        self._active = False
+        self._generation += 1
+
+    def _schedule(self, generation: int):
+        # A zero-interval QTimer fires on every event loop pass; 1ms is the virtual equivalent
+        delay = max(self._interval_ms, 1)
+        self._clock.single_shot(delay, lambda: self._fire(generation))
+
+    def _fire(self, generation: int):
+        if not self._active or generation != self._generation:
+            return  # Stopped or restarted since this tick was scheduled
+        self._schedule(generation)
+        self.timeout.emit()
+
+
+class VirtualClock:
+    """
+    Simulated time. Nothing happens until advance_to()/advance() is called,
+    which then runs every due callback in timestamp order.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._queue: list = []
+        self._seq = itertools.count()
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        # Services only sleep to debounce input; in virtual time that is just a jump forward
+        self._now += seconds
+
+    def single_shot(self, delay_ms: int, callback: Callable):
+        heapq.heappush(self._queue, (self._now + delay_ms / 1000.0, next(self._seq), callback))
+
+    def create_timer(self, parent=None) -> VirtualTimer:
+        return VirtualTimer(self)
+
+    def advance_to(self, t: float):
+        """Run every callback due at or before t, then park the clock at t."""
+        while self._queue and self._queue[0][0] <= t:
+            due, _, callback = heapq.heappop(self._queue)
+            self._now = max(self._now, due)
+            callback()
+        self._now = max(self._now, t)
+
+    def advance(self, seconds: float):
+        self.advance_to(self._now + seconds)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
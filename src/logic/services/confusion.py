@@ -0,0 +1,54 @@
+"""
+NoteConfusion — which pitch class was played instead of which, per target.
+
+For every target (chord name or pentascale) the session keeps a 12x12 count
+matrix indexed [expected pitch class, played pitch class]. Correct notes land
+on the diagonal; a wrong note is charged to the target tone it most likely
+stood in for (the nearest one on the pitch-class circle), so "E instead of Eb
+in C Minor" shows up as matrix[Eb, E]. Every update is one lookup and one
+increment. The session's matrices are flushed to the DB in one batch.
+"""
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+PITCH_CLASS_NAMES = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+
+
+def expected_lookup(target_pcs: Iterable[int]) -> List[int]:
+    """For each of the 12 pitch classes, the target pitch class it would be standing in for."""
+    targets = sorted(set(target_pcs))
+    if not targets:
+        return list(range(12))
+    lookup = []
+    for pc in range(12):
+        # Ties (a wrong note exactly between two chord tones) go to the lower tone
+        lookup.append(min(targets, key=lambda t: (min((pc - t) % 12, (t - pc) % 12), t)))
+    return lookup
+
+
+class NoteConfusion:
+    def __init__(self):
+        self._matrices: Dict[str, np.ndarray] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._matrices)
+
+    def record(self, target: str, expected_pc: int, played_pc: int):
+        matrix = self._matrices.get(target)
+        if matrix is None:
+            matrix = self._matrices[target] = np.zeros((12, 12), dtype=np.int32)
+        matrix[expected_pc, played_pc] += 1
+
+    def matrix(self, target: str) -> np.ndarray:
+        return self._matrices.get(target, np.zeros((12, 12), dtype=np.int32))
+
+    def rows(self) -> List[Tuple[str, int, int, int]]:
+        """Non-zero cells as (target, expected_pc, played_pc, count) for a batched DB write."""
+        out = []
+        for target, matrix in self._matrices.items():
+            for expected_pc, played_pc in zip(*np.nonzero(matrix)):
+                out.append((target, int(expected_pc), int(played_pc), int(matrix[expected_pc, played_pc])))
+        return out
+
+    def clear(self):
+        self._matrices.clear()
@@ -3,10 +3,13 @@ CurriculumService — Multi-track curriculum engine for ChordCoach Companion.
 
 Manages long-term learning progress across four tracks (technique, theory,
 repertoire, ear), spaced repetition scheduling, and per-session lesson planning.
+Repertoire blocks come with song suggestions picked by indexed difficulty,
+and target the chords of the first suggestion as read from its MIDI file.
 """
 import json
 import time
 from pathlib import Path
+from logic.services.chord_analyzer import chart_chords  # type: ignore
 from PySide6.QtCore import QObject, Property, Signal, Slot  # type: ignore
 
 
@@ -14,6 +17,10 @@ class CurriculumService(QObject):
     curriculumChanged = Signal()
     sessionPlanReady = Signal()
 
+    REPERTOIRE_BASE_DIFFICULTY = 2.0   # Target for a student with no repertoire milestones done
+    REPERTOIRE_MASTERY = 60.0          # A song counts as mastered from this mastery score
+    SONG_CHORD_LIMIT = 6               # Chords of a suggested song a repertoire block targets
+
     def __init__(self, db_manager, resources_dir: Path):
         super().__init__()
         self.db = db_manager
@@ -25,10 +32,14 @@ class CurriculumService(QObject):
         self._session_milestones: list = []
         self._session_exercises: int = 0
         self._session_successes: int = 0
+        # Set by AppState; supplies chord charts for repertoire songs
+        self.midi_ingestor = None
 
         # Load track definitions and initialize DB
         self._load_tracks()
         self.db.initialize_curriculum(self._tracks_data)
+        self._milestone_status: dict = {}
+        self._load_milestone_status()
 
     # ── Initialization ────────────────────────────────────────────────
 
@@ -43,6 +54,11 @@ class CurriculumService(QObject):
             print(f"CurriculumService: WARNING — {tracks_file} not found, using empty curriculum")
             self._tracks_data = {}
 
+    def _load_milestone_status(self):
+        """Caches each milestone's status so per-attempt advancement checks need no query."""
+        self._milestone_status = {(m["track_name"], m["milestone_id"]): m["status"]
+                                  for m in self.db.get_curriculum_state()}
+
     def _get_milestone_meta(self, track_name: str, milestone_id: str) -> dict:
         """Look up the full milestone definition from tracks_data."""
         for m in self._tracks_data.get(track_name, []):
@@ -89,7 +105,7 @@ class CurriculumService(QObject):
             else:
                 step_count = min(15, max(5, available_minutes))
 
-            blocks.append({
+            block = {
                 "track": track,
                 "milestone_id": ms["milestone_id"],
                 "milestone_title": meta.get("title", ms["milestone_id"]),
@@ -100,7 +116,14 @@ class CurriculumService(QObject):
                 "step_count": step_count,
                 "attempts_so_far": ms.get("attempts", 0),
                 "successes_so_far": ms.get("successes", 0),
-            })
+            }
+            if track == "repertoire":
+                block["songs"] = self.recommend_repertoire()
+                song = self._song_chords(block["songs"])
+                if song:
+                    block["song_title"], block["song_chords"] = song
+                    block["target_chords"] = song[1]
+            blocks.append(block)
             tracks_used.add(track)
 
         # If no active milestones, create a default beginner block
@@ -148,6 +171,37 @@ class CurriculumService(QObject):
         print(f"CurriculumService: Planned session with {len(blocks)} blocks across {list(tracks_used)}, ~{total_steps} steps")
         return self._session_plan
 
+    def recommend_repertoire(self, limit: int = 3) -> list:
+        """
+        Indexed songs pitched at the student's level: the target difficulty
+        grows with completed repertoire milestones and sits just above the
+        hardest song already mastered. Closest to the target first, then
+        least played.
+        """
+        completed = sum(1 for (track, _), status in self._milestone_status.items()
+                        if track == "repertoire" and status == "completed")
+        target = max(self.REPERTOIRE_BASE_DIFFICULTY + completed,
+                     self.db.get_mastered_song_difficulty(self.REPERTOIRE_MASTERY) + 0.5)
+        candidates = [s for s in self.db.get_songs_by_difficulty(target - 1.5, target + 1.0)
+                      if (s["mastery_score"] or 0.0) < self.REPERTOIRE_MASTERY]
+        candidates.sort(key=lambda s: (abs(s["difficulty"] - target), s["play_count"] or 0))
+        return [{"filepath": s["filepath"], "title": s["title"], "difficulty": s["difficulty"]}
+                for s in candidates[:limit]]
+
+    def _song_chords(self, songs: list):
+        """(title, most used chords) of the first suggested song with a readable chord chart."""
+        if self.midi_ingestor is None:
+            return None
+        for song in songs:
+            try:
+                chords = chart_chords(self.midi_ingestor.load_chord_chart(song["filepath"]))
+            except Exception as e:
+                print(f"CurriculumService: Could not read chords of {song['title']}: {e}")
+                continue
+            if chords:
+                return song["title"], chords[:self.SONG_CHORD_LIMIT]
+        return None
+
     # ── Curriculum Context for Gemini ─────────────────────────────────
 
     def get_curriculum_context(self) -> str:
@@ -206,25 +260,20 @@ class CurriculumService(QObject):
             print(f"CurriculumService: Recording attempt for {track}/{milestone_id} (success={success})")
             self.db.record_milestone_attempt(track, milestone_id, success)
 
-            # Check if milestone should advance
+            # Check if milestone should advance, from the in-memory rolling window of recent attempts
             meta = self._get_milestone_meta(track, milestone_id)
-            if meta:
-                ms_state = None
-                for m in self.db.get_curriculum_state(track):
-                    if m["milestone_id"] == milestone_id:
-                        ms_state = m
-                        break
-
-                if ms_state and ms_state["status"] == "active":
-                    min_att = meta.get("min_attempts_to_advance", 5)
-                    min_acc = meta.get("min_accuracy_to_advance", 0.80)
-                    attempts = ms_state["attempts"]
-                    accuracy = ms_state["successes"] / attempts if attempts > 0 else 0
-
-                    if attempts >= min_att and accuracy >= min_acc:
-                        self.db.advance_milestone(track, milestone_id)
-                        print(f"CurriculumService: 🎉 Milestone advanced! {track}/{milestone_id} "
-                              f"({attempts} attempts, {accuracy:.0%} accuracy)")
+            if meta and self._milestone_status.get((track, milestone_id)) == "active":
+                min_att = meta.get("min_attempts_to_advance", 5)
+                min_acc = meta.get("min_accuracy_to_advance", 0.80)
+                window = self.db.attempt_windows.get("milestone", f"{track}/{milestone_id}")
+                attempts = window.total
+                accuracy = window.accuracy
+
+                if attempts >= min_att and accuracy >= min_acc:
+                    self.db.advance_milestone(track, milestone_id)
+                    self._load_milestone_status()
+                    print(f"CurriculumService: 🎉 Milestone advanced! {track}/{milestone_id} "
+                          f"({attempts} attempts, {accuracy:.0%} accuracy over the last {len(window)})")
             
             # Notify UI that progress (attempts/accuracy) has changed, even if milestone didn't advance
             print(f"CurriculumService: Emitting curriculumChanged signal!")
@@ -320,4 +369,5 @@ class CurriculumService(QObject):
     def refreshCurriculum(self):
         """Force a refresh of curriculum state (e.g. after settings reset)."""
         self.db.initialize_curriculum(self._tracks_data)
+        self._load_milestone_status()
         self.curriculumChanged.emit()
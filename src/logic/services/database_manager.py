@@ -2,14 +2,28 @@ import sqlite3
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
+from logic.services.latency_sketch import LatencySketch # type: ignore
+from logic.services.confusion import PITCH_CLASS_NAMES # type: ignore
+from logic.services.attempt_window import AttemptWindows # type: ignore
+from logic.services.key_heatmap import KeyHeatmap # type: ignore
 
 class DatabaseManager:
+    # Repertoire index metadata on songs, filled in by RepertoireIndexer
+    SONG_INDEX_COLUMNS = ("file_mtime_ns INTEGER", "file_size INTEGER", "content_hash TEXT",
+                          "duration_sec REAL", "note_count INTEGER", "key_estimate TEXT",
+                          "piano_track TEXT", "max_polyphony INTEGER", "mean_polyphony REAL",
+                          "indexed_at TIMESTAMP", "index_version INTEGER", "difficulty REAL",
+                          "section_difficulty TEXT", "difficulty_features TEXT")
+
     def __init__(self, db_path):
         self.db_path = Path(db_path) if db_path != ":memory:" else db_path
         # Ensure directory exists only for file-based DBs
         if self.db_path != ":memory:":
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        # Rolling last-N attempts per chord/milestone, kept in step with every recorded attempt
+        self.attempt_windows = AttemptWindows()
+        self._warm_attempt_windows()
 
     def _get_connection(self):
         return sqlite3.connect(self.db_path)
@@ -63,6 +77,18 @@ class DatabaseManager:
                 cursor.execute("ALTER TABLE chords ADD COLUMN simultaneous_successes INTEGER DEFAULT 0")
             except sqlite3.OperationalError:
                 pass # Already exists
+
+            try:
+                cursor.execute("ALTER TABLE chords ADD COLUMN latency_sketch BLOB")
+            except sqlite3.OperationalError:
+                pass # Already exists
+
+            # Repertoire index metadata, filled in by RepertoireIndexer
+            for column in self.SONG_INDEX_COLUMNS:
+                try:
+                    cursor.execute(f"ALTER TABLE songs ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass # Already exists
         
             # Generation stats table for adaptive timeout
             cursor.execute('''
@@ -128,9 +154,101 @@ class DatabaseManager:
                     learned_at TIMESTAMP NOT NULL
                 )
             ''')
+
+            # Note confusions — per target, how often each pitch class was played for each expected one
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS note_confusions (
+                    target TEXT NOT NULL,
+                    expected_pc INTEGER NOT NULL,
+                    played_pc INTEGER NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (target, expected_pc, played_pc)
+                )
+            ''')
+
+            # Attempt history — the last N chord/milestone attempts per item, used to warm the rolling windows
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS attempt_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    item_type TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    success INTEGER NOT NULL,
+                    latency_ms REAL DEFAULT 0.0
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_attempt_history_item ON attempt_history (item_type, item_id, id)')
+
+            # Key heatmaps — one compressed 128-pitch metrics array per day
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS key_heatmaps (
+                    day TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                )
+            ''')
+
+            # Chord strikes — onset/release timing of every successful block-chord attempt
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS chord_strikes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    chord_name TEXT NOT NULL,
+                    onset_spread_ms REAL,
+                    release_spread_ms REAL,
+                    arrival_order TEXT,
+                    lagging_finger INTEGER,
+                    lag_ms REAL
+                )
+            ''')
             
             conn.commit()
 
+    def _warm_attempt_windows(self):
+        """Loads the last N attempts per item into memory, plus lifetime totals from the aggregate tables."""
+        windows = self.attempt_windows
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT item_type, item_id, success, latency_ms FROM (
+                    SELECT id, item_type, item_id, success, latency_ms,
+                           ROW_NUMBER() OVER (PARTITION BY item_type, item_id ORDER BY id DESC) AS rn
+                    FROM attempt_history
+                ) WHERE rn <= ? ORDER BY id ASC
+            ''', (windows.size,))
+            windows.warm(cursor.fetchall())
+
+            cursor.execute('SELECT name, success_count, fail_count FROM chords')
+            aggregates = [("chord", name, s or 0, f or 0) for name, s, f in cursor.fetchall()]
+            cursor.execute('SELECT track_name, milestone_id, successes, attempts FROM curriculum_state')
+            aggregates += [("milestone", f"{track}/{ms_id}", s or 0, (a or 0) - (s or 0))
+                           for track, ms_id, s, a in cursor.fetchall()]
+
+        for item_type, item_id, successes, failures in aggregates:
+            attempts = successes + failures
+            if not attempts:
+                continue
+            if (item_type, item_id) in windows:
+                window = windows.get(item_type, item_id)
+                window.total = max(window.total, attempts)
+            else:
+                # Attempts recorded before attempt_history existed
+                windows.get(item_type, item_id).seed(attempts, successes)
+
+    def _log_attempt(self, cursor, item_type: str, item_id: str, success: bool, latency_ms: float, now: str):
+        cursor.execute('''
+            INSERT INTO attempt_history (timestamp, item_type, item_id, success, latency_ms)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (now, item_type, item_id, 1 if success else 0, latency_ms))
+        # Only the last N rows per item are ever read back, so drop anything older
+        cursor.execute('''
+            DELETE FROM attempt_history
+            WHERE item_type = ? AND item_id = ? AND id <= (
+                SELECT id FROM attempt_history WHERE item_type = ? AND item_id = ?
+                ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        ''', (item_type, item_id, item_type, item_id, self.attempt_windows.size))
+        self.attempt_windows.record(item_type, item_id, success, latency_ms)
+
     def record_song_play(self, filepath: str, title: str, mastery_gained: float):
         """Records a song play, updating play count and mastery."""
         now = datetime.now().isoformat()
@@ -237,8 +355,131 @@ class DatabaseManager:
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 ''', (chord_name, now, new_s_count, new_f_count, latency_ms, wrong_notes, new_sim_s))
             
+            self._log_attempt(cursor, "chord", chord_name, success, latency_ms, now)
+            conn.commit()
+
+    def merge_latency_sketches(self, sketches: dict):
+        """Merges per-chord session LatencySketches into the stored lifetime sketches in one transaction."""
+        if not sketches:
+            return
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for chord_name, session_sketch in sketches.items():
+                if not session_sketch.count:
+                    continue
+                cursor.execute('SELECT latency_sketch FROM chords WHERE name = ?', (chord_name,))
+                row = cursor.fetchone()
+                merged = LatencySketch.from_bytes(row[0] if row else None)
+                merged.merge(session_sketch)
+                cursor.execute('''
+                    INSERT INTO chords (name, latency_sketch) VALUES (?, ?)
+                    ON CONFLICT(name) DO UPDATE SET latency_sketch = excluded.latency_sketch
+                ''', (chord_name, merged.to_bytes()))
+            conn.commit()
+
+    def get_latency_sketches(self) -> dict:
+        """Returns the lifetime LatencySketch for every chord that has one."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name, latency_sketch FROM chords WHERE latency_sketch IS NOT NULL')
+            return {name: LatencySketch.from_bytes(blob) for name, blob in cursor.fetchall()}
+
+    def merge_note_confusions(self, rows: list):
+        """Adds a session's (target, expected_pc, played_pc, count) confusion cells in one batch."""
+        if not rows:
+            return
+        with self._get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO note_confusions (target, expected_pc, played_pc, count) VALUES (?, ?, ?, ?)
+                ON CONFLICT(target, expected_pc, played_pc) DO UPDATE SET count = count + excluded.count
+            ''', rows)
+            conn.commit()
+
+    def get_top_confusions(self, limit: int = 5, min_count: int = 2) -> list:
+        """Most frequent wrong-note substitutions, with how often they replace the expected note."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT c.target, c.expected_pc, c.played_pc, c.count,
+                       (SELECT SUM(r.count) FROM note_confusions r
+                        WHERE r.target = c.target AND r.expected_pc = c.expected_pc) AS row_total
+                FROM note_confusions c
+                WHERE c.expected_pc != c.played_pc AND c.count >= ?
+                ORDER BY c.count DESC
+                LIMIT ?
+            ''', (min_count, limit))
+            return [{
+                "target": target,
+                "expected": PITCH_CLASS_NAMES[expected_pc],
+                "played": PITCH_CLASS_NAMES[played_pc],
+                "count": count,
+                "rate": count / row_total if row_total else 0.0,
+            } for target, expected_pc, played_pc, count, row_total in cursor.fetchall()]
+
+    def record_chord_strike(self, strike):
+        """Stores the onset/release timing of one chord attempt (a StrikeReport)."""
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO chord_strikes (timestamp, chord_name, onset_spread_ms, release_spread_ms,
+                                           arrival_order, lagging_finger, lag_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (now, strike.chord_name, strike.onset_spread_ms, strike.release_spread_ms,
+                  json.dumps(strike.arrival_order), strike.lagging_finger, strike.lag_ms))
             conn.commit()
 
+    def get_strike_summary(self, recent: int = 200, limit: int = 5) -> list:
+        """Per chord over the most recent strikes: median-ish onset spread and the finger that lags most often."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT chord_name, onset_spread_ms, release_spread_ms, lagging_finger
+                FROM chord_strikes ORDER BY id DESC LIMIT ?
+            ''', (recent,))
+            by_chord: dict = {}
+            for name, onset, release, finger in cursor.fetchall():
+                by_chord.setdefault(name, []).append((onset, release, finger))
+
+        summary = []
+        for name, rows in by_chord.items():
+            onsets = sorted(r[0] for r in rows if r[0] is not None)
+            releases = sorted(r[1] for r in rows if r[1] is not None)
+            fingers = [r[2] for r in rows if r[2]]
+            summary.append({
+                "chord_name": name,
+                "strikes": len(rows),
+                "onset_spread_ms": onsets[len(onsets) // 2] if onsets else 0.0,
+                "release_spread_ms": releases[len(releases) // 2] if releases else 0.0,
+                "lagging_finger": max(set(fingers), key=fingers.count) if fingers else 0,
+            })
+        summary.sort(key=lambda d: d["onset_spread_ms"], reverse=True)
+        return summary[:limit]
+
+    def merge_key_heatmap(self, heatmap: KeyHeatmap, day: str | None = None):
+        """Adds a session's per-key counts into the blob for the given day (today by default)."""
+        if not heatmap:
+            return
+        day = day or datetime.now().date().isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM key_heatmaps WHERE day = ?', (day,))
+            row = cursor.fetchone()
+            merged = KeyHeatmap.from_bytes(row[0] if row else None)
+            merged.merge(heatmap)
+            cursor.execute('''
+                INSERT INTO key_heatmaps (day, data) VALUES (?, ?)
+                ON CONFLICT(day) DO UPDATE SET data = excluded.data
+            ''', (day, merged.to_bytes()))
+            conn.commit()
+
+    def get_key_heatmap(self, days: int = 30) -> KeyHeatmap:
+        """Sum of the daily key heatmaps over the last N days."""
+        since = (datetime.now().date() - timedelta(days=days - 1)).isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM key_heatmaps WHERE day >= ?', (since,))
+            return KeyHeatmap.sum(KeyHeatmap.from_bytes(blob) for (blob,) in cursor.fetchall())
+
     def calculate_skill_decay(self, decay_hours: int = 48, decay_rate: float = 0.95):
         """
         Applies a decay factor to mastery scores and success counts for items 
@@ -294,7 +535,12 @@ class DatabaseManager:
             cursor.execute('DELETE FROM curriculum_state;')
             cursor.execute('DELETE FROM spaced_repetition;')
             cursor.execute('DELETE FROM session_history;')
+            cursor.execute('DELETE FROM note_confusions;')
+            cursor.execute('DELETE FROM chord_strikes;')
+            cursor.execute('DELETE FROM attempt_history;')
+            cursor.execute('DELETE FROM key_heatmaps;')
             conn.commit()
+        self.attempt_windows.clear()
 
     def has_completed_onboarding(self) -> bool:
         """Returns True if the user has any chord attempt history."""
@@ -310,7 +556,15 @@ class DatabaseManager:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM chords ORDER BY name ASC')
-            return [dict(row) for row in cursor.fetchall()]
+            stats = []
+            for row in cursor.fetchall():
+                entry = dict(row)
+                # QML can't consume raw bytes — expose the sketch as percentiles instead
+                sketch = LatencySketch.from_bytes(entry.pop("latency_sketch", None))
+                entry["p50_latency_ms"] = sketch.p50
+                entry["p90_latency_ms"] = sketch.p90
+                stats.append(entry)
+            return stats
 
     def get_all_song_stats(self):
         """Returns all song statistics as a list of dictionaries for UI display."""
@@ -320,6 +574,84 @@ class DatabaseManager:
             cursor.execute('SELECT * FROM songs ORDER BY mastery_score DESC')
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_song_index_stamps(self) -> dict:
+        """filepath -> (mtime_ns, size, content_hash, index_version) for every song file the indexer has seen."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT filepath, file_mtime_ns, file_size, content_hash, index_version
+                FROM songs WHERE content_hash IS NOT NULL
+            ''')
+            return {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+
+    def upsert_song_index(self, rows: list):
+        """Bulk insert/update of indexed song metadata; titles and play history of known songs are kept."""
+        if not rows:
+            return
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO songs (filepath, title, file_mtime_ns, file_size, content_hash, duration_sec,
+                                   note_count, key_estimate, piano_track, max_polyphony, mean_polyphony, indexed_at,
+                                   index_version, difficulty, section_difficulty, difficulty_features)
+                VALUES (:filepath, :title, :mtime_ns, :size, :content_hash, :duration_sec,
+                        :note_count, :key_estimate, :piano_track, :max_polyphony, :mean_polyphony, :indexed_at,
+                        :index_version, :difficulty, :section_difficulty, :difficulty_features)
+                ON CONFLICT(filepath) DO UPDATE SET
+                    file_mtime_ns = excluded.file_mtime_ns, file_size = excluded.file_size,
+                    content_hash = excluded.content_hash, duration_sec = excluded.duration_sec,
+                    note_count = excluded.note_count, key_estimate = excluded.key_estimate,
+                    piano_track = excluded.piano_track, max_polyphony = excluded.max_polyphony,
+                    mean_polyphony = excluded.mean_polyphony, indexed_at = excluded.indexed_at,
+                    index_version = excluded.index_version, difficulty = excluded.difficulty,
+                    section_difficulty = excluded.section_difficulty,
+                    difficulty_features = excluded.difficulty_features
+            ''', [dict(row, indexed_at=now) for row in rows])
+            conn.commit()
+
+    def get_songs_by_difficulty(self, low: float, high: float) -> list:
+        """Indexed songs with a difficulty score in [low, high], easiest first."""
+        with self._get_connection() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT filepath, title, difficulty, play_count, mastery_score, duration_sec, key_estimate
+                FROM songs WHERE difficulty BETWEEN ? AND ?
+                ORDER BY difficulty ASC
+            ''', (low, high))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_mastered_song_difficulty(self, min_mastery: float) -> float:
+        """Highest difficulty among indexed songs at or above min_mastery (0 if none)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT MAX(difficulty) FROM songs WHERE mastery_score >= ? AND difficulty IS NOT NULL',
+                           (min_mastery,))
+            return cursor.fetchone()[0] or 0.0
+
+    def update_song_stamps(self, rows: list):
+        """(mtime_ns, size, filepath) for files that were touched but whose contents are unchanged."""
+        if not rows:
+            return
+        with self._get_connection() as conn:
+            conn.executemany('UPDATE songs SET file_mtime_ns = ?, file_size = ? WHERE filepath = ?', rows)
+            conn.commit()
+
+    def clear_song_index(self, filepaths: list):
+        """Forgets the index metadata of song files that no longer exist.
+
+        Songs never played are removed; played ones keep their row, so the
+        play history comes back if the same file returns.
+        """
+        if not filepaths:
+            return
+        params = [(path,) for path in filepaths]
+        cleared = ", ".join(f"{column.split()[0]} = NULL" for column in self.SONG_INDEX_COLUMNS)
+        with self._get_connection() as conn:
+            conn.executemany('DELETE FROM songs WHERE filepath = ? AND COALESCE(play_count, 0) = 0', params)
+            conn.executemany(f'UPDATE songs SET {cleared} WHERE filepath = ?', params)
+            conn.commit()
+
     def record_generation_stat(self, model_name: str, generation_time_ms: float, step_count: int, success: bool = True):
         """Records a lesson plan generation attempt with timing data."""
         now = datetime.now().isoformat()
@@ -392,6 +724,31 @@ class DatabaseManager:
                 for name, s, f in struggling:
                     context += f"- {name} (Success: {s}, Fail: {f})\n"
             
+            # Get the slowest chords by tail latency (from the merged per-chord sketches)
+            sketches = self.get_latency_sketches()
+            slowest = sorted(sketches.items(), key=lambda kv: kv[1].p90, reverse=True)[:5]
+            if slowest:
+                context += "\nSlowest Chords (response time p50 / p90):\n"
+                for name, sketch in slowest:
+                    context += f"- {name}: {sketch.p50:.0f}ms / {sketch.p90:.0f}ms over {sketch.count} successes\n"
+
+            # Get the most frequent wrong-note substitutions
+            confusions = self.get_top_confusions(limit=5)
+            if confusions:
+                context += "\nFrequent Wrong Notes (played instead of the chord tone):\n"
+                for c in confusions:
+                    context += (f"- {c['target']}: played {c['played']} instead of {c['expected']} "
+                                f"{c['count']} times ({c['rate']:.0%} of the time)\n")
+
+            # Get the chords struck least together (block-chord technique)
+            strikes = [s for s in self.get_strike_summary() if s["onset_spread_ms"] >= 40]
+            if strikes:
+                context += "\nUneven Block Chords (median onset spread, finger 1 = lowest key):\n"
+                for s in strikes:
+                    context += (f"- {s['chord_name']}: keys land over {s['onset_spread_ms']:.0f}ms, "
+                                f"finger {s['lagging_finger']} usually arrives last, "
+                                f"release spread {s['release_spread_ms']:.0f}ms\n")
+
             # Get recently decayed chords
             decayed = self.calculate_skill_decay(decay_hours=48, decay_rate=0.90)
             if decayed:
@@ -472,6 +829,7 @@ class DatabaseManager:
 
     def record_milestone_attempt(self, track_name: str, milestone_id: str, success: bool):
         """Record an attempt on a milestone and update its counts."""
+        now = datetime.now().isoformat()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
@@ -479,6 +837,8 @@ class DatabaseManager:
                 SET attempts = attempts + 1, successes = successes + ?
                 WHERE track_name = ? AND milestone_id = ?
             ''', (1 if success else 0, track_name, milestone_id))
+            if cursor.rowcount:
+                self._log_attempt(cursor, "milestone", f"{track_name}/{milestone_id}", success, 0.0, now)
             conn.commit()
 
     def advance_milestone(self, track_name: str, milestone_id: str):
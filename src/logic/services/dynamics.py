@@ -0,0 +1,67 @@
+"""
+VelocityLog — compact per-session record of note-on velocities.
+
+Every note-on the trainer sees is appended as (pitch, velocity, time) to three
+typed arrays, so a long session costs a few bytes per note. When a step
+completes, the slice of the log belonging to that step is analysed in one
+vectorized pass: each finger's velocity is the last strike of its key, and
+evenness is how little those velocities vary across fingers.
+"""
+from array import array
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class VelocityLog:
+    def __init__(self):
+        self.pitches = array('B')
+        self.velocities = array('B')
+        self.times = array('d')
+
+    def __len__(self) -> int:
+        return len(self.pitches)
+
+    def append(self, pitch: int, velocity: int, t: float):
+        self.pitches.append(pitch & 0x7F)
+        self.velocities.append(velocity & 0x7F)
+        self.times.append(t)
+
+    def clear(self):
+        del self.pitches[:]
+        del self.velocities[:]
+        del self.times[:]
+
+    def step_metrics(self, start: int, fingers: List[int]) -> Optional[Dict]:
+        """
+        Evenness of the notes logged since `start` for the given keys, in finger
+        order (lowest chord tone / first scale note is finger 1). Returns None if
+        any finger's key was never struck with a known velocity.
+        """
+        if not fingers or start >= len(self.pitches):
+            return None
+        pitches = np.frombuffer(self.pitches, dtype=np.uint8)[start:]
+        velocities = np.frombuffer(self.velocities, dtype=np.uint8)[start:]
+        keys = np.asarray(fingers, dtype=np.uint8)
+
+        # (fingers x notes) match matrix; the last hit per row is that finger's strike
+        hits = keys[:, None] == pitches[None, :]
+        if not hits.any(axis=1).all():
+            return None
+        last = hits.shape[1] - 1 - np.argmax(hits[:, ::-1], axis=1)
+        per_finger = velocities[last].astype(np.float64)
+
+        mean = float(per_finger.mean())
+        std = float(per_finger.std())
+        loudest = int(np.argmax(per_finger))
+        softest = int(np.argmin(per_finger))
+        return {
+            "velocities": per_finger.astype(int).tolist(),
+            "mean_velocity": round(mean, 1),
+            "spread": int(per_finger.max() - per_finger.min()),
+            # 1.0 = every finger at the same level; coefficient of variation below that
+            "evenness": round(max(0.0, 1.0 - std / mean), 3) if mean > 0 else 0.0,
+            "loudest_finger": loudest + 1,
+            "loudest_pitch": int(keys[loudest]),
+            "softest_finger": softest + 1,
+            "softest_pitch": int(keys[softest]),
+        }
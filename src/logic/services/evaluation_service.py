@@ -1,30 +1,45 @@
-import json
-import time
+from array import array
+from bisect import bisect_left
 from pathlib import Path
-from typing import List, Dict, Any
-from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, Qt # type: ignore
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from PySide6.QtCore import QObject, Signal, Slot, Property, Qt # type: ignore
 from logic.services.database_manager import DatabaseManager # type: ignore
+from logic.services.clock import SystemClock # type: ignore
+from logic.services.level_pack import load_level_pack # type: ignore
+
+# Per-note states, stored as a compact byte array
+NOTE_PENDING, NOTE_HIT, NOTE_MISS = 0, 1, 2
+NOTE_STATE_NAMES = ("pending", "hit", "miss")
 
 
 class EvaluationService(QObject):
     """
     Manages the onboarding skill evaluation using scrolling sheet music.
-    Plays through pre-generated melody sequences at increasing difficulty,
-    scoring the user's accuracy to determine their skill level.
+    Plays pre-generated melody sequences of increasing difficulty, scoring the
+    user's accuracy to determine their skill level. The default "adaptive"
+    placement binary-searches the levels: it keeps the highest level passed and
+    the lowest level failed, plays the midpoint until they are adjacent, so the
+    result is always confirmed by the neighbouring level. "linear" walks up from
+    level 1 until the first failure.
     """
     # QML state signals
     sequenceChanged = Signal()
-    beatChanged = Signal()
+    beatChanged = Signal()  # Only on playhead anchors; QML interpolates in between
+    # Playhead anchor: (kind, beat, clock time, beats per second, running).
+    # kind is "start", "pause", "resume", "seek" or "stop".
+    playheadAnchored = Signal(str, float, float, float, bool)
     levelChanged = Signal()
     evaluationFinished = Signal()
     metronomeTick = Signal(int)  # Beat number (1-4) during lead-in
     noteStateChanged = Signal()  # Emitted when a note is hit or missed
     pausedChanged = Signal()
 
-    def __init__(self, db: DatabaseManager, project_root: Path):
+    def __init__(self, db: DatabaseManager, project_root: Path, pack_path: Path, clock=None,
+                 placement: str = "adaptive"):
         super().__init__()
         self.db = db
-        self._sequences: List[Dict[str, Any]] = []
+        self._clock = clock or SystemClock()
+        self._placement = placement  # "adaptive" or "linear"
         self._is_running = False
         self._current_level = 0
         self._current_beat = -4.0  # Start 4 beats before notes arrive
@@ -32,14 +47,27 @@ class EvaluationService(QObject):
         self._accuracy = 0.0
         self._assessed_level = 0
         self._paused = False
+        self._anchor_time = 0.0
+
+        # Placement bounds: highest level passed and lowest level failed so far
+        self._passed_level = 0
+        self._failed_level = 1
+        self._levels_played = 0
 
         # Current sequence data
         self._sequence_notes: List[Dict[str, Any]] = []
-        self._note_states: List[str] = []  # "pending", "hit", "miss"
+        self._note_states = array('b')  # NOTE_PENDING / NOTE_HIT / NOTE_MISS per note
         self._active_held_keys: set[int] = set()
 
+        # Compiled at level start: note indices sorted by start beat, plus a per-pitch index
+        self._sorted_starts: List[float] = []
+        self._sorted_indices: List[int] = []
+        self._pitch_index: Dict[int, Tuple[List[float], List[int]]] = {}
+        self._miss_cursor = 0  # Everything before this in sorted order has been resolved
+        self._sequence_end_beat = 0.0
+
         # Timing
-        self._beat_timer = QTimer()
+        self._beat_timer = self._clock.create_timer()
         self._beat_timer.setTimerType(Qt.PreciseTimer)
         self._tick_interval_ms = 10  # 100fps update rate for buttery smooth movement
         self._beat_timer.setInterval(self._tick_interval_ms)
@@ -57,14 +85,21 @@ class EvaluationService(QObject):
         self._advance_threshold = 0.70
         self._fail_threshold = 0.60
 
-        # Load sequences
-        seq_path = project_root / "src" / "resources" / "sequences.json"
-        if seq_path.exists():
-            with open(seq_path, "r", encoding="utf-8") as f:
-                self._sequences = json.load(f)
-            print(f"EvaluationService: Loaded {len(self._sequences)} sequences")
-        else:
-            print(f"EvaluationService: WARNING - {seq_path} not found!")
+        # Sequences are compiled into a level pack (at pack_path) and only opened when the evaluation needs them
+        self._sequence_source = project_root / "src" / "resources" / "sequences.json"
+        self._pack_path = Path(pack_path)
+        self._levels: Optional[Sequence[Dict[str, Any]]] = None
+
+    @property
+    def _sequences(self) -> Sequence[Dict[str, Any]]:
+        if self._levels is None:
+            self._levels = load_level_pack(self._sequence_source, self._pack_path)
+            print(f"EvaluationService: Loaded {len(self._levels)} sequences")
+        return self._levels
+
+    @_sequences.setter
+    def _sequences(self, levels: Sequence[Dict[str, Any]]):
+        self._levels = levels
 
     # ── Properties for QML ──────────────────────────────────────────
 
@@ -74,6 +109,7 @@ class EvaluationService(QObject):
 
     @Property(float, notify=beatChanged)
     def currentBeat(self) -> float:
+        """The beat at the last anchor (the scrolling view extrapolates from it)."""
         return self._current_beat
 
     @Property(int, notify=levelChanged)
@@ -104,7 +140,7 @@ class EvaluationService(QObject):
 
     @Property(list, notify=noteStateChanged)
     def noteStates(self) -> list:
-        return self._note_states
+        return [NOTE_STATE_NAMES[s] for s in self._note_states]
 
     @Property(bool, notify=pausedChanged)
     def paused(self) -> bool:
@@ -112,17 +148,25 @@ class EvaluationService(QObject):
 
     # ── Public Slots ────────────────────────────────────────────────
 
+    @Slot(result=float)
+    def clockNow(self) -> float:
+        """The service clock, so the view can age a playheadAnchored anchor by its delivery delay."""
+        return self._clock.now()
+
     @Slot()
     @Slot(bool)
     def startEvaluation(self, paused: bool = False):
-        """Begin the evaluation from level 1."""
+        """Begin the evaluation at the first placement level."""
         self._current_level = 0
         self._assessed_level = 0
+        self._passed_level = 0
+        self._failed_level = len(self._sequences) + 1
+        self._levels_played = 0
         self._is_running = True
         self._paused = paused
         self.sequenceChanged.emit()
         self.pausedChanged.emit()
-        self._start_level(1, paused=paused)
+        self._start_level(self._next_level() or 1, paused=paused)
 
     @Slot()
     def stopEvaluation(self):
@@ -130,10 +174,10 @@ class EvaluationService(QObject):
         self._beat_timer.stop()
         self._is_running = False
         self._paused = False
-        self._sequence_notes = []
-        self._note_states = []
+        self._compile_notes([])
         self.sequenceChanged.emit()
         self.pausedChanged.emit()
+        self._publish_anchor("stop")
         
     @Slot()
     def togglePause(self):
@@ -143,11 +187,14 @@ class EvaluationService(QObject):
             
         if self._beat_timer.isActive():
             self._beat_timer.stop()
+            self._settle_beat()  # Anchor at the exact beat where playback stopped
             self._paused = True
+            self._publish_anchor("pause")
         else:
-            self._last_tick_time = time.perf_counter()
+            self._last_tick_time = self._clock.now()
             self._beat_timer.start()
             self._paused = False
+            self._publish_anchor("resume")
         self.pausedChanged.emit()
 
     @Slot()
@@ -162,12 +209,23 @@ class EvaluationService(QObject):
     def resume(self):
         """Resume the evaluation if it was paused."""
         if self._is_running and self._paused:
-            self._last_tick_time = time.perf_counter()
+            self._last_tick_time = self._clock.now()
             self._beat_timer.start()
             self._paused = False
+            self._publish_anchor("resume")
             self.pausedChanged.emit()
             print("EvaluationService: Resuming evaluation.")
 
+    @Slot(float)
+    def seek(self, beat: float):
+        """Moves the playhead; notes before the new position are resolved as missed."""
+        if not self._is_running:
+            return
+        self._current_beat = beat
+        self._last_tick_time = self._clock.now()
+        self._check_missed_notes()
+        self._publish_anchor("seek")
+
     # ── Level Management ────────────────────────────────────────────
 
     def _start_level(self, level: int, paused: bool = False):
@@ -177,10 +235,10 @@ class EvaluationService(QObject):
             return
 
         self._current_level = level
+        self._levels_played += 1
         seq = self._sequences[level - 1]
         self._tempo_bpm = seq.get("tempo_bpm", 100)
-        self._sequence_notes = seq.get("notes", [])
-        self._note_states = ["pending"] * len(self._sequence_notes)
+        self._compile_notes(seq.get("notes", []))
         self._active_held_keys.clear()
 
         # Reset beat to 4 beats before the first note
@@ -192,7 +250,6 @@ class EvaluationService(QObject):
 
         self.levelChanged.emit()
         self.sequenceChanged.emit()
-        self.beatChanged.emit()
         self.noteStateChanged.emit()
 
         print(f"EvaluationService: Starting level {level} — '{seq.get('title', '')}' at {self._tempo_bpm} BPM")
@@ -200,11 +257,39 @@ class EvaluationService(QObject):
 
         if not paused:
             # Start the beat timer
-            self._last_tick_time = time.perf_counter()
+            self._last_tick_time = self._clock.now()
             self._beat_timer.start()
             print(f"EvaluationService: Beat timer starting at beat {self._current_beat}")
         else:
             print(f"EvaluationService: Starting level {level} in PAUSED mode")
+        # The anchor carries this level's tempo, so it also serves as the tempo change
+        self._publish_anchor("start")
+
+    def _publish_anchor(self, kind: str):
+        """Tells the view where the playhead is now; it animates locally until the next anchor."""
+        self._anchor_time = self._clock.now()
+        running = self._is_running and self._beat_timer.isActive()
+        self.beatChanged.emit()
+        self.playheadAnchored.emit(kind, self._current_beat, self._anchor_time,
+                                   self._tempo_bpm / 60.0, running)
+
+    def _compile_notes(self, notes: List[Dict[str, Any]]):
+        """Builds the sorted start-beat arrays and per-pitch index used for hit/miss detection."""
+        self._sequence_notes = notes
+        self._note_states = array('b', bytes(len(notes)))
+        self._sorted_indices = sorted(range(len(notes)), key=lambda i: notes[i]["start_beat"])
+        self._sorted_starts = [notes[i]["start_beat"] for i in self._sorted_indices]
+        by_pitch: Dict[int, Tuple[List[float], List[int]]] = {}
+        for i in self._sorted_indices:
+            starts, indices = by_pitch.setdefault(notes[i]["pitch"], ([], []))
+            starts.append(notes[i]["start_beat"])
+            indices.append(i)
+        self._pitch_index = by_pitch
+        self._miss_cursor = 0
+        self._sequence_end_beat = (
+            notes[-1]["start_beat"] + notes[-1]["duration_beats"] + 2  # 2 beats buffer
+            if notes else 0.0
+        )
 
     def _finish_evaluation(self):
         """End the evaluation and report results."""
@@ -214,21 +299,18 @@ class EvaluationService(QObject):
         # The assessed level is the last level they passed
         print(f"EvaluationService: Evaluation complete. Assessed level: {self._assessed_level}")
 
+        self._publish_anchor("stop")
         self.sequenceChanged.emit()
         self.evaluationFinished.emit()
 
     # ── Beat Timer ──────────────────────────────────────────────────
 
     def _advance_beat(self):
-        """Called ~60x/sec by QTimer. Advances currentBeat based on real elapsed time."""
-        now = time.perf_counter()
-        elapsed_sec = now - self._last_tick_time
-        self._last_tick_time = now
-
-        beats_per_sec = self._tempo_bpm / 60.0
-        beat_delta = elapsed_sec * beats_per_sec
-        self._current_beat += beat_delta
-        self.beatChanged.emit()
+        """
+        Called every tick by QTimer. Advances the authoritative beat used for scoring;
+        the view is not notified here, it interpolates between playhead anchors.
+        """
+        self._settle_beat()
 
         # Emit metronome ticks during the lead-in (beats -4 through -1)
         if self._next_metronome_beat <= -1:
@@ -242,37 +324,57 @@ class EvaluationService(QObject):
         self._check_missed_notes()
 
         # Check if sequence is complete
-        last_note = self._sequence_notes[-1] if self._sequence_notes else None
-        if last_note:
-            seq_end = last_note["start_beat"] + last_note["duration_beats"] + 2  # 2 beats buffer
-            if self._current_beat > seq_end:
-                self._end_level()
+        if self._sequence_notes and self._current_beat > self._sequence_end_beat:
+            self._end_level()
+
+    def _settle_beat(self):
+        """Advances the beat by the time elapsed since the last tick."""
+        now = self._clock.now()
+        elapsed_sec = now - self._last_tick_time
+        self._last_tick_time = now
+
+        beats_per_sec = self._tempo_bpm / 60.0
+        self._current_beat += elapsed_sec * beats_per_sec
 
     def _end_level(self):
         """Evaluate accuracy for this level and decide what to do next."""
         self._beat_timer.stop()
 
         total = len(self._note_states)
-        hits = self._note_states.count("hit")
+        hits = self._note_states.count(NOTE_HIT)
         self._accuracy = hits / total if total > 0 else 0.0
 
         print(f"EvaluationService: Level {self._current_level} complete — "
               f"{hits}/{total} ({self._accuracy*100:.0f}%)")
 
+        level = self._current_level
         if self._accuracy >= self._advance_threshold:
-            # Passed — record and advance
-            self._assessed_level = self._current_level
-            if self._current_level < len(self._sequences):
-                self._start_level(self._current_level + 1)
-            else:
-                self._finish_evaluation()
+            # Passed — everything up to here counts
+            self._passed_level = max(self._passed_level, level)
         elif self._accuracy >= self._fail_threshold:
-            # Borderline — still counts, but stop here
-            self._assessed_level = self._current_level
-            self._finish_evaluation()
+            # Borderline — still counts, but this is the ceiling
+            self._passed_level = max(self._passed_level, level)
+            self._failed_level = min(self._failed_level, level + 1)
         else:
-            # Failed — stop, don't count this level
+            # Failed — don't count this level or anything above it
+            self._failed_level = min(self._failed_level, level)
+        self._assessed_level = self._passed_level
+
+        next_level = self._next_level()
+        if next_level is None:
+            print(f"EvaluationService: Placement settled after {self._levels_played} sequences")
             self._finish_evaluation()
+        else:
+            self._start_level(next_level)
+
+    def _next_level(self) -> int | None:
+        """The next level to play, or None once the passed and failed bounds are adjacent."""
+        lo, hi = self._passed_level, self._failed_level
+        if hi - lo <= 1:
+            return None
+        if self._placement == "linear":
+            return lo + 1
+        return (lo + hi) // 2
 
     # ── MIDI Input Handling ─────────────────────────────────────────
 
@@ -289,28 +391,32 @@ class EvaluationService(QObject):
 
     def _check_note_hit(self, pitch: int):
         """Check if a played pitch matches any pending note within the hit window."""
-        for i, note in enumerate(self._sequence_notes):
-            if self._note_states[i] != "pending":
-                continue
-            if note["pitch"] != pitch:
-                continue
-
-            # Check if within timing window
-            time_diff = abs(self._current_beat - note["start_beat"])
-            if time_diff <= self._hit_window_beats:
-                self._note_states[i] = "hit"
+        entry = self._pitch_index.get(pitch)
+        if entry is None:
+            return
+        starts, indices = entry
+        window = self._hit_window_beats
+        k = bisect_left(starts, self._current_beat - window)
+        while k < len(starts) and starts[k] <= self._current_beat + window:
+            i = indices[k]
+            if self._note_states[i] == NOTE_PENDING:
+                self._note_states[i] = NOTE_HIT
                 self.noteStateChanged.emit()
                 return
+            k += 1
 
     def _check_missed_notes(self):
-        """Mark notes as missed if the playhead has moved past them."""
+        """Mark notes as missed once the playhead has moved past their hit window."""
         changed = False
-        for i, note in enumerate(self._sequence_notes):
-            if self._note_states[i] != "pending":
-                continue
-            # If we're past the hit window for this note, it's missed
-            if self._current_beat > note["start_beat"] + self._hit_window_beats:
-                self._note_states[i] = "miss"
+        cutoff = self._current_beat - self._hit_window_beats
+        starts = self._sorted_starts
+        cursor = self._miss_cursor
+        while cursor < len(starts) and starts[cursor] < cutoff:
+            i = self._sorted_indices[cursor]
+            if self._note_states[i] == NOTE_PENDING:
+                self._note_states[i] = NOTE_MISS
                 changed = True
+            cursor += 1
+        self._miss_cursor = cursor
         if changed:
             self.noteStateChanged.emit()
@@ -0,0 +1,92 @@
+"""
+KeyHeatmap — per-key practice statistics across every exercise.
+
+A fixed (128 MIDI pitches x 6 metrics) float64 array: hits, misses,
+wrong-presses, summed hit latency, summed velocity and velocity count. Every
+note event is a single indexed add. The sums are float64 because a float32
+running sum stops absorbing small values once it is large, and the averages
+drift. A day's array is stored as one zlib-compressed blob (mostly zeros, so
+around a kilobyte); summing a month of them gives the lifetime view that
+VisualKeyboard.qml overlays.
+"""
+import struct
+import zlib
+from typing import Iterable, List
+import numpy as np
+
+HITS, MISSES, WRONG, LATENCY_SUM, VELOCITY_SUM, VELOCITY_N = range(6)
+N_METRICS = 6
+BLOB_HEADER = struct.Struct("<BHH")  # version, pitches, metrics
+BLOB_VERSION = 2
+BLOB_DTYPES = {1: np.float32, 2: np.float64}
+
+
+class KeyHeatmap:
+    def __init__(self, data: np.ndarray | None = None):
+        self.data = data if data is not None else np.zeros((128, N_METRICS), dtype=np.float64)
+
+    def __bool__(self) -> bool:
+        return bool(self.data.any())
+
+    def hit(self, pitch: int, latency_ms: float, velocity: int = 0):
+        row = self.data[pitch & 0x7F]
+        row[HITS] += 1
+        row[LATENCY_SUM] += latency_ms
+        if velocity > 0:
+            row[VELOCITY_SUM] += velocity
+            row[VELOCITY_N] += 1
+
+    def wrong(self, pitch: int, velocity: int = 0):
+        row = self.data[pitch & 0x7F]
+        row[WRONG] += 1
+        if velocity > 0:
+            row[VELOCITY_SUM] += velocity
+            row[VELOCITY_N] += 1
+
+    def miss(self, pitch: int):
+        self.data[pitch & 0x7F, MISSES] += 1
+
+    def merge(self, other: "KeyHeatmap"):
+        self.data += other.data
+
+    def clear(self):
+        self.data[:] = 0
+
+    def error_rates(self) -> List[float]:
+        """Per pitch, (misses + wrong-presses) / all events; -1 where the key has no data."""
+        d = self.data
+        errors = d[:, MISSES] + d[:, WRONG]
+        total = d[:, HITS] + errors
+        rates = np.divide(errors, total, out=np.full(128, -1.0), where=total > 0)
+        return rates.round(3).tolist()
+
+    def mean_latency_ms(self, pitch: int) -> float:
+        hits = self.data[pitch, HITS]
+        return float(self.data[pitch, LATENCY_SUM] / hits) if hits else 0.0
+
+    def mean_velocity(self, pitch: int) -> float:
+        n = self.data[pitch, VELOCITY_N]
+        return float(self.data[pitch, VELOCITY_SUM] / n) if n else 0.0
+
+    def to_bytes(self) -> bytes:
+        return BLOB_HEADER.pack(BLOB_VERSION, 128, N_METRICS) + zlib.compress(self.data.tobytes())
+
+    @classmethod
+    def from_bytes(cls, blob: bytes | None) -> "KeyHeatmap":
+        if not blob:
+            return cls()
+        version, pitches, metrics = BLOB_HEADER.unpack_from(blob, 0)
+        # Version 1 blobs were float32
+        raw = np.frombuffer(zlib.decompress(blob[BLOB_HEADER.size:]), dtype=BLOB_DTYPES.get(version, np.float64))
+        data = np.zeros((128, N_METRICS), dtype=np.float64)
+        # Tolerate blobs written with a different metric count by another version
+        m = min(metrics, N_METRICS)
+        data[:pitches, :m] = raw.reshape(pitches, metrics)[:, :m]
+        return cls(data)
+
+    @classmethod
+    def sum(cls, heatmaps: Iterable["KeyHeatmap"]) -> "KeyHeatmap":
+        total = cls()
+        for heatmap in heatmaps:
+            total.merge(heatmap)
+        return total
@@ -0,0 +1,130 @@
+"""
+LatencySketch — mergeable streaming quantile sketch for response latencies.
+
+A DDSketch-style log-bucketed histogram: every value lands in a bucket whose
+width grows geometrically, so any quantile is reported within a fixed relative
+error (2%) no matter how many values were added. Memory is bounded by the
+number of buckets (a few hundred at most for 1ms..1 day), sketches merge by
+adding bucket counts, and the whole thing serializes to a few hundred bytes
+for the `chords.latency_sketch` column.
+"""
+import math
+import struct
+from array import array
+from typing import Dict, Optional
+
+
+class LatencySketch:
+    RELATIVE_ACCURACY = 0.02
+    MIN_VALUE_MS = 1.0
+    MAX_BINS = 512
+
+    _GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(_GAMMA)
+
+    # Serialized layout: version, count, bin count, min, max, sum — followed by
+    # the bin indices (int16) and the bin counts (uint32) as two packed arrays.
+    _VERSION = 1
+    _HEADER = struct.Struct("<BIHddd")
+
+    def __init__(self):
+        self._bins: Dict[int, int] = {}
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+        self.sum = 0.0
+
+    # ── Updates ───────────────────────────────────────────────────────
+
+    def add(self, value_ms: float, weight: int = 1):
+        """Record a latency sample (in milliseconds)."""
+        value_ms = max(float(value_ms), self.MIN_VALUE_MS)
+        key = math.ceil(math.log(value_ms) / self._LOG_GAMMA)
+        self._bins[key] = self._bins.get(key, 0) + weight
+        self.count += weight
+        self.sum += value_ms * weight
+        if value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+        if len(self._bins) > self.MAX_BINS:
+            self._collapse()
+
+    def merge(self, other: "LatencySketch"):
+        """Fold another sketch into this one (e.g. a session into the lifetime total)."""
+        if other.count == 0:
+            return
+        for key, n in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self._bins) > self.MAX_BINS:
+            self._collapse()
+
+    def _collapse(self):
+        """Fold the lowest buckets together so memory stays bounded."""
+        keys = sorted(self._bins)
+        excess = keys[:len(keys) - self.MAX_BINS + 1]
+        folded = sum(self._bins.pop(k) for k in excess)
+        self._bins[excess[-1]] = folded
+
+    # ── Queries ───────────────────────────────────────────────────────
+
+    def quantile(self, q: float) -> float:
+        """Returns the estimated q-quantile (0.0-1.0) in ms, or 0.0 when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                estimate = 2 * (self._GAMMA ** key) / (self._GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def p50(self) -> float:
+        return self.quantile(0.50)
+
+    @property
+    def p90(self) -> float:
+        return self.quantile(0.90)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ── Serialization ─────────────────────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        keys = sorted(self._bins)
+        header = self._HEADER.pack(self._VERSION, self.count, len(keys),
+                                   self.min if self.count else 0.0, self.max, self.sum)
+        return header + array("h", keys).tobytes() + array("I", (self._bins[k] for k in keys)).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "LatencySketch":
+        sketch = cls()
+        if not data:
+            return sketch
+        version, count, n_bins, min_v, max_v, total = cls._HEADER.unpack_from(data)
+        if version != cls._VERSION:
+            return sketch
+        offset = cls._HEADER.size
+        keys = array("h")
+        keys.frombytes(data[offset:offset + n_bins * keys.itemsize])
+        offset += n_bins * keys.itemsize
+        counts = array("I")
+        counts.frombytes(data[offset:offset + n_bins * counts.itemsize])
+        sketch._bins = dict(zip(keys, counts))
+        sketch.count = count
+        sketch.min = min_v if count else math.inf
+        sketch.max = max_v
+        sketch.sum = total
+        return sketch
@@ -0,0 +1,135 @@
+"""
+LevelPack — precompiled, memory-mapped evaluation sequences.
+
+sequences.json stays the editable source. It is compiled into a compact
+binary pack under database/cache/: a header stamped with the source file's
+mtime and size, one fixed-size index entry per level (tempo, offset and
+count of its note records, offset and length of its metadata), then each
+level's notes as packed (pitch, hand, start beat, duration) records. The
+pack is memory-mapped and a level is decoded only when it is asked for, so
+opening the evaluation costs a header read instead of a JSON parse. A pack
+whose stamp no longer matches the JSON is rebuilt automatically.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+MAGIC = b"CCLP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHqqI")   # magic, version, note record size, source mtime (ns), source size, levels
+LEVEL = struct.Struct("<HIIII")      # tempo (BPM), notes offset, note count, metadata offset, metadata length
+NOTE = struct.Struct("<BBff")        # pitch, hand, start beat, duration (beats)
+HANDS = ("", "L", "R")               # Stored as an index; "" means the view picks a staff by pitch
+
+
+def compile_levels(levels: Sequence[Dict[str, Any]], mtime_ns: int = 0, size: int = 0) -> bytes:
+    """Packs a sequences.json level list into the binary layout described above."""
+    index = bytearray()
+    body = bytearray()
+    body_start = HEADER.size + LEVEL.size * len(levels)
+    for level in levels:
+        notes = level.get("notes", [])
+        notes_offset = body_start + len(body)
+        for note in notes:
+            hand = note.get("hand", "")
+            body += NOTE.pack(note["pitch"], HANDS.index(hand) if hand in HANDS else 0,
+                              note["start_beat"], note["duration_beats"])
+        meta = json.dumps({k: v for k, v in level.items() if k not in ("notes", "tempo_bpm")}).encode("utf-8")
+        meta_offset = body_start + len(body)
+        body += meta
+        index += LEVEL.pack(level.get("tempo_bpm", 100), notes_offset, len(notes), meta_offset, len(meta))
+    header = HEADER.pack(MAGIC, VERSION, NOTE.size, mtime_ns, size, len(levels))
+    return header + bytes(index) + bytes(body)
+
+
+class LevelPack:
+    """Read-only list-like view over a compiled pack; pack[i] decodes level i."""
+
+    def __init__(self, buffer, file=None):
+        self._buf = buffer
+        self._file = file
+        magic, version, note_size, self.source_mtime_ns, self.source_size, self._count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION or note_size != NOTE.size:
+            self.close()
+            raise ValueError("not a current level pack")
+        self._cached: Optional[tuple] = None  # (index, decoded level) — titles and notes are read back to back
+
+    @classmethod
+    def open(cls, path: Path) -> "LevelPack":
+        f = open(path, "rb")
+        try:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), f)
+        except (ValueError, struct.error):
+            f.close()
+            raise ValueError(f"{path} is not a current level pack")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        if self._cached and self._cached[0] == index:
+            return self._cached[1]
+        tempo, notes_offset, note_count, meta_offset, meta_length = LEVEL.unpack_from(
+            self._buf, HEADER.size + index * LEVEL.size)
+        level = json.loads(bytes(self._buf[meta_offset:meta_offset + meta_length]).decode("utf-8"))
+        level["tempo_bpm"] = tempo
+        records = memoryview(self._buf)[notes_offset:notes_offset + note_count * NOTE.size]
+        level["notes"] = [
+            {"pitch": pitch, "start_beat": start, "duration_beats": duration, "hand": HANDS[hand]}
+            for pitch, hand, start, duration in NOTE.iter_unpack(records)
+        ]
+        records.release()
+        self._cached = (index, level)
+        return level
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            try:
+                self._buf.close()
+            except (BufferError, ValueError):
+                pass
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def load_level_pack(source: Path, pack_path: Path) -> Sequence[Dict[str, Any]]:
+    """
+    Opens the pack for source, rebuilding it first if it is missing or stale.
+    Falls back to an in-memory pack if the cache directory is not writable,
+    and to an empty list if the source does not exist.
+    """
+    try:
+        stat = os.stat(source)
+    except OSError:
+        print(f"LevelPack: WARNING - {source} not found!")
+        return []
+
+    try:
+        pack = LevelPack.open(pack_path)
+        if pack.source_mtime_ns == stat.st_mtime_ns and pack.source_size == stat.st_size:
+            return pack
+        pack.close()
+    except (OSError, ValueError):
+        pass
+
+    with open(source, "r", encoding="utf-8") as f:
+        levels: List[Dict[str, Any]] = json.load(f)
+    data = compile_levels(levels, stat.st_mtime_ns, stat.st_size)
+    try:
+        pack_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pack_path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, pack_path)
+        print(f"LevelPack: Compiled {len(levels)} levels into {pack_path} ({len(data)} bytes)")
+        return LevelPack.open(pack_path)
+    except (OSError, ValueError) as e:
+        print(f"LevelPack: Could not write {pack_path} ({e}); using an in-memory pack")
+        return LevelPack(data)
@@ -0,0 +1,105 @@
+"""
+MidiParseCache — parsed MIDI files on disk, keyed by content hash.
+
+MidiIngestor stores the time-sorted note array of a file's selected piano
+track as <key>.npy next to a small <key>.json with its metadata (duration,
+instruments, selected track), where the key is the SHA-256 of the file's
+bytes plus the parser version. A hit memory-maps the array instead of
+parsing and re-running track selection, so a song that has been opened
+before loads in about a millisecond. Each hit touches the entry, and the
+least recently used entries are evicted once the cache grows past its size
+budget. Results derived from the notes (e.g. a chord chart) can be stored
+with an entry as <key>.<name>.json and are evicted with it.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+
+class MidiParseCache:
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, version: int, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def key_for(self, file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return f"{digest.hexdigest()[:32]}-v{self.version}"
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, Dict]]:
+        array_path = self.cache_dir / f"{key}.npy"
+        meta_path = self.cache_dir / f"{key}.json"
+        try:
+            metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+            notes = np.load(array_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        # Mark as recently used for eviction
+        for path in (array_path, meta_path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return notes, metadata
+
+    def put(self, key: str, notes: np.ndarray, metadata: Dict):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(notes))
+            os.replace(tmp, self.cache_dir / f"{key}.npy")
+            # Metadata last: an entry only counts once its .json exists
+            (self.cache_dir / f"{key}.json").write_text(json.dumps(metadata), encoding="utf-8")
+        except OSError as e:
+            print(f"MidiParseCache: Could not cache {key}: {e}")
+            return
+        self.evict()
+
+    def get_extra(self, key: str, name: str) -> Optional[Any]:
+        try:
+            return json.loads((self.cache_dir / f"{key}.{name}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put_extra(self, key: str, name: str, data: Any):
+        """Stores data derived from an entry's notes; dropped when the entry is evicted."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.{name}.json").write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            print(f"MidiParseCache: Could not cache {name} for {key}: {e}")
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for meta_path in self.cache_dir.glob("*.json"):
+            if "." in meta_path.stem:
+                continue  # An extra, counted with its entry below
+            array_path = meta_path.with_suffix(".npy")
+            extras = list(self.cache_dir.glob(f"{meta_path.stem}.*.json"))
+            try:
+                size = meta_path.stat().st_size + array_path.stat().st_size + sum(p.stat().st_size for p in extras)
+                used = meta_path.stat().st_mtime_ns
+            except OSError:
+                continue
+            entries.append((used, size, [meta_path, array_path] + extras))
+            total += size
+        entries.sort(key=lambda e: e[0])
+        for _, size, paths in entries:
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
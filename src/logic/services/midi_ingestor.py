@@ -1,122 +1,311 @@
-import mido  # type: ignore
-import pretty_midi  # type: ignore
+import struct
+from collections import defaultdict, deque
+from pathlib import Path
+import numpy as np
 from PySide6.QtCore import QObject, Signal, Slot  # type: ignore
-from dataclasses import dataclass, asdict
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from logic.services.midi_cache import MidiParseCache  # type: ignore
+from logic.services.chord_analyzer import chord_chart, CHART_VERSION  # type: ignore
+from logic.services.note_block_model import NoteBlockModel  # type: ignore
 
-@dataclass
-class VisualBlock:
-    pitch: int
-    start_time: float
-    duration: float
-    color: str
+# One row per note, every instrument of a file in one structure-of-arrays block
+NOTE_DTYPE = np.dtype([
+    ("pitch", np.uint8),
+    ("start", np.float64),     # Seconds
+    ("duration", np.float32),  # Seconds
+    ("velocity", np.uint8),
+    ("instrument", np.uint16),  # Index into read_note_array's instrument info
+    ("channel", np.uint8),
+])
+
+# Map 12 chromatic pitches to a distinct palette to help with hand-span awareness
+PITCH_CLASS_COLORS = np.array([
+    "#FF2B2B", # C - Red
+    "#FF7A2B", # C# - Orange
+    "#FFD02B", # D - Yellow
+    "#C3FF2B", # D# - Lime
+    "#55FF2B", # E - Green
+    "#2BFF93", # F - Mint
+    "#2BFFE4", # F# - Cyan
+    "#2B93FF", # G - Blue
+    "#502BFF", # G# - Indigo
+    "#AC2BFF", # A - Purple
+    "#FF2BE1", # A# - Magenta
+    "#FF2B6D", # B - Pink
+])
+
+PARSER_VERSION = 4  # Bump when parsing or track selection changes, to invalidate cached results
+MIN_BLOCK_DURATION = 0.05  # Seconds; shorter notes are unplayable on the hybrid UI
+DRUM_CHANNEL = 9
+_CHUNK = struct.Struct(">4sI")
+
+
+def _read_varlen(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def read_note_array(file_path: str, data: Optional[bytes] = None) -> Tuple[np.ndarray, List[Dict], Dict]:
+    """
+    Decodes every note of a Standard MIDI File straight from its bytes into a
+    NOTE_DTYPE array (file order, not sorted), plus per-instrument info dicts
+    (name, program, is_drum, note_count, track, channel) and the file's
+    timing: tempo_bpm (at the first note), tempo_changes ([seconds, BPM]
+    pairs from time 0) and the first time_signature. Like pretty_midi, an
+    instrument is a (track, channel, program) combination, so a type-0
+    file's parts come out separately and only channel 10 is drums;
+    instruments are listed in the order their first note ends and are named
+    after their track. Note-offs close the earliest open note of the same
+    channel and pitch; notes never closed are dropped. Pass data if the
+    file's bytes have already been read.
+    """
+    if data is None:
+        with open(file_path, "rb") as f:
+            data = f.read()
+    if len(data) < 14:
+        raise ValueError(f"{file_path} is not a Standard MIDI File")
+    chunk_id, header_len = _CHUNK.unpack_from(data, 0)
+    if chunk_id != b"MThd":
+        raise ValueError(f"{file_path} is not a Standard MIDI File")
+    _fmt, _ntracks, division = struct.unpack_from(">HHH", data, 8)
+    if division & 0x8000:
+        raise ValueError("SMPTE time division is not supported")
+
+    on_ticks: List[int] = []
+    off_ticks: List[int] = []
+    pitches: List[int] = []
+    velocities: List[int] = []
+    instrument_of: List[int] = []
+    channels: List[int] = []
+    tempo_changes: List[Tuple[int, int]] = [(0, 500000)]
+    time_signature: Optional[List[int]] = None
+    instruments: List[Dict] = []
+    by_key: Dict[Tuple[int, int, int], int] = {}  # (track, channel, program) -> instrument index
+
+    pos = 8 + header_len
+    track = -1
+    while pos + 8 <= len(data):
+        chunk_id, length = _CHUNK.unpack_from(data, pos)
+        pos += 8
+        end = min(pos + length, len(data))
+        if chunk_id != b"MTrk":
+            pos = end
+            continue
+        track += 1
+        track_name = ""
+        first_instrument = len(instruments)
+        programs = [0] * 16  # Current program per channel; each track starts from the default
+        open_notes: Dict[Tuple[int, int], deque] = defaultdict(deque)
+        tick = 0
+        status = 0
+        while pos < end:
+            delta, pos = _read_varlen(data, pos)
+            tick += delta
+            byte = data[pos]
+            if byte >= 0x80:
+                pos += 1
+                if byte < 0xF0:
+                    status = byte  # Running status only applies to channel messages
+            elif status == 0:
+                raise ValueError(f"{file_path}: data byte without a status in track {track}")
+            else:
+                byte = status
+
+            if byte == 0xFF:
+                meta_type = data[pos]
+                length_, pos = _read_varlen(data, pos + 1)
+                if meta_type == 0x51 and length_ == 3:
+                    tempo_changes.append((tick, int.from_bytes(data[pos:pos + 3], "big")))
+                elif meta_type == 0x58 and length_ >= 2 and time_signature is None:
+                    time_signature = [data[pos], 2 ** data[pos + 1]]
+                elif meta_type == 0x03 and not track_name:
+                    track_name = data[pos:pos + length_].decode("latin-1")
+                pos += length_
+                continue
+            if byte in (0xF0, 0xF7):
+                length_, pos = _read_varlen(data, pos)
+                pos += length_
+                continue
+
+            kind = byte & 0xF0
+            channel = byte & 0x0F
+            if kind in (0xC0, 0xD0):
+                if kind == 0xC0:
+                    programs[channel] = data[pos]
+                pos += 1
+                continue
+            data1, data2 = data[pos], data[pos + 1]
+            pos += 2
+            if kind == 0x90 and data2 > 0:
+                open_notes[(channel, data1)].append((tick, data2, programs[channel]))
+            elif kind == 0x80 or kind == 0x90:
+                pending = open_notes.get((channel, data1))
+                if pending:
+                    start_tick, velocity, program = pending.popleft()
+                    key = (track, channel, program)
+                    instrument = by_key.get(key)
+                    if instrument is None:
+                        instrument = by_key[key] = len(instruments)
+                        instruments.append({"name": "", "program": program, "is_drum": channel == DRUM_CHANNEL,
+                                            "note_count": 0, "track": track, "channel": channel})
+                    on_ticks.append(start_tick)
+                    off_ticks.append(tick)
+                    pitches.append(data1)
+                    velocities.append(velocity)
+                    instrument_of.append(instrument)
+                    channels.append(channel)
+                    instruments[instrument]["note_count"] += 1
+        pos = end
+        for info in instruments[first_instrument:]:
+            info["name"] = track_name
+
+    # Ticks -> seconds through the tempo map, vectorized over every note at once
+    tempo_changes.sort(key=lambda change: change[0])
+    change_ticks = np.array([t for t, _ in tempo_changes], dtype=np.float64)
+    sec_per_tick = np.array([us for _, us in tempo_changes], dtype=np.float64) / 1e6 / division
+    change_secs = np.concatenate(([0.0], np.cumsum(np.diff(change_ticks) * sec_per_tick[:-1])))
+
+    def to_seconds(ticks: List[int]) -> np.ndarray:
+        t = np.asarray(ticks, dtype=np.float64)
+        i = np.searchsorted(change_ticks, t, side="right") - 1
+        return change_secs[i] + (t - change_ticks[i]) * sec_per_tick[i]
+
+    notes = np.empty(len(pitches), dtype=NOTE_DTYPE)
+    starts = to_seconds(on_ticks)
+    notes["pitch"] = pitches
+    notes["start"] = starts
+    notes["duration"] = to_seconds(off_ticks) - starts
+    notes["velocity"] = velocities
+    notes["instrument"] = instrument_of
+    notes["channel"] = channels
+    first = np.searchsorted(change_ticks, min(on_ticks, default=0), side="right") - 1
+    bpm = 60.0 / (sec_per_tick * division)
+    # A later change at the same tick supersedes an earlier one (e.g. the default tempo)
+    last_at_tick = np.r_[change_ticks[1:] != change_ticks[:-1], True]
+    timing = {
+        "tempo_bpm": float(bpm[first]),
+        "tempo_changes": [[round(float(t), 6), round(float(b), 3)]
+                          for t, b in zip(change_secs[last_at_tick], bpm[last_at_tick])],
+        "time_signature": time_signature or [4, 4],
+    }
+    return notes, instruments, timing
+
+
+def select_piano_track(instruments: List[Dict]) -> int | None:
+    """
+    Index of the instrument to teach, from read_note_array's instrument info:
+    the first non-drum Acoustic Grand Piano (program 0), else the non-drum
+    instrument with the most notes.
+    """
+    candidates = [i for i, t in enumerate(instruments) if t["note_count"] and not t["is_drum"]]
+    for i in candidates:
+        if instruments[i]["program"] == 0:
+            return i
+    return max(candidates, key=lambda i: instruments[i]["note_count"], default=None)
+
+
+def notes_to_blocks(notes: np.ndarray) -> List[Dict]:
+    """Renders a NOTE_DTYPE array into the block dicts QML consumes; colors are looked up here."""
+    durations = np.maximum(notes["duration"].astype(np.float64), MIN_BLOCK_DURATION)
+    colors = PITCH_CLASS_COLORS[notes["pitch"] % 12]
+    return [
+        {"pitch": pitch, "start_time": start, "duration": duration, "color": color}
+        for pitch, start, duration, color in zip(
+            notes["pitch"].tolist(), notes["start"].tolist(), durations.tolist(), colors.tolist())
+    ]
 
 class MidiIngestor(QObject):
-    # Emit a list of dictionaries representing the 'VisualBlocks'
-    midiParsed = Signal(list)
+    # Number of notes in the ingested song; QML reads the blocks through block_model (AppState.noteBlocks)
+    midiParsed = Signal(int)
     
     # Optional signal for metadata
     midiMetadata = Signal(dict)
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
         super().__init__()
+        self.notes = np.empty(0, dtype=NOTE_DTYPE)  # Selected track of the last ingested file, time-sorted
+        self._cache = MidiParseCache(cache_dir, PARSER_VERSION) if cache_dir else None
+        self._block_model: Optional[NoteBlockModel] = None
+
+    @property
+    def block_model(self) -> NoteBlockModel:
+        """The ingested song as a list model; only blocks inside the view's time window are rows."""
+        if self._block_model is None:
+            self._block_model = NoteBlockModel(PITCH_CLASS_COLORS, MIN_BLOCK_DURATION, self)
+        return self._block_model
+
+    def load_notes(self, file_path: str) -> Tuple[np.ndarray, Dict]:
+        """
+        A time-sorted NOTE_DTYPE array for the file's piano track, plus metadata.
+        With a cache, files seen before come back memory-mapped without parsing.
+        """
+        if self._cache is None:
+            return self._parse_notes(file_path)
+        return self._load_cached(file_path, self._cache.key_for(file_path))
+
+    def load_chord_chart(self, file_path: str) -> List[Dict]:
+        """The file's chord chart (see chord_analyzer), cached next to its parsed notes."""
+        name = f"chords-v{CHART_VERSION}"
+        key = self._cache.key_for(file_path) if self._cache else None
+        if key:
+            chart = self._cache.get_extra(key, name)
+            if chart is not None:
+                return chart
+        notes, metadata = self._load_cached(file_path, key) if key else self._parse_notes(file_path)
+        chart = chord_chart(notes, metadata.get("tempo_bpm", 120.0))
+        if key:
+            self._cache.put_extra(key, name, chart)
+        return chart
+
+    def _load_cached(self, file_path: str, key: str) -> Tuple[np.ndarray, Dict]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        notes, metadata = self._parse_notes(file_path)
+        self._cache.put(key, notes, metadata)
+        return notes, metadata
+
+    def _parse_notes(self, file_path: str) -> Tuple[np.ndarray, Dict]:
+        notes, instruments, timing = read_note_array(file_path)
+        instrument = select_piano_track(instruments)
+        if instrument is None:
+            return np.empty(0, dtype=NOTE_DTYPE), {}
+        selected = notes[notes["instrument"] == instrument]
+        selected = selected[np.argsort(selected["start"], kind="stable")]
+        ends = notes["start"] + notes["duration"]
+        metadata = {
+            "duration": float(ends.max()) if len(ends) else 0.0,
+            "instruments": [t["name"] for t in instruments],
+            "note_count": len(selected),
+            "selected_track": instruments[instrument]["name"],
+            "tempo_bpm": round(timing["tempo_bpm"], 2),
+            "tempo_changes": timing["tempo_changes"],
+            "time_signature": timing["time_signature"],
+        }
+        return selected, metadata
 
     @Slot(str)
     def ingest_file(self, file_path: str):
         try:
             print(f"Ingesting MIDI file: {file_path}")
-            pm = pretty_midi.PrettyMIDI(file_path)
-            
-            # Find the best track for the piano notation
-            target_track = self._select_piano_track(pm)
-            
-            if not target_track:
+            notes, metadata = self.load_notes(file_path)
+
+            self.notes = notes
+            self.block_model.set_notes(notes)
+            if not metadata:
                 print("Warning: No suitable tracks found in MIDI file.")
-                self.midiParsed.emit([])
+                self.midiParsed.emit(0)
                 return
 
-            blocks = self._translate_to_blocks(target_track.notes)
-            
-            # Emit metadata
-            metadata = {
-                "duration": pm.get_end_time(),
-                "instruments": [i.name for i in pm.instruments],
-                "note_count": len(target_track.notes),
-                "selected_track": target_track.name
-            }
             self.midiMetadata.emit(metadata)
-            
-            # Emit the list of raw dictionaries for QML to easily consume
-            # We construct dict directly instead of using asdict() due to static analysis struggles with it
-            raw_blocks = [{"pitch": b.pitch, "start_time": b.start_time, "duration": b.duration, "color": b.color} for b in blocks]
-            self.midiParsed.emit(raw_blocks)
-            print(f"Successfully processed {len(blocks)} visual blocks.")
-            
+            self.midiParsed.emit(len(notes))
+            print(f"Successfully processed {len(notes)} visual blocks.")
+
         except Exception as e:
             print(f"Error ingesting MIDI file: {e}")
-            self.midiParsed.emit([])
-
-    def _select_piano_track(self, pm: pretty_midi.PrettyMIDI) -> pretty_midi.Instrument | None:
-        """Heuristically select the best track for a piano tutorial."""
-        if not pm.instruments:
-            return None
-            
-        # 1. Look for explicit Acoustic Grand Piano (program 0)
-        for inst in pm.instruments:
-            if not inst.is_drum and inst.program == 0:
-                print(f"Selected acoustic grand piano track: {inst.name}")
-                return inst
-                
-        # 2. Fallback: Find the non-drum track with the most notes (likely the melody/chord track)
-        best_track = None
-        max_notes = 0
-        for inst in pm.instruments:
-            if not inst.is_drum and len(inst.notes) > max_notes:
-                max_notes = len(inst.notes)
-                best_track = inst
-                
-        if best_track is not None:
-            print(f"Fallback track selected (most notes): {best_track.name}")  # type: ignore
-            
-        return best_track
-
-    def _translate_to_blocks(self, notes: List[pretty_midi.Note]) -> List[VisualBlock]:
-        """Convert pretty_midi Notes to our proprietary physical duration blocks."""
-        blocks = []
-        for note in notes:
-            # Enforce a minimum duration for playability on the hybrid UI
-            duration = max(note.end - note.start, 0.05) 
-            blocks.append(
-                VisualBlock(
-                    pitch=note.pitch,
-                    start_time=note.start,
-                    duration=duration,
-                    color=self.get_color_for_note(note.pitch)
-                )
-            )
-            
-        # Ensure they are sorted by time so the QML scroller can process them sequentially
-        blocks.sort(key=lambda b: b.start_time)
-        return blocks
-
-    def get_color_for_note(self, pitch: int) -> str:
-        """
-        Assigns standard colors based on the pitch octave class.
-        In a full version, this would be highly adaptive based on hand span.
-        """
-        # Map 12 chromatic pitches to a distinct palette to help with hand-span awareness
-        colors = [
-            "#FF2B2B", # C - Red
-            "#FF7A2B", # C# - Orange
-            "#FFD02B", # D - Yellow
-            "#C3FF2B", # D# - Lime
-            "#55FF2B", # E - Green
-            "#2BFF93", # F - Mint
-            "#2BFFE4", # F# - Cyan
-            "#2B93FF", # G - Blue
-            "#502BFF", # G# - Indigo
-            "#AC2BFF", # A - Purple
-            "#FF2BE1", # A# - Magenta
-            "#FF2B6D", # B - Pink
-        ]
-        return colors[pitch % 12]
+            self.midiParsed.emit(0)
@@ -0,0 +1,204 @@
+"""
+MidiJournal — append-only binary log of the raw MIDI input stream.
+
+Every message RtMidi delivers is packed into a fixed 12-byte record
+(hardware timestamp as float64 seconds since the journal started, status,
+data1, data2, original message length) and appended to one file per app
+session under database/journals/. Packing happens on the RtMidi thread and
+costs about a microsecond; the record is handed to a writer thread through a
+SimpleQueue, so disk I/O never blocks MIDI input.
+
+Journals are read back memory-mapped with MidiJournalReader and can be pushed
+through AppState._dispatch_midi_note again with JournalPlayback, or replayed
+offline through the trainer with the midi_replay harness.
+"""
+import mmap
+import queue
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+from logic.services.clock import SystemClock # type: ignore
+from logic.services.midi_replay import NoteEvent, PedalEvent # type: ignore
+
+MAGIC = b"CCMJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHd")   # magic, version, record size, session start (unix epoch)
+RECORD = struct.Struct("<dBBBB")   # hw time (s), status, data1, data2, message length
+JOURNAL_SUFFIX = ".ccmj"
+
+
+class MidiJournalWriter:
+    MAX_JOURNALS = 50  # Oldest session journals are pruned beyond this
+
+    def __init__(self, journal_dir: Path):
+        self.journal_dir = Path(journal_dir)
+        self.path: Optional[Path] = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._pack = RECORD.pack  # Bound once; append() runs on the RtMidi thread
+        self.records_written = 0
+
+    def start(self) -> Path:
+        """Open a new journal file for this session and start the writer thread."""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self._prune()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = self.journal_dir / f"session-{stamp}{JOURNAL_SUFFIX}"
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, time.time()))
+        self._thread = threading.Thread(target=self._write_loop, args=(self.path,), daemon=True)
+        self._thread.start()
+        return self.path
+
+    def append(self, hw_time: float, message: list):
+        """Record one raw MIDI message. Safe to call from the RtMidi callback thread."""
+        n = len(message)
+        self._queue.put(self._pack(hw_time,
+                                   message[0] if n > 0 else 0,
+                                   message[1] if n > 1 else 0,
+                                   message[2] if n > 2 else 0,
+                                   min(n, 255)))
+
+    def close(self):
+        """Flush outstanding records and stop the writer thread."""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _write_loop(self, path: Path):
+        with open(path, "ab") as f:
+            while True:
+                batch = [self._queue.get()]
+                # Drain whatever else arrived so bursts become a single write
+                try:
+                    while True:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                stop = None in batch
+                records = [r for r in batch if r is not None]
+                if records:
+                    f.write(b"".join(records))
+                    f.flush()
+                    self.records_written += len(records)
+                if stop:
+                    return
+
+    def _prune(self):
+        journals = sorted(self.journal_dir.glob(f"*{JOURNAL_SUFFIX}"))
+        for old in journals[:max(0, len(journals) - self.MAX_JOURNALS + 1)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+class MidiJournalReader:
+    """Memory-mapped, random-access view over a journal file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        if size < HEADER.size:
+            raise ValueError(f"{self.path} is not a MIDI journal (too short)")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, started = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a MIDI journal (bad header)")
+        self.version = version
+        self.started_at = started
+        # A crash can leave a partially written trailing record; ignore it
+        self._count = (size - HEADER.size) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Tuple[float, int, int, int, int]:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return RECORD.unpack_from(self._mm, HEADER.size + index * RECORD.size)
+
+    def records(self) -> Iterator[Tuple[float, int, int, int, int]]:
+        end = HEADER.size + self._count * RECORD.size
+        return RECORD.iter_unpack(memoryview(self._mm)[HEADER.size:end])
+
+    def note_events(self) -> List:
+        """Decodes the journal into NoteEvent/PedalEvent objects, as AppState would interpret it."""
+        events: list = []
+        pedal_down = False
+        for hw_time, status, data1, data2, _ in self.records():
+            kind = status & 0xF0
+            if kind == 0x90:
+                events.append(NoteEvent(hw_time, data1, data2 > 0, data2))
+            elif kind == 0x80:
+                events.append(NoteEvent(hw_time, data1, False, 0))
+            elif kind == 0xB0 and data1 == 64:
+                is_down = data2 >= 64
+                if is_down != pedal_down:
+                    pedal_down = is_down
+                    events.append(PedalEvent(hw_time, is_down))
+        return events
+
+    def close(self):
+        try:
+            self._mm.close()
+        except (AttributeError, ValueError):
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JournalPlayback:
+    """
+    Re-delivers a journal's note stream with its original timing by chaining
+    one-shot timers on a clock (real QTimers by default).
+    """
+
+    def __init__(self, events: List, note_handler: Callable[[int, bool, int, float], None],
+                 pedal_handler: Optional[Callable[[bool], None]] = None,
+                 clock=None, speed: float = 1.0):
+        self._events = events
+        self._note_handler = note_handler
+        self._pedal_handler = pedal_handler
+        self._clock = clock or SystemClock()
+        self._speed = speed
+        self._index = 0
+        self._stopped = False
+
+    def start(self):
+        if self._events:
+            self._deliver()
+
+    def stop(self):
+        self._stopped = True
+
+    @property
+    def finished(self) -> bool:
+        return self._stopped or self._index >= len(self._events)
+
+    def _deliver(self):
+        if self._stopped or self._index >= len(self._events):
+            return
+        event = self._events[self._index]
+        self._index += 1
+        if isinstance(event, PedalEvent):
+            if self._pedal_handler:
+                self._pedal_handler(event.is_down)
+        else:
+            self._note_handler(event.pitch, event.is_on, event.velocity, event.time)
+        if self._index < len(self._events):
+            gap_s = (self._events[self._index].time - event.time) / self._speed
+            self._clock.single_shot(max(0, int(gap_s * 1000)), self._deliver)
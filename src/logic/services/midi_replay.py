@@ -0,0 +1,270 @@
+"""
+Headless MIDI replay harness.
+
+Feeds timestamped note streams into ChordTrainerService and EvaluationService
+on a VirtualClock, so a whole lesson or onboarding evaluation runs without a
+QApplication, real timers or a keyboard. Every handler call is timed, which
+makes the harness both a deterministic regression test for the exercise flow
+and a throughput benchmark (events/sec and per-event handler latency).
+
+    clock = VirtualClock()
+    trainer = ChordTrainerService(db, clock=clock)
+    report = LessonReplay(trainer, clock).run(playlist)
+    print(report.summary())
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+from logic.services.clock import VirtualClock # type: ignore
+from logic.services.latency_sketch import LatencySketch # type: ignore
+from logic.services.onset_grouper import ChordOnsetGrouper # type: ignore
+
+
+@dataclass
+class NoteEvent:
+    time: float  # Seconds on the virtual clock
+    pitch: int
+    is_on: bool
+    velocity: int = 0  # 0 = unknown (synthetic or note-off)
+
+
+@dataclass
+class PedalEvent:
+    time: float
+    is_down: bool
+
+
+@dataclass
+class ReplayReport:
+    events: int = 0
+    steps_completed: int = 0
+    wall_seconds: float = 0.0
+    virtual_seconds: float = 0.0
+    # Per-event handler latency in microseconds
+    handler_latency_us: LatencySketch = field(default_factory=LatencySketch)
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        lat = self.handler_latency_us
+        return (f"{self.events} events, {self.steps_completed} steps in {self.wall_seconds * 1000:.1f}ms wall "
+                f"({self.virtual_seconds:.1f}s simulated) — {self.events_per_sec:,.0f} events/sec, "
+                f"handler latency p50 {lat.p50:.0f}µs / p90 {lat.p90:.0f}µs / max {lat.max:.0f}µs")
+
+
+class ReplayHarness:
+    """Pushes note and pedal events into handlers at their virtual timestamps."""
+
+    def __init__(self, clock: VirtualClock, note_handler: Callable[[int, bool, int], None],
+                 pedal_handler: Optional[Callable[[bool], None]] = None):
+        self.clock = clock
+        self.note_handler = note_handler
+        self.pedal_handler = pedal_handler
+        self.report = ReplayReport()
+
+    def play(self, events: Iterable):
+        for event in events:
+            # Fire every timer due before this event (hold ticks, metronome, scheduled advances)
+            self.clock.advance_to(event.time)
+            start = time.perf_counter()
+            if isinstance(event, PedalEvent):
+                if self.pedal_handler:
+                    self.pedal_handler(event.is_down)
+            else:
+                self.note_handler(event.pitch, event.is_on, event.velocity)
+            self.report.handler_latency_us.add((time.perf_counter() - start) * 1e6)
+            self.report.events += 1
+
+
+class LessonReplay:
+    """
+    Runs a ChordTrainerService lesson playlist end-to-end with a synthetic
+    performer that always plays the current target correctly.
+    """
+
+    def __init__(self, trainer, clock: VirtualClock, reaction_s: float = 0.25,
+                 note_spread_s: float = 0.01, onset_window_ms: float = 0.0, velocity: int = 80):
+        self.trainer = trainer
+        self.clock = clock
+        self.reaction_s = reaction_s
+        self.note_spread_s = note_spread_s
+        self.velocity = velocity
+        # With a window, notes go through the same onset grouping AppState applies
+        self.grouper = None
+        note_handler = trainer.handle_midi_note
+        if onset_window_ms > 0:
+            self.grouper = ChordOnsetGrouper(trainer.handle_chord_strike,
+                                             lambda pitch: trainer.handle_midi_note(pitch, False),
+                                             window_ms=onset_window_ms, clock=clock)
+            note_handler = self._dispatch_note
+        self.harness = ReplayHarness(clock, note_handler, trainer.handle_pedal_event)
+
+    def _dispatch_note(self, pitch: int, is_on: bool, velocity: int):
+        if self.trainer._exercise_type == "pentascale":
+            self.grouper.flush()
+            self.trainer.handle_midi_note(pitch, is_on, velocity)
+        elif is_on:
+            self.grouper.note_on(pitch, self.clock.now(), velocity)
+        else:
+            self.grouper.note_off(pitch, self.clock.now())
+
+    def run(self, playlist: List[dict], max_virtual_seconds: float = 3600.0) -> ReplayReport:
+        t = self.trainer
+        t._lesson_playlist = [dict(step) for step in playlist]
+        t._lesson_total = len(t._lesson_playlist)
+        t._lesson_progress = 0
+        t._is_lesson_mode = True
+        t._is_lesson_complete = False
+        t.activate_lesson_plan()
+
+        wall_start = time.perf_counter()
+        virtual_start = self.clock.now()
+        deadline = virtual_start + max_virtual_seconds
+        t.begin_lesson()
+
+        while not t._is_lesson_complete and self.clock.now() < deadline:
+            if t._is_paused_for_speech:
+                t.resume_lesson()  # Stand-in for the coach finishing its spoken intro
+                continue
+            if not t._target_chord_name:
+                self.clock.advance(0.05)  # Waiting on a scheduled advance
+                continue
+            self._perform_current_target()
+            # Let release debounce / scheduled advances fire until a new target is prompted
+            prompted_at = t._prompt_time
+            while (t._prompt_time == prompted_at and not t._is_paused_for_speech
+                   and not t._is_lesson_complete and self.clock.now() < deadline):
+                self.clock.advance(0.05)
+
+        report = self.harness.report
+        report.steps_completed = t._lesson_progress if t._is_lesson_complete else max(0, t._lesson_progress - 1)
+        report.wall_seconds = time.perf_counter() - wall_start
+        report.virtual_seconds = self.clock.now() - virtual_start
+        return report
+
+    def _perform_current_target(self):
+        t = self.trainer
+        now = self.clock.now() + self.reaction_s
+        events: list = []
+
+        if t._exercise_type == "listen":
+            self.clock.advance_to(now)
+            t.handle_ear_training_answer(t._target_formula_text)
+            return
+
+        if t._exercise_type == "pentascale":
+            if t._metronome_timer.isActive():
+                # Wait out the 4-beat count-in before the first note counts
+                while t._pentascale_beat_count < 0:
+                    self.clock.advance(0.01)
+                now = self.clock.now()
+            step_s = 60.0 / t._pentascale_bpm if t._pentascale_bpm else 0.3
+            for i, pitch in enumerate(t._pentascale_sequence[t._pentascale_index:]):
+                on = now + i * step_s
+                events.append(NoteEvent(on, pitch, True, self.velocity))
+                events.append(NoteEvent(on + step_s * 0.8, pitch, False))
+            self.harness.play(events)
+            return
+
+        pitches = list(t._target_pitches)
+        for i, pitch in enumerate(pitches):
+            events.append(NoteEvent(now + i * self.note_spread_s, pitch, True, self.velocity))
+        strike_end = now + len(pitches) * self.note_spread_s
+        if t._exercise_type == "sustain_pedal":
+            events.append(PedalEvent(strike_end + 0.05, True))
+        release = strike_end + t._required_hold_ms / 1000.0 + 0.2
+        for pitch in pitches:
+            events.append(NoteEvent(release, pitch, False))
+        if t._exercise_type == "sustain_pedal":
+            events.append(PedalEvent(release + 0.05, False))
+        self.harness.play(events)
+
+
+class EvaluationReplay:
+    """
+    Runs the onboarding evaluation with a synthetic performer that plays every
+    note of levels up to `skill_level` on time and stays silent above it.
+    """
+
+    def __init__(self, engine, clock: VirtualClock, skill_level: int = 99):
+        self.engine = engine
+        self.clock = clock
+        self.skill_level = skill_level
+        self.levels_played = 0
+        self.harness = ReplayHarness(clock, lambda pitch, is_on, velocity: engine.handle_midi_note(pitch, is_on))
+
+    def run(self, max_virtual_seconds: float = 3600.0) -> ReplayReport:
+        e = self.engine
+        wall_start = time.perf_counter()
+        virtual_start = self.clock.now()
+        deadline = virtual_start + max_virtual_seconds
+        e.startEvaluation()
+
+        while e._is_running and self.clock.now() < deadline:
+            level = e._current_level
+            self.levels_played += 1
+            sec_per_beat = 60.0 / e._tempo_bpm
+            # Recover when this level's playhead was at beat -4 (it may have started mid-advance)
+            level_start = self.clock.now() - (e._current_beat + 4) * sec_per_beat
+            if level <= self.skill_level:
+                events = []
+                for note in e._sequence_notes:
+                    on = level_start + (note["start_beat"] + 4) * sec_per_beat
+                    off = on + note["duration_beats"] * sec_per_beat * 0.9
+                    events.append(NoteEvent(on, note["pitch"], True))
+                    events.append(NoteEvent(off, note["pitch"], False))
+                events.sort(key=lambda ev: ev.time)
+                self.harness.play(events)
+            while e._is_running and e._current_level == level and self.clock.now() < deadline:
+                self.clock.advance(0.05)
+
+        report = self.harness.report
+        report.steps_completed = self.levels_played
+        report.wall_seconds = time.perf_counter() - wall_start
+        report.virtual_seconds = self.clock.now() - virtual_start
+        return report
+
+
+def build_synthetic_lesson(n_steps: int = 120) -> List[dict]:
+    """
+    A deterministic lesson playlist cycling through every exercise type, in the
+    same normalized shape the Gemini lesson parser produces.
+    """
+    chord_types = {
+        "Major": {0, 4, 7}, "Minor": {0, 3, 7}, "Dominant 7th": {0, 4, 7, 10},
+        "Major 7th": {0, 4, 7, 11}, "Minor 7th": {0, 3, 7, 10},
+    }
+    names = list(chord_types)
+    steps: List[dict] = []
+    for i in range(n_steps):
+        root = (i * 7) % 12
+        c_type = names[i % len(names)]
+        kind = i % 6
+        base = {"track": "technique", "milestone_id": "", "exercise_name": f"Block {i // 20}",
+                "spoken_instruction": "Synthetic replay block" if i % 20 == 0 else ""}
+        if kind == 0:
+            step = {"exercise_type": "pentascale", "root_idx": root, "scale_type": "Major" if i % 2 else "Minor",
+                    "direction": "ascending" if i % 4 else "descending", "octave": 4, "hand": "right",
+                    "hold_ms": 0, "bpm": 120 if i % 12 == 0 else 0}
+        elif kind == 1:
+            step = {"exercise_type": "progression", "hand": "right", "hold_ms": 0,
+                    "progression_steps": [{"root_idx": (root + r) % 12, "chord_type_name": "Major", "numeral": n}
+                                          for r, n in ((0, "I"), (5, "IV"), (7, "V"), (0, "I"))]}
+        elif kind == 2:
+            step = {"exercise_type": "hands_together", "root_idx": root, "chord_type_name": c_type,
+                    "hand": "both", "hold_ms": 500, "octave": 4, "intervals": chord_types[c_type]}
+        elif kind == 3:
+            step = {"exercise_type": "sustain_pedal", "root_idx": root, "chord_type_name": "Major",
+                    "pedal_type": "legato", "hand": "right", "hold_ms": 1000, "octave": 4,
+                    "intervals": chord_types["Major"]}
+        elif kind == 4:
+            step = {"exercise_type": "listen", "root_idx": root, "chord_type_name": "Minor",
+                    "target_quality": "Minor", "hand": "right", "octave": 4}
+        else:
+            step = {"exercise_type": "chord", "root_idx": root, "chord_type_name": c_type, "hand": "right",
+                    "hold_ms": 0 if i % 2 else 1000, "octave": 4, "intervals": chord_types[c_type]}
+        base.update(step)
+        steps.append(base)
+    return steps
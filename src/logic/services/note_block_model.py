@@ -0,0 +1,168 @@
+"""
+NoteBlockModel — the visual note blocks of a song, as a QML list model.
+
+Rows are only the notes that overlap the visible time window. BlockWindow
+keeps the song as NumPy arrays sorted by start time, with a running maximum
+of note end times as the interval index: the notes overlapping [t0, t1) all
+lie between the first index whose running max end passes t0 and the first
+start at or after t1, so a query is two binary searches and a filter over
+that span. When the window moves, the old and new visible sets are diffed
+and applied as contiguous row removals and insertions, so delegates for
+notes that stay on screen are kept. Memory and delegate work scale with
+what is on screen, not with the length of the song.
+"""
+from typing import List
+import numpy as np
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Property, Slot  # type: ignore
+
+
+def _runs(positions: np.ndarray) -> List[np.ndarray]:
+    """Splits sorted row positions into runs of consecutive rows."""
+    if len(positions) == 0:
+        return []
+    return np.split(positions, np.flatnonzero(np.diff(positions) != 1) + 1)
+
+
+class BlockWindow:
+    """Visible-window bookkeeping for NoteBlockModel, independent of Qt."""
+
+    def __init__(self, min_duration: float = 0.0):
+        self.min_duration = min_duration
+        self.window = (0.0, 0.0)
+        self.set_notes(np.empty(0), np.empty(0))
+
+    def set_notes(self, starts: np.ndarray, durations: np.ndarray):
+        """
+        starts must be sorted; durations shorter than min_duration are drawn at
+        min_duration. Rows are recomputed for the current window without
+        change notifications (the model resets around this).
+        """
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = self.starts + np.maximum(np.asarray(durations, dtype=np.float64), self.min_duration)
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        self.rows: List[int] = self.query(*self.window).tolist()  # Note indices on screen, in start order
+
+    def query(self, t0: float, t1: float) -> np.ndarray:
+        """Indices of the notes overlapping [t0, t1), in start order."""
+        lo = int(np.searchsorted(self.max_ends, t0, side="right"))
+        hi = int(np.searchsorted(self.starts, t1, side="left"))
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        span = np.arange(lo, hi)
+        return span[self.ends[lo:hi] > t0]
+
+    def move(self, t0: float, t1: float, listener=None):
+        """
+        Makes rows the notes overlapping [t0, t1). The listener, if any, gets
+        begin_remove(first, last) / end_remove() and begin_insert(first, last) /
+        end_insert() around each contiguous change, with rows updated in between.
+        """
+        self.window = (t0, t1)
+        old = np.array(self.rows, dtype=np.int64)
+        new = self.query(t0, t1)
+
+        # Remove from the bottom up so earlier row numbers stay valid
+        for run in reversed(_runs(np.flatnonzero(~np.isin(old, new)))):
+            first, last = int(run[0]), int(run[-1])
+            if listener:
+                listener.begin_remove(first, last)
+            del self.rows[first:last + 1]
+            if listener:
+                listener.end_remove()
+
+        # Insert top down at final positions; everything above is already in place
+        for run in _runs(np.flatnonzero(~np.isin(new, old))):
+            first, last = int(run[0]), int(run[-1])
+            if listener:
+                listener.begin_insert(first, last)
+            self.rows[first:first] = new[first:last + 1].tolist()
+            if listener:
+                listener.end_insert()
+
+
+class NoteBlockModel(QAbstractListModel):
+    countChanged = Signal()
+    songChanged = Signal()
+
+    PitchRole = Qt.UserRole + 1
+    StartTimeRole = Qt.UserRole + 2
+    DurationRole = Qt.UserRole + 3
+    ColorRole = Qt.UserRole + 4
+
+    def __init__(self, colors: np.ndarray, min_duration: float = 0.0, parent=None):
+        super().__init__(parent)
+        self._colors = colors  # Indexed by pitch class
+        self._window = BlockWindow(min_duration)
+        self._pitches = np.empty(0, dtype=np.int64)
+
+    def set_notes(self, notes: np.ndarray):
+        """Replaces the song with a time-sorted NOTE_DTYPE array; the visible window is kept."""
+        self.beginResetModel()
+        self._pitches = notes["pitch"].astype(np.int64)
+        self._window.set_notes(notes["start"], notes["duration"])
+        self.endResetModel()
+        self.countChanged.emit()
+        self.songChanged.emit()
+
+    # ── QAbstractListModel ────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._window.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._window.rows):
+            return None
+        note = self._window.rows[index.row()]
+        if role == self.PitchRole:
+            return int(self._pitches[note])
+        if role == self.StartTimeRole:
+            return float(self._window.starts[note])
+        if role == self.DurationRole:
+            return float(self._window.ends[note] - self._window.starts[note])
+        if role == self.ColorRole:
+            return str(self._colors[self._pitches[note] % 12])
+        return None
+
+    def roleNames(self):
+        return {
+            self.PitchRole: b"pitch",
+            self.StartTimeRole: b"startTime",
+            self.DurationRole: b"duration",
+            self.ColorRole: b"color",
+        }
+
+    # ── Row change notifications from BlockWindow ─────────────────────
+
+    def begin_remove(self, first: int, last: int):
+        self.beginRemoveRows(QModelIndex(), first, last)
+
+    def end_remove(self):
+        self.endRemoveRows()
+
+    def begin_insert(self, first: int, last: int):
+        self.beginInsertRows(QModelIndex(), first, last)
+
+    def end_insert(self):
+        self.endInsertRows()
+
+    # ── QML API ───────────────────────────────────────────────────────
+
+    @Slot(float, float)
+    def setWindow(self, start: float, end: float):
+        """Shows the notes sounding between start and end (seconds); call as the view scrolls."""
+        before = len(self._window.rows)
+        self._window.move(start, end, self)
+        if len(self._window.rows) != before:
+            self.countChanged.emit()
+
+    @Property(int, notify=countChanged)
+    def count(self) -> int:
+        return len(self._window.rows)
+
+    @Property(int, notify=songChanged)
+    def noteCount(self) -> int:
+        return len(self._pitches)
+
+    @Property(float, notify=songChanged)
+    def songDuration(self) -> float:
+        return float(self._window.max_ends[-1]) if len(self._window.max_ends) else 0.0
@@ -0,0 +1,73 @@
+"""
+ChordOnsetGrouper — coalesces the note-ons of one chord strike.
+
+A three-note chord arrives as three separate MIDI messages a few milliseconds
+apart. Evaluating after each one makes the trainer look at partial states
+(and record failures for keys merely brushed on the way). The grouper sits
+between AppState._dispatch_midi_note and ChordTrainerService: it buffers
+note-ons whose hardware timestamps fall within a short window of the first
+one and delivers them as a single strike, together with each note's onset
+time and velocity so the spread of the strike is known.
+
+Releases are never delayed — a note-off first flushes any pending strike so
+event order is preserved, then passes straight through.
+"""
+from typing import Callable, List, Optional
+from logic.services.clock import SystemClock # type: ignore
+
+
+class ChordOnsetGrouper:
+    DEFAULT_WINDOW_MS = 30.0
+
+    def __init__(self, on_strike: Callable[[List[int], List[float], List[int]], None],
+                 on_release: Callable[[int], None],
+                 window_ms: float = DEFAULT_WINDOW_MS, clock=None):
+        self._on_strike = on_strike
+        self._on_release = on_release
+        self._clock = clock or SystemClock()
+        self.window_ms = window_ms
+        self._pitches: List[int] = []
+        self._onsets: List[float] = []
+        self._velocities: List[int] = []
+        self._generation = 0
+        self.strikes_delivered = 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pitches)
+
+    def note_on(self, pitch: int, hw_time: float, velocity: int = 0):
+        if self.window_ms <= 0:
+            self._deliver([pitch], [hw_time], [velocity])
+            return
+        if self._pitches and (hw_time - self._onsets[0]) * 1000.0 > self.window_ms:
+            self.flush()
+        if not self._pitches:
+            # No further note may arrive to close the window, so arm a timer as well
+            self._generation += 1
+            generation = self._generation
+            self._clock.single_shot(int(self.window_ms) + 1, lambda: self._on_window_elapsed(generation))
+        self._pitches.append(pitch)
+        self._onsets.append(hw_time)
+        self._velocities.append(velocity)
+
+    def note_off(self, pitch: int, hw_time: Optional[float] = None):
+        self.flush()
+        self._on_release(pitch)
+
+    def flush(self):
+        """Deliver the pending strike now (if any)."""
+        if not self._pitches:
+            return
+        pitches, onsets, velocities = self._pitches, self._onsets, self._velocities
+        self._pitches, self._onsets, self._velocities = [], [], []
+        self._generation += 1
+        self._deliver(pitches, onsets, velocities)
+
+    def _on_window_elapsed(self, generation: int):
+        if generation == self._generation:
+            self.flush()
+
+    def _deliver(self, pitches: List[int], onsets: List[float], velocities: List[int]):
+        self.strikes_delivered += 1
+        self._on_strike(pitches, onsets, velocities)
@@ -0,0 +1,315 @@
+"""
+PlayAlong — scores a student playing along with a full repertoire song.
+
+PlayAlongScorer matches live notes against the song's ingested note array.
+Expected notes are split into one queue per pitch (note indices in start
+order) with a cursor each: a note-on only looks at the head of its own
+pitch's queue, skipping entries whose hit window has passed, so chords
+(several pitches at once) and fast repeated notes cost the same per event
+however long or dense the song is. A second cursor sweeps all notes in
+start order and marks the ones nobody played as missed. Hits earn credit
+by timing (1.0 on the beat, 0.5 at the window's edge); a note held for less
+than SUSTAIN_FRACTION of a long written duration loses half its credit on
+release. Wrong notes count against the measure they were played in. Once
+the sweep passes a measure's end, its accuracy is final and is reported.
+
+PlayAlongService drives the scorer from the clock, streams per-measure
+accuracy to QML and records the play with a mastery gain in the songs table.
+Bars are laid out from the file's tempo map and time signature.
+With following on, song time comes from a ScoreFollower instead of the
+clock: the song slows down, speeds up and waits with the player, and since
+the hit window is in song seconds it stays the same fraction of a beat at
+whatever tempo they play. Each note is judged against where the follower
+expected the player to be before that note moved it.
+"""
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot, Property, Qt  # type: ignore
+from logic.services.clock import SystemClock  # type: ignore
+from logic.services.evaluation_service import NOTE_PENDING, NOTE_HIT, NOTE_MISS  # type: ignore
+from logic.services.score_follower import ScoreFollower  # type: ignore
+from logic.services.sequence_builder import beat_times  # type: ignore
+
+
+class PlayAlongScorer:
+    HIT_WINDOW = 0.15            # Seconds either side of a written onset
+    SUSTAIN_MIN_SECONDS = 0.4    # Shorter notes aren't judged on release
+    SUSTAIN_FRACTION = 0.75
+    EXTRA_WEIGHT = 0.5           # A wrong note costs half an expected note
+
+    def __init__(self, notes: np.ndarray, measure_starts: np.ndarray):
+        """notes: a time-sorted NOTE_DTYPE array; measure_starts: sorted bar start times in seconds."""
+        n = len(notes)
+        # Plain lists: per-event work is scalar lookups, which lists do faster than NumPy
+        self._starts: List[float] = notes["start"].astype(np.float64).tolist()
+        self._ends: List[float] = (notes["start"] + notes["duration"]).astype(np.float64).tolist()
+        pitches = notes["pitch"].astype(np.int64)
+
+        # Per-pitch queues of note indices in start order
+        order = np.lexsort((np.arange(n), pitches))
+        bounds = np.flatnonzero(np.r_[True, np.diff(pitches[order]) != 0, True])
+        self._queues: Dict[int, List[int]] = {
+            int(pitches[order[a]]): order[a:b].tolist() for a, b in zip(bounds[:-1], bounds[1:]) if b > a}
+        self._cursors: Dict[int, int] = dict.fromkeys(self._queues, 0)
+
+        self._measure_starts: List[float] = np.asarray(measure_starts, dtype=np.float64).tolist() or [0.0]
+        song_end = max(self._ends, default=0.0)
+        self._measure_ends = self._measure_starts[1:] + [max(song_end, self._measure_starts[-1])]
+        measures = np.searchsorted(self._measure_starts, notes["start"], side="right") - 1
+        self._measure_of: List[int] = np.maximum(measures, 0).tolist()
+
+        n_measures = len(self._measure_starts)
+        self.expected: List[int] = np.bincount(self._measure_of, minlength=n_measures).tolist()
+        self.credit: List[float] = [0.0] * n_measures
+        self.extras: List[int] = [0] * n_measures
+
+        self.states = bytearray(n)  # NOTE_PENDING / NOTE_HIT / NOTE_MISS
+        self._note_credit: List[float] = [0.0] * n
+        self._held: Dict[int, int] = {}  # Pitch -> note index it is sounding
+        self._sweep = 0                  # Notes before this are resolved
+        self._next_measure = 0           # Next measure to report
+        self.hits = self.misses = self.extra_notes = self.early_releases = 0
+        self._timing_error_sum = 0.0
+
+    @property
+    def end_time(self) -> float:
+        return self._measure_ends[-1]
+
+    def note_on(self, pitch: int, t: float) -> int:
+        """Matches a played note at song time t; returns the note index it hit, or -1 for a wrong note."""
+        queue = self._queues.get(pitch)
+        if queue is not None:
+            c = self._cursors[pitch]
+            earliest = t - self.HIT_WINDOW
+            starts = self._starts
+            while c < len(queue) and starts[queue[c]] < earliest:
+                c += 1  # Too late for these; the sweep marks them missed
+            if c < len(queue) and starts[queue[c]] <= t + self.HIT_WINDOW:
+                i = queue[c]
+                self._cursors[pitch] = c + 1
+                error = t - starts[i]
+                credit = 1.0 - 0.5 * abs(error) / self.HIT_WINDOW
+                self.states[i] = NOTE_HIT
+                self._note_credit[i] = credit
+                self.credit[self._measure_of[i]] += credit
+                self.hits += 1
+                self._timing_error_sum += abs(error)
+                self._held[pitch] = i
+                return i
+            self._cursors[pitch] = c
+        self.extra_notes += 1
+        self.extras[self._measure_at(t)] += 1
+        return -1
+
+    def note_off(self, pitch: int, t: float):
+        i = self._held.pop(pitch, None)
+        if i is None:
+            return
+        written = self._ends[i] - self._starts[i]
+        if written >= self.SUSTAIN_MIN_SECONDS and t - self._starts[i] < self.SUSTAIN_FRACTION * written:
+            penalty = 0.5 * self._note_credit[i]
+            self._note_credit[i] -= penalty
+            self.credit[self._measure_of[i]] -= penalty
+            self.early_releases += 1
+
+    def advance(self, t: float) -> List[Tuple[int, float]]:
+        """Resolves misses up to song time t; returns (measure, accuracy) for measures that just finished."""
+        cutoff = t - self.HIT_WINDOW
+        starts, states = self._starts, self.states
+        sweep = self._sweep
+        while sweep < len(starts) and starts[sweep] < cutoff:
+            if states[sweep] == NOTE_PENDING:
+                states[sweep] = NOTE_MISS
+                self.misses += 1
+            sweep += 1
+        self._sweep = sweep
+
+        finished = []
+        while self._next_measure < len(self._measure_ends) and self._measure_ends[self._next_measure] <= cutoff:
+            m = self._next_measure
+            self._next_measure += 1
+            if self.expected[m] or self.extras[m]:
+                finished.append((m, self.measure_accuracy(m)))
+        return finished
+
+    def measure_accuracy(self, m: int) -> float:
+        weight = self.expected[m] + self.EXTRA_WEIGHT * self.extras[m]
+        return round(self.credit[m] / weight, 3) if weight else 1.0
+
+    def accuracy(self) -> float:
+        """Credit over every note resolved so far (and every wrong note)."""
+        weight = self.hits + self.misses + self.EXTRA_WEIGHT * self.extra_notes
+        return round(sum(self.credit) / weight, 3) if weight else 0.0
+
+    @property
+    def progress(self) -> float:
+        """Share of the song's notes already resolved."""
+        return self._sweep / len(self._starts) if self._starts else 1.0
+
+    def summary(self) -> Dict:
+        return {
+            "accuracy": self.accuracy(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "wrong_notes": self.extra_notes,
+            "early_releases": self.early_releases,
+            "mean_timing_error_ms": round(1000 * self._timing_error_sum / self.hits, 1) if self.hits else 0.0,
+        }
+
+    def _measure_at(self, t: float) -> int:
+        return max(bisect_right(self._measure_starts, t) - 1, 0)
+
+
+def measure_grid(duration: float, tempo_changes: List[List[float]],
+                 time_signature: Tuple[int, int] = (4, 4)) -> np.ndarray:
+    """Bar start times from time 0, through the [seconds, BPM] tempo map, in a fixed time signature."""
+    beats = beat_times(tempo_changes, duration)  # Quarter notes, running past duration
+    index = np.arange(len(beats), dtype=np.float64)
+    bar = time_signature[0] * 4.0 / time_signature[1]
+    end = float(np.interp(duration, beats, index))
+    return np.interp(np.arange(0.0, max(end, bar), bar), index, beats)
+
+
+class PlayAlongService(QObject):
+    runningChanged = Signal()
+    scoreChanged = Signal()
+    measureScored = Signal(int, float)   # Measure number (from 0), accuracy 0-1
+    playAlongFinished = Signal(float)    # Overall accuracy
+    followingChanged = Signal()
+    tempoChanged = Signal()
+    # Playhead anchor: (song time, clock time, song seconds per clock second); QML extrapolates between them
+    playheadAnchored = Signal(float, float, float)
+
+    LEAD_IN_SECONDS = 2.0
+    MASTERY_PER_PLAY = 10.0  # Mastery gained by a perfect play of the whole song
+
+    def __init__(self, db, midi_ingestor, clock=None):
+        super().__init__()
+        self.db = db
+        self._ingestor = midi_ingestor
+        self._clock = clock or SystemClock()
+        self._scorer: Optional[PlayAlongScorer] = None
+        self._follower: Optional[ScoreFollower] = None
+        self._following = False
+        self._file_path = ""
+        self._title = ""
+        self._start_time = 0.0
+        self._measure_accuracies: List[float] = []
+        self._summary: Dict = {}
+
+        self._timer = self._clock.create_timer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self._tick)
+
+    @Property(bool, notify=runningChanged)
+    def isRunning(self) -> bool:
+        return self._scorer is not None
+
+    @Property(float, notify=scoreChanged)
+    def accuracy(self) -> float:
+        return self._scorer.accuracy() if self._scorer else self._summary.get("accuracy", 0.0)
+
+    @Property(list, notify=scoreChanged)
+    def measureAccuracies(self) -> list:
+        return self._measure_accuracies
+
+    @Property(float, notify=scoreChanged)
+    def songTime(self) -> float:
+        return self._song_time() if self._scorer else 0.0
+
+    @Property(bool, notify=followingChanged)
+    def following(self) -> bool:
+        return self._following
+
+    @Slot(bool)
+    def setFollowing(self, following: bool):
+        """Follow the player's tempo from the next start() on."""
+        if following != self._following:
+            self._following = following
+            self.followingChanged.emit()
+
+    @Property(float, notify=tempoChanged)
+    def tempoRatio(self) -> float:
+        """The player's tempo relative to the written one (1.0 when not following)."""
+        return self._follower.tempo_ratio if self._follower else 1.0
+
+    @Slot(str, str)
+    def start(self, file_path: str, title: str):
+        notes, metadata = self._ingestor.load_notes(file_path)
+        if not len(notes):
+            print(f"PlayAlong: No playable notes in {file_path}")
+            return
+        tempo_changes = metadata.get("tempo_changes") or [[0.0, metadata.get("tempo_bpm", 120.0)]]
+        grid = measure_grid(metadata.get("duration", 0.0), tempo_changes, metadata.get("time_signature", (4, 4)))
+        self._scorer = PlayAlongScorer(notes, grid)
+        self._file_path, self._title = file_path, title
+        self._measure_accuracies = [None] * len(grid)
+        self._summary = {}
+        self._start_time = self._clock.now() + self.LEAD_IN_SECONDS
+        self._follower = ScoreFollower(notes, self._start_time) if self._following else None
+        self._timer.start()
+        print(f"PlayAlong: Started '{title}' ({len(notes)} notes, {len(grid)} measures"
+              f"{', following' if self._follower else ''})")
+        self.runningChanged.emit()
+        self.scoreChanged.emit()
+        self.tempoChanged.emit()
+        self._publish_anchor()
+
+    @Slot()
+    def stop(self):
+        """Ends the play early; what was played so far still counts, scaled by how much of the song it covered."""
+        if self._scorer:
+            self._finish()
+
+    def handle_midi_note(self, pitch: int, is_on: bool):
+        """Called by AppState when MIDI events arrive during a play-along."""
+        if self._scorer is None:
+            return
+        if not is_on:
+            self._scorer.note_off(pitch, self._song_time())
+            return
+        self._scorer.note_on(pitch, self._song_time())
+        if self._follower and self._follower.note_on(pitch, self._clock.now()) is not None:
+            self.tempoChanged.emit()
+            self._publish_anchor()
+
+    def _song_time(self) -> float:
+        if self._follower:
+            return self._follower.score_time_at(self._clock.now())
+        return self._clock.now() - self._start_time
+
+    def _publish_anchor(self):
+        now = self._clock.now()
+        rate = self._follower.tempo_ratio if self._follower else 1.0
+        self.playheadAnchored.emit(self._song_time(), now, rate)
+
+    def _tick(self):
+        scorer = self._scorer
+        if scorer is None:
+            return  # A timeout already queued when the play was stopped
+        t = self._song_time()
+        finished = scorer.advance(t)
+        for measure, accuracy in finished:
+            self._measure_accuracies[measure] = accuracy
+            self.measureScored.emit(measure, accuracy)
+        if finished:
+            self.scoreChanged.emit()
+        if t > scorer.end_time + scorer.HIT_WINDOW:
+            self._finish()
+
+    def _finish(self):
+        self._timer.stop()
+        scorer, t = self._scorer, self._song_time()
+        self._scorer = self._follower = None
+        for measure, accuracy in scorer.advance(t):
+            self._measure_accuracies[measure] = accuracy
+            self.measureScored.emit(measure, accuracy)
+        self._summary = scorer.summary()
+        mastery_gained = round(self.MASTERY_PER_PLAY * self._summary["accuracy"] * scorer.progress, 2)
+        self.db.record_song_play(self._file_path, self._title, mastery_gained)
+        print(f"PlayAlong: Finished '{self._title}': {self._summary}, mastery +{mastery_gained}")
+        self.runningChanged.emit()
+        self.scoreChanged.emit()
+        self.playAlongFinished.emit(self._summary["accuracy"])
@@ -1,117 +1,249 @@
-import requests # type: ignore
-from bs4 import BeautifulSoup # type: ignore
-from PySide6.QtCore import QObject, Signal, Slot # type: ignore
-from pathlib import Path
-import urllib.parse
+"""
+RepertoireCrawler — finds a song on BitMidi and downloads its MIDI file.
+
+A search is three requests: the search page, the first song page it links
+to, and that page's MIDI download. Searches run on a small thread pool and
+share one requests.Session, whose connection pool (sized to the worker
+count) keeps connections to the site alive across requests and searches;
+every request has a timeout and transient 5xx responses are retried with
+backoff. Each response that carries an ETag or Last-Modified is cached on
+disk (HttpCache) and revalidated with a conditional request next time, so
+repeating a search costs three 304s and no bodies. Downloaded MIDI is
+deduplicated by SHA-256: content already in the repertoire folder is not
+written again, whatever name it was found under, and a different song whose
+name is taken gets the start of its hash appended instead of overwriting.
+"""
+import hashlib
+import json
+import os
 import threading
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
+from PySide6.QtCore import QObject, Signal, Slot  # type: ignore
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+MIDI_SUFFIXES = (".mid", ".midi")
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.links: List[Tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+
+def page_links(html: str) -> List[Tuple[str, str]]:
+    """(href, link text) of every <a href> in a page, in document order."""
+    parser = _LinkParser()
+    parser.feed(html)
+    return parser.links
+
+
+class HttpCache:
+    """Response bodies on disk with their validators, keyed by URL."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        key = self._key(url)
+        try:
+            meta = json.loads((self.cache_dir / f"{key}.json").read_text(encoding="utf-8"))
+            body = (self.cache_dir / f"{key}.body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        return (meta, body) if meta.get("url") == url else None
+
+    def put(self, url: str, response):
+        validators = {name: response.headers[header] for name, header in
+                      (("etag", "ETag"), ("last_modified", "Last-Modified")) if header in response.headers}
+        if not validators:
+            return  # Nothing to revalidate with
+        key = self._key(url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.{threading.get_ident()}.tmp"
+            tmp.write_bytes(response.content)
+            os.replace(tmp, self.cache_dir / f"{key}.body")
+            # Metadata last: an entry only counts once its .json exists
+            (self.cache_dir / f"{key}.json").write_text(json.dumps(dict(validators, url=url)), encoding="utf-8")
+        except OSError as e:
+            print(f"Repertoire Crawler: Could not cache {url}: {e}")
+
 
 class RepertoireCrawler(QObject):
     downloadComplete = Signal(str) # Emits the filepath of the downloaded midi
     downloadFailed = Signal(str) # Emits an error message
-    
-    def __init__(self):
+
+    TIMEOUT = (5.0, 20.0)  # Connect, read (seconds)
+    RETRIES = 2
+
+    def __init__(self, repertoire_dir: Path, cache_dir: Path, base_url: str = "https://bitmidi.com",
+                 max_workers: int = 4):
         super().__init__()
-        # Use a local cache directory in the project for now
-        self.cache_dir = Path(__file__).parent.parent.parent.parent / "database" / "repertoire"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.base_url = "https://bitmidi.com"
-        
+        self.repertoire_dir = Path(repertoire_dir)
+        self.repertoire_dir.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
+        self.http_cache = HttpCache(cache_dir)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        retry = Retry(total=self.RETRIES, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawler")
+
+        self._lock = threading.Lock()  # Guards the two dicts below and writes into the repertoire
+        self._in_flight: Dict[str, Future] = {}
+        self._hashes: Optional[Dict[str, Path]] = None  # Content SHA-256 -> file, built on first download
+
     @Slot(str)
-    def search_and_download(self, query: str):
-        """Asynchronously triggers search and download to avoid blocking UI."""
-        thread = threading.Thread(target=self._search_worker, args=(query,), daemon=True)
-        thread.start()
-        
-    def _search_worker(self, query: str):
+    def search_and_download(self, query: str) -> Future:
+        """Searches and downloads on the worker pool; a search already running for the same query is reused."""
+        key = query.strip().lower()
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._search_worker, query)
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        self.session.close()
+
+    def _search_worker(self, query: str) -> Optional[str]:
         try:
-            print(f"Repertoire Crawler: Searching for '{query}'...")
-            encoded_query = urllib.parse.quote(query)
-            search_url = f"{self.base_url}/search?q={encoded_query}"
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-            
-            response = requests.get(search_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            links = soup.find_all('a', href=True)
-            target_page_url = ""
-            
-            for link in links:
-                href = link['href']
-                if "-mid" in href and not href.startswith("/search") and not href.startswith("/random"):
-                    # We found a direct link to a song page
-                    target_page_url = self.base_url + href
-                    break
-                    
-            if not target_page_url:
-                err = f"No MIDI files found on BitMidi for query: '{query}'"
-                print(f"Repertoire Crawler: {err}")
-                self.downloadFailed.emit(err)
-                return
-                
-            print(f"Repertoire Crawler: Found song page {target_page_url}, extracting download link...")
-            self._download_from_page(target_page_url, query)
-            
+            path = self.download(query)
         except Exception as e:
             err = f"Search failed: {e}"
             print(f"Repertoire Crawler: {err}")
             self.downloadFailed.emit(err)
-            
-    def _download_from_page(self, page_url: str, original_query: str):
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-            response = requests.get(page_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # BitMidi download links specifically say "Download MIDI"
-            download_link = soup.find('a', string=lambda t: t and 'Download' in t and 'MIDI' in t)
-            
-            if not download_link or not download_link.get('href'):
-                 # Fallback: find any a-tag that directly links to a file downloaded from their CDN
-                 links = soup.find_all('a', href=True)
-                 for l in links:
-                     if "download" in l.get('href', '').lower() or l.get('href', '').endswith('.mid'):
-                         download_link = l
-                         break
-
-            if not download_link or not download_link.get('href'):
-                 err = "Could not locate the actual download link on the song page."
-                 print(f"Repertoire Crawler: {err}")
-                 self.downloadFailed.emit(err)
-                 return
-                 
-            dl_href = download_link['href']
-            # Sometimes it's a relative link
-            if dl_href.startswith('/'):
-                 actual_dl_url = self.base_url + dl_href
-            else:
-                 actual_dl_url = dl_href
-
-            print(f"Repertoire Crawler: Downloading from {actual_dl_url}...")
-            
-            midi_res = requests.get(actual_dl_url, headers=headers)
-            midi_res.raise_for_status()
-            
-            # Sanitize filename
-            safe_query = "".join([c if c.isalnum() else "_" for c in original_query])
-            filename = f"{safe_query}.mid"
-            filepath = self.cache_dir / filename
-            
-            with open(filepath, 'wb') as f:
-                f.write(midi_res.content)
-                
-            print(f"Repertoire Crawler: Successfully downloaded to {filepath}")
-            self.downloadComplete.emit(str(filepath))
-            
-        except Exception as e:
-            err = f"Download failed: {e}"
+            return None
+        if path is None:
+            err = f"No MIDI files found on BitMidi for query: '{query}'"
             print(f"Repertoire Crawler: {err}")
             self.downloadFailed.emit(err)
+            return None
+        self.downloadComplete.emit(path)
+        return path
+
+    def download(self, query: str) -> Optional[str]:
+        """Path of the MIDI file for query in the repertoire folder, or None if the site has none. Raises on network errors."""
+        print(f"Repertoire Crawler: Searching for '{query}'...")
+        search_url = f"{self.base_url}/search?q={urllib.parse.quote(query)}"
+        page_url = self._first_song_page(self._fetch(search_url).decode("utf-8", "replace"))
+        if not page_url:
+            return None
+
+        print(f"Repertoire Crawler: Found song page {page_url}, extracting download link...")
+        midi_url = self._download_link(self._fetch(page_url).decode("utf-8", "replace"))
+        if not midi_url:
+            raise ValueError("Could not locate the actual download link on the song page.")
+
+        print(f"Repertoire Crawler: Downloading from {midi_url}...")
+        data = self._fetch(midi_url)
+        return str(self._store(data, midi_url, query))
+
+    def _fetch(self, url: str) -> bytes:
+        """GET with revalidation of any cached copy; returns the body."""
+        cached = self.http_cache.get(url)
+        headers = {}
+        if cached:
+            meta = cached[0]
+            if "etag" in meta:
+                headers["If-None-Match"] = meta["etag"]
+            if "last_modified" in meta:
+                headers["If-Modified-Since"] = meta["last_modified"]
+        response = self.session.get(url, headers=headers, timeout=self.TIMEOUT)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        self.http_cache.put(url, response)
+        return response.content
+
+    def _first_song_page(self, html: str) -> str:
+        for href, _ in page_links(html):
+            # Song pages are slugs ending in "-mid"
+            if "-mid" in href and not href.startswith("/search") and not href.startswith("/random"):
+                return urllib.parse.urljoin(self.base_url + "/", href)
+        return ""
+
+    def _download_link(self, html: str) -> str:
+        links = page_links(html)
+        # BitMidi download links specifically say "Download MIDI"
+        for href, text in links:
+            if "Download" in text and "MIDI" in text:
+                return urllib.parse.urljoin(self.base_url + "/", href)
+        # Fallback: any link to their CDN download or straight to a file
+        for href, _ in links:
+            if "download" in href.lower() or href.lower().endswith(MIDI_SUFFIXES):
+                return urllib.parse.urljoin(self.base_url + "/", href)
+        return ""
+
+    def _store(self, data: bytes, midi_url: str, query: str) -> Path:
+        """Writes new content into the repertoire folder; content already there returns the existing file."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            hashes = self._content_hashes()
+            existing = hashes.get(digest)
+            if existing is not None and existing.exists():
+                print(f"Repertoire Crawler: Already have this song as {existing}")
+                return existing
+
+            # Name after the file on the site, else the query
+            stem = Path(urllib.parse.urlparse(midi_url).path).stem or query
+            safe = "".join(c if c.isalnum() else "_" for c in stem).strip("_") or "song"
+            filepath = self.repertoire_dir / f"{safe}.mid"
+            if filepath.exists():
+                filepath = self.repertoire_dir / f"{safe}_{digest[:8]}.mid"
+            tmp = filepath.with_suffix(".part")
+            tmp.write_bytes(data)
+            os.replace(tmp, filepath)
+            hashes[digest] = filepath
+        print(f"Repertoire Crawler: Successfully downloaded to {filepath}")
+        return filepath
+
+    def _content_hashes(self) -> Dict[str, Path]:
+        if self._hashes is None:
+            self._hashes = {}
+            for path in self.repertoire_dir.rglob("*"):
+                if path.suffix.lower() in MIDI_SUFFIXES and path.is_file():
+                    try:
+                        self._hashes[hashlib.sha256(path.read_bytes()).hexdigest()] = path
+                    except OSError:
+                        pass
+        return self._hashes
@@ -0,0 +1,197 @@
+"""
+RepertoireIndexer — builds the songs library from the MIDI files on disk.
+
+A scan walks database/repertoire/ and compares each file's mtime and size
+with what the songs table recorded last time. Untouched files are skipped
+without being read. Files whose stamp changed are handed to a process pool,
+where each worker hashes the bytes and parses them only if the hash changed
+too (a copied or re-saved file with the same content just gets its stamp
+updated). Parsing extracts duration, note count, the selected piano track,
+a Krumhansl-Schmuckler key estimate, polyphony and a difficulty score
+(see song_difficulty); results are bulk-upserted in one transaction, so the first scan of a large library pays the parsing
+cost once and later scans cost a directory walk. Rows indexed by an older
+INDEX_VERSION are treated as changed, so new metadata gets filled in, and
+files under the root that the walk no longer finds drop out of the index
+(played songs keep their history).
+"""
+import hashlib
+import os
+import time
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from logic.services.confusion import PITCH_CLASS_NAMES  # type: ignore
+from logic.services.midi_ingestor import read_note_array, select_piano_track, DRUM_CHANNEL  # type: ignore
+from logic.services.song_difficulty import estimate_difficulty  # type: ignore
+
+MIDI_SUFFIXES = (".mid", ".midi")
+INDEX_VERSION = 4  # Bump when analyze_midi's output changes (new columns or track selection)
+
+# Krumhansl-Kessler key profiles, tonic first
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+
+def estimate_key(pitches: np.ndarray, durations: np.ndarray) -> str:
+    """Best-correlating major/minor key for a duration-weighted pitch-class histogram."""
+    if len(pitches) == 0:
+        return ""
+    histogram = np.bincount(pitches % 12, weights=durations, minlength=12)
+    if not histogram.any():
+        return ""
+    best_score, best_key = -2.0, ""
+    for mode, profile in (("Major", MAJOR_PROFILE), ("Minor", MINOR_PROFILE)):
+        for tonic in range(12):
+            score = np.corrcoef(histogram, np.roll(profile, tonic))[0, 1]
+            if score > best_score:
+                best_score, best_key = score, f"{PITCH_CLASS_NAMES[tonic]} {mode}"
+    return best_key
+
+
+def polyphony(starts: np.ndarray, ends: np.ndarray) -> Tuple[int, float]:
+    """Most notes sounding at once, and the time-weighted mean while anything sounds."""
+    if len(starts) == 0:
+        return 0, 0.0
+    times = np.concatenate((starts, ends))
+    deltas = np.concatenate((np.ones(len(starts)), -np.ones(len(ends))))
+    # At equal times releases come first, so a repeated note doesn't count twice
+    order = np.lexsort((deltas, times))
+    times, counts = times[order], np.cumsum(deltas[order])
+    spans = np.diff(times)
+    sounding = counts[:-1] > 0
+    covered = spans[sounding].sum()
+    mean = float((counts[:-1][sounding] * spans[sounding]).sum() / covered) if covered > 0 else 0.0
+    return int(counts.max()), round(mean, 2)
+
+
+def analyze_midi(path: str, data: bytes) -> Dict:
+    """Metadata for one MIDI file's bytes (runs in a pool worker)."""
+    notes, instruments, timing = read_note_array(path, data)
+    instrument = select_piano_track(instruments)
+    pitched = notes[notes["channel"] != DRUM_CHANNEL]
+    ends = notes["start"] + notes["duration"]
+    selected = notes[notes["instrument"] == instrument] if instrument is not None else notes[:0]
+    # Notes arrive in note-off order; difficulty sections need them by start
+    selected = selected[np.argsort(selected["start"], kind="stable")]
+    max_poly, mean_poly = polyphony(selected["start"], selected["start"] + selected["duration"])
+    difficulty = estimate_difficulty(selected, timing["tempo_bpm"])
+    return {
+        "duration_sec": float(ends.max()) if len(ends) else 0.0,
+        "note_count": int(len(selected)),
+        "key_estimate": estimate_key(pitched["pitch"].astype(np.int64), pitched["duration"].astype(np.float64)),
+        "piano_track": instruments[instrument]["name"].strip() if instrument is not None else "",
+        "max_polyphony": max_poly,
+        "mean_polyphony": mean_poly,
+        "difficulty": difficulty.score,
+        "section_difficulty": json.dumps(difficulty.sections),
+        "difficulty_features": json.dumps(difficulty.features),
+    }
+
+
+def index_file(path: str, known_hash: Optional[str]) -> Dict:
+    """Hashes a file and, unless the hash matches known_hash, parses it. Never raises."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash == known_hash:
+            return {"filepath": path, "content_hash": content_hash, "unchanged": True}
+        return dict(analyze_midi(path, data), filepath=path, content_hash=content_hash)
+    except Exception as e:
+        return {"filepath": path, "error": str(e)}
+
+
+@dataclass
+class IndexReport:
+    files: int = 0
+    skipped: int = 0      # Same mtime and size as last scan, not read
+    unchanged: int = 0    # Touched, but the same content hash
+    parsed: int = 0
+    failed: int = 0
+    removed: int = 0      # Indexed before, no longer on disk
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.files} files: {self.parsed} parsed, {self.unchanged} unchanged, "
+                f"{self.skipped} skipped, {self.failed} failed, {self.removed} removed in {self.seconds * 1000:.0f}ms")
+
+
+class RepertoireIndexer:
+    POOL_THRESHOLD = 8  # Fewer files than this are parsed in-process; a pool costs more to start
+
+    def __init__(self, db, root: Path, max_workers: Optional[int] = None):
+        self.db = db
+        self.root = Path(root)
+        self.max_workers = max_workers
+
+    def scan(self) -> IndexReport:
+        start = time.perf_counter()
+        report = IndexReport()
+        known = self.db.get_song_index_stamps()
+
+        todo: List[Tuple[str, Optional[str]]] = []
+        stamps: Dict[str, Tuple[int, int]] = {}
+        files = self._midi_files()
+        for path in files:
+            report.files += 1
+            try:
+                stat = os.stat(path)
+            except OSError:
+                report.failed += 1
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+            previous = known.get(path)
+            if previous and previous[3] != INDEX_VERSION:
+                todo.append((path, None))  # Indexed before the current columns existed; re-parse
+            elif previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                report.skipped += 1
+            else:
+                todo.append((path, previous[2] if previous else None))
+
+        results = self._run(todo)
+        rows, touched = [], []
+        for result in results:
+            path = result["filepath"]
+            mtime_ns, size = stamps[path]
+            if "error" in result:
+                print(f"RepertoireIndexer: Could not index {Path(path).name}: {result['error']}")
+                report.failed += 1
+            elif result.get("unchanged"):
+                touched.append((mtime_ns, size, path))
+                report.unchanged += 1
+            else:
+                rows.append(dict(result, title=Path(path).stem.replace("_", " "), mtime_ns=mtime_ns, size=size,
+                                 index_version=INDEX_VERSION))
+                report.parsed += 1
+        self.db.upsert_song_index(rows)
+        self.db.update_song_stamps(touched)
+
+        prefix = os.path.join(str(self.root), "")
+        found = set(files)
+        gone = [path for path in known if path.startswith(prefix) and path not in found]
+        self.db.clear_song_index(gone)
+        report.removed = len(gone)
+
+        report.seconds = time.perf_counter() - start
+        print(f"RepertoireIndexer: {report.summary()}")
+        return report
+
+    def _midi_files(self) -> List[str]:
+        files = []
+        for directory, _, names in os.walk(self.root):
+            files.extend(os.path.join(directory, n) for n in names if n.lower().endswith(MIDI_SUFFIXES))
+        return sorted(files)
+
+    def _run(self, todo: List[Tuple[str, Optional[str]]]) -> List[Dict]:
+        if not todo:
+            return []
+        paths, hashes = zip(*todo)
+        if len(todo) < self.POOL_THRESHOLD or self.max_workers == 1:
+            return [index_file(p, h) for p, h in todo]
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(index_file, paths, hashes, chunksize=chunksize))
@@ -0,0 +1,121 @@
+"""
+ScoreFollower — tracks where a student is in a song, and how fast they play it.
+
+The song's notes are grouped into score events (notes starting within
+CHORD_SECONDS of each other form one chord). Every played note advances an
+online DTW: a cost row over a band of BAND score events around the current
+position, where moving to event j costs 0 if the note belongs to it (a
+little more if only the pitch class matches, 1 otherwise) plus the best of
+staying on the previous event (other notes of the same chord, or a wrong
+note), stepping from the event before, or skipping up to MAX_SKIP events.
+The band slides forward with the position, so each note costs a fixed
+handful of vector operations on BAND entries regardless of song length.
+
+Notes that land exactly on a new event become tempo anchors. The player's
+tempo is the least-squares slope of score time against performance time over
+the last ANCHORS anchors. Between notes, score_time_at() extrapolates from
+the last anchor at that tempo. It never runs past the next unplayed event,
+so the score waits for a player who stops.
+"""
+from collections import deque
+from typing import Optional
+import numpy as np
+
+CHORD_SECONDS = 0.03
+
+
+def score_events(notes: np.ndarray):
+    """(event onset times, event index of each note) for a time-sorted NOTE_DTYPE array."""
+    starts = notes["start"].astype(np.float64)
+    new_event = np.r_[True, np.diff(starts) > CHORD_SECONDS] if len(starts) else np.zeros(0, dtype=bool)
+    event_of_note = np.cumsum(new_event) - 1
+    return starts[new_event], event_of_note
+
+
+class ScoreFollower:
+    BAND = 32              # Score events in the alignment band
+    BACK = 4               # Band entries kept behind the current position
+    MAX_SKIP = 3           # Events a single note may jump over
+    SKIP_COST = 0.6        # Per skipped event
+    STAY_COST = 0.1        # Playing another note on the current event
+    PITCH_CLASS_COST = 0.5 # Right note, wrong octave
+    COST_CAP = 6.0         # Keeps far-off positions reachable after getting lost
+    ANCHORS = 8
+    MIN_RATE, MAX_RATE = 0.25, 2.0
+
+    def __init__(self, notes: np.ndarray, start_time: float = 0.0):
+        """start_time: performance time at which the song's time 0 would be played at full tempo."""
+        times, event_of_note = score_events(notes)
+        n = len(times)
+        # Row 0 is a virtual event before the song; BAND rows of padding after it keep slices in range
+        rows = n + 1 + self.BAND
+        self._times = np.r_[times[:1] if n else [0.0], times, np.full(self.BAND, times[-1] if n else 0.0)]
+        # (pitch, row) match cost; the padding can never be the best position
+        self._costs = np.ones((128, rows), dtype=np.float32)
+        pitches = notes["pitch"].astype(np.int64)
+        for pc in range(12):
+            in_event = np.zeros(rows, dtype=bool)
+            in_event[event_of_note[pitches % 12 == pc] + 1] = True
+            self._costs[pc::12, :] = np.where(in_event, self.PITCH_CLASS_COST, 1.0)
+        self._costs[pitches, event_of_note + 1] = 0.0
+        self._costs[:, n + 1:] = self.COST_CAP
+        self.n_events = n
+
+        self._offset = 0  # Score row of band entry 0
+        self._band = np.full(self.BAND, self.COST_CAP)
+        self._band[0] = 0.0
+        self.position = 0  # Score row; 0 = nothing played yet, event k is row k + 1
+
+        self._anchors = deque(maxlen=self.ANCHORS)
+        self._anchor_score = self._times[0]
+        self._anchor_perf = start_time + self._times[0]
+        self.tempo_ratio = 1.0
+
+    @property
+    def event_index(self) -> int:
+        """Index of the score event the player is on, -1 before the first one."""
+        return self.position - 1
+
+    def note_on(self, pitch: int, t: float) -> Optional[int]:
+        """Aligns a played note at performance time t; returns the event index if it anchored a new event."""
+        B, o = self.BAND, self._offset
+        cost = self._costs[pitch, o:o + B]
+        prev = self._band
+        best = prev + self.STAY_COST
+        for k in range(1, self.MAX_SKIP + 2):
+            np.minimum(best[k:], prev[:-k] + self.SKIP_COST * (k - 1), out=best[k:])
+        band = np.minimum(cost + best, self.COST_CAP)
+        band -= band.min()
+        self._band = band
+
+        previous = self.position
+        self.position = o + int(np.argmin(band))
+        anchored = None
+        if self.position > previous and cost[self.position - o] == 0.0:
+            self._anchor(t)
+            anchored = self.event_index
+
+        # Slide the band so the position keeps BACK entries behind it
+        shift = min(self.position - self.BACK - o, self.n_events + 1 - o)
+        if shift > 0:
+            self._band = np.r_[band[shift:], np.full(shift, self.COST_CAP)]
+            self._offset += shift
+        return anchored
+
+    def _anchor(self, t: float):
+        score_time = self._times[self.position]
+        self._anchors.append((t, score_time))
+        self._anchor_perf, self._anchor_score = t, score_time
+        if len(self._anchors) >= 3:
+            perf, score = np.array(self._anchors).T
+            spread = perf - perf.mean()
+            if spread @ spread > 1e-4:
+                rate = float(spread @ (score - score.mean()) / (spread @ spread))
+                self.tempo_ratio = min(max(rate, self.MIN_RATE), self.MAX_RATE)
+
+    def score_time_at(self, t: float) -> float:
+        """Song time the player is at, at performance time t."""
+        estimate = self._anchor_score + (t - self._anchor_perf) * self.tempo_ratio
+        if self.position < self.n_events:
+            estimate = min(estimate, self._times[self.position + 1])
+        return float(estimate)
@@ -0,0 +1,197 @@
+"""
+SequenceBuilder — turns MIDI files into evaluation / play-along sequences.
+
+MidiIngestor.load_notes parses the file and picks the piano track; its notes
+are mapped from seconds onto the file's quarter-note grid from its tempo map
+(so tempo changes are absorbed), snapped to a grid that gets finer with
+difficulty and reduced to at most one note per grid slot and hand: the top
+voice for the right hand, the bass for the left. Easy levels are right-hand
+melody only. The result is a level dict in the sequences.json format, tempo
+taken from the file.
+
+Converted levels are cached as JSON under database/cache/sequences/, keyed by
+the MIDI file's SHA-256 and the difficulty, so a repeat run costs a file hash
+and a small JSON read.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from logic.services.midi_ingestor import MidiIngestor  # type: ignore
+
+CONVERTER_VERSION = 2  # Bump when the conversion rules change, to invalidate cached levels
+MIDDLE_C = 60
+
+
+@dataclass(frozen=True)
+class DifficultyProfile:
+    grid_beats: float   # Quantization step
+    two_hands: bool     # Otherwise right-hand melody only
+    max_notes: int      # Length of the excerpt taken from the start of the piece
+
+
+# Modelled on the hand-written levels in sequences.json
+DIFFICULTY_PROFILES = {
+    1: DifficultyProfile(1.0, False, 14),
+    2: DifficultyProfile(1.0, False, 14),
+    3: DifficultyProfile(0.5, False, 16),
+    4: DifficultyProfile(0.5, False, 16),
+    5: DifficultyProfile(0.5, True, 24),
+    6: DifficultyProfile(0.5, True, 24),
+    7: DifficultyProfile(0.5, True, 40),
+    8: DifficultyProfile(0.5, True, 40),
+}
+
+
+def beat_times(tempo_changes: List[List[float]], end: float) -> np.ndarray:
+    """Quarter-note times in seconds from 0 to past end, through [seconds, BPM] tempo changes."""
+    if not tempo_changes:
+        tempo_changes = [[0.0, 120.0]]
+    times = [0.0]
+    changes = [(float(t), float(bpm)) for t, bpm in tempo_changes]
+    k = 0
+    while times[-1] <= end:
+        # The tempo in force at the last beat, until the next change
+        while k + 1 < len(changes) and changes[k + 1][0] <= times[-1] + 1e-9:
+            k += 1
+        step = 60.0 / changes[k][1]
+        next_change = changes[k + 1][0] if k + 1 < len(changes) else float("inf")
+        if times[-1] + step > next_change + 1e-9:
+            # Part of this beat falls after the change: finish it at the new tempo
+            done = (next_change - times[-1]) / step
+            step = (next_change - times[-1]) + (1.0 - done) * 60.0 / changes[k + 1][1]
+        times.append(times[-1] + step)
+    return np.array(times)
+
+
+def _seconds_to_beats(times: np.ndarray, beat_times: np.ndarray) -> np.ndarray:
+    """Maps times onto the beat grid, extrapolating past its ends at the nearest beat length."""
+    if len(beat_times) < 2:
+        return times * 2.0  # No usable tempo map: assume 120 BPM
+    index = np.arange(len(beat_times), dtype=np.float64)
+    beats = np.interp(times, beat_times, index)
+    first_len = beat_times[1] - beat_times[0]
+    last_len = beat_times[-1] - beat_times[-2]
+    beats = np.where(times < beat_times[0], (times - beat_times[0]) / first_len, beats)
+    return np.where(times > beat_times[-1], index[-1] + (times - beat_times[-1]) / last_len, beats)
+
+
+def _one_voice(slots: Dict[float, Tuple[int, float]], grid: float) -> List[Tuple[float, int, float]]:
+    """Orders (start, pitch, duration) by start and cuts each note off at the next one."""
+    notes = sorted((start, pitch, duration) for start, (pitch, duration) in slots.items())
+    out = []
+    for i, (start, pitch, duration) in enumerate(notes):
+        if i + 1 < len(notes):
+            duration = min(duration, notes[i + 1][0] - start)
+        out.append((start, pitch, max(duration, grid)))
+    return out
+
+
+def build_sequence(notes: np.ndarray, metadata: Dict, difficulty: int, title: str = "") -> Dict:
+    """Converts one track's time-sorted NOTE_DTYPE array (with load_notes metadata) into a sequences.json level."""
+    difficulty = min(max(difficulty, 1), max(DIFFICULTY_PROFILES))
+    profile = DIFFICULTY_PROFILES[difficulty]
+    grid = profile.grid_beats
+
+    ends = (notes["start"] + notes["duration"]).astype(np.float64)
+    beats = beat_times(metadata.get("tempo_changes", []), float(ends.max()) if len(ends) else 0.0)
+    beat_lengths = np.diff(beats)
+    tempo_bpm = int(round(60.0 / float(np.median(beat_lengths)))) if len(beat_lengths) else 120
+    time_signature = list(metadata.get("time_signature", [4, 4]))
+
+    if not len(notes):
+        return {"level": difficulty, "title": title, "tempo_bpm": tempo_bpm,
+                "time_signature": time_signature, "notes": []}
+
+    order = np.lexsort((notes["pitch"], notes["start"]))
+    notes, ends = notes[order], ends[order]
+    starts = _seconds_to_beats(notes["start"].astype(np.float64), beats)
+    ends = _seconds_to_beats(ends, beats)
+    q_starts = np.round(starts / grid) * grid
+    q_durations = np.maximum(np.round((ends - starts) / grid) * grid, grid)
+    pitches = notes["pitch"].astype(np.int64).tolist()
+
+    # One note per grid slot and hand: top voice on the right, bass on the left
+    right: Dict[float, Tuple[int, float]] = {}
+    left: Dict[float, Tuple[int, float]] = {}
+    for start, duration, pitch in zip(q_starts.tolist(), q_durations.tolist(), pitches):
+        if profile.two_hands and pitch < MIDDLE_C:
+            # Keep the left hand to on-beat notes
+            if start % 1.0 == 0 and (start not in left or pitch < left[start][0]):
+                left[start] = (pitch, duration)
+        elif start not in right or pitch > right[start][0]:
+            right[start] = (pitch, duration)
+
+    melody = _one_voice(right, grid)
+    if not profile.two_hands and melody:
+        # Lift a low melody onto the treble staff by whole octaves
+        median = float(np.median([p for _, p, _ in melody]))
+        shift = 12 * int(np.ceil((MIDDLE_C - median) / 12)) if median < MIDDLE_C else 0
+        melody = [(s, p + shift, d) for s, p, d in melody]
+
+    merged = sorted([(s, p, d, "R") for s, p, d in melody] +
+                    [(s, p, d, "L") for s, p, d in _one_voice(left, grid)],
+                    key=lambda n: (n[0], n[3] != "L"))
+    excerpt = merged[:profile.max_notes]
+    # Start the excerpt on the bar containing its first note
+    bar = time_signature[0] * 4.0 / time_signature[1]
+    offset = np.floor(excerpt[0][0] / bar) * bar if excerpt else 0.0
+
+    return {
+        "level": difficulty,
+        "title": title,
+        "tempo_bpm": tempo_bpm,
+        "time_signature": time_signature,
+        "notes": [
+            {"pitch": int(p), "start_beat": float(s - offset), "duration_beats": float(d), "hand": hand}
+            for s, p, d, hand in excerpt
+        ],
+    }
+
+
+class SequenceBuilder:
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._ingestor = MidiIngestor()
+        self._memo: Dict[str, Dict] = {}
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+    def convert(self, midi_path: Path, difficulty: int, title: str = "") -> Dict:
+        """The level for midi_path at difficulty, from the cache when the file is unchanged."""
+        midi_path = Path(midi_path)
+        title = title or midi_path.stem.replace("_", " ")
+        key = f"{self.file_hash(midi_path)[:32]}-d{difficulty}-v{CONVERTER_VERSION}"
+        level = self._memo.get(key)
+        cache_file = self.cache_dir / f"{key}.json" if self.cache_dir else None
+        if level is None and cache_file and cache_file.exists():
+            try:
+                level = json.loads(cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                level = None
+        if level is None:
+            notes, metadata = self._ingestor.load_notes(str(midi_path))
+            level = build_sequence(notes, metadata, difficulty)
+            if cache_file:
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_text(json.dumps(level), encoding="utf-8")
+                except OSError as e:
+                    print(f"SequenceBuilder: Could not cache {midi_path.name}: {e}")
+        self._memo[key] = level
+        return dict(level, title=title)
+
+    def convert_all(self, midi_paths: Iterable[Path], difficulties: Iterable[int]) -> List[Dict]:
+        """Every file at every difficulty, numbered as consecutive levels."""
+        levels = []
+        difficulties = list(difficulties)
+        for path in midi_paths:
+            for difficulty in difficulties:
+                level = self.convert(path, difficulty)
+                if level["notes"]:
+                    levels.append(dict(level, level=len(levels) + 1))
+        return levels
@@ -8,11 +8,14 @@ class SettingsService(QObject):
     statsChanged = Signal()
     coachSettingsChanged = Signal()
     invertPedalChanged = Signal()
+    inputSettingsChanged = Signal()
 
     def __init__(self, db_manager, project_root):
         super().__init__()
         self.db = db_manager
         self.env_file = project_root / ".env"
+        # Set by AppState; its cached milestone statuses are reloaded after a reset
+        self.curriculum = None
 
     # ── Generic .env helpers ──────────────────────────────────────────
 
@@ -94,6 +97,20 @@ class SettingsService(QObject):
         self._set_env("COACH_PERSONALITY", val)
         self.coachSettingsChanged.emit()
 
+    # ── Chord Onset Window ────────────────────────────────────────────
+
+    @Property(int, notify=inputSettingsChanged)
+    def chordOnsetWindowMs(self) -> int:
+        try:
+            return max(0, int(self._get_env("CHORD_ONSET_WINDOW_MS", "30")))
+        except ValueError:
+            return 30
+
+    @chordOnsetWindowMs.setter # type: ignore
+    def chordOnsetWindowMs(self, val: int):
+        self._set_env("CHORD_ONSET_WINDOW_MS", str(int(val)))
+        self.inputSettingsChanged.emit()
+
     # ── Skill Matrix & Stats ──────────────────────────────────────────
 
     @Property(str, notify=skillMatrixSummaryChanged)
@@ -111,6 +128,8 @@ class SettingsService(QObject):
     @Slot()
     def resetSkillMatrix(self):
         self.db.reset_all_stats()
+        if self.curriculum is not None:
+            self.curriculum.refreshCurriculum()
         self.skillMatrixSummaryChanged.emit()
         self.statsChanged.emit()
 
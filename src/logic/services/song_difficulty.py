@@ -0,0 +1,134 @@
+"""
+SongDifficulty — a feature-based difficulty score for a piano part.
+
+Works on the time-sorted NOTE_DTYPE array MidiIngestor produces for a
+song's piano track. Every note is tagged with the section it starts in
+(fixed SECTION_SECONDS slices), and each feature is computed for all
+sections at once with bincount / reduceat; the whole-song value is the same
+computation with a single section. Features:
+
+  note_density      notes per second
+  hand_span         widest interval one hand covers within a 1 s window
+                    (right hand = middle C and above)
+  chord_density     block chords (3+ notes within 50 ms) per second
+  accidental_ratio  share of notes outside the song's best-fitting key signature
+  tempo_bpm         from the file
+  leap_ratio        share of same-hand moves of a minor sixth or more
+
+Each feature is scaled against a "hard" reference value, clipped and
+combined into a 0-10 score. A full song takes about a millisecond.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+
+SECTION_SECONDS = 15.0
+SPAN_WINDOW_SECONDS = 1.0
+CHORD_WINDOW_SECONDS = 0.05
+LEAP_SEMITONES = 8
+MIDDLE_C = 60
+MAJOR_SCALE = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1], dtype=np.float64)
+
+# (reference value that counts as "hard", weight)
+FEATURE_SCALE = {
+    "note_density": (8.0, 0.30),
+    "hand_span": (14.0, 0.15),
+    "chord_density": (2.0, 0.15),
+    "accidental_ratio": (0.3, 0.10),
+    "tempo_bpm": (160.0, 0.10),
+    "leap_ratio": (0.25, 0.20),
+}
+TEMPO_FLOOR_BPM = 60.0  # Tempos at or below this add nothing
+
+
+@dataclass
+class DifficultyReport:
+    score: float                                     # 0 (trivial) .. 10 (very hard)
+    features: Dict[str, float]
+    sections: List[float] = field(default_factory=list)  # Score per SECTION_SECONDS slice
+
+
+def _scores(features: Dict[str, np.ndarray]) -> np.ndarray:
+    total = 0.0
+    weights = 0.0
+    for name, (reference, weight) in FEATURE_SCALE.items():
+        value = features[name]
+        if name == "tempo_bpm":
+            value = np.maximum(value - TEMPO_FLOOR_BPM, 0.0)
+            reference -= TEMPO_FLOOR_BPM
+        total = total + weight * np.clip(value / reference, 0.0, 1.5)
+        weights += weight
+    return np.round(10.0 * total / (1.5 * weights), 2)
+
+
+def _features(notes: np.ndarray, section: np.ndarray, n_sections: int,
+              lengths: np.ndarray, tempo_bpm: float, in_key: np.ndarray) -> Dict[str, np.ndarray]:
+    pitches = notes["pitch"].astype(np.int64)
+    starts = notes["start"]
+    counts = np.bincount(section, minlength=n_sections).astype(np.float64)
+    safe_counts = np.maximum(counts, 1.0)
+    safe_lengths = np.maximum(lengths, 1e-3)
+
+    # Hand span: max - min pitch per (1 s window, hand), then the widest window in each section
+    hand = (pitches >= MIDDLE_C).astype(np.int64)
+    window = np.floor(starts / SPAN_WINDOW_SECONDS).astype(np.int64)
+    key = window * 2 + hand
+    order = np.argsort(key, kind="stable")
+    key_sorted = key[order]
+    bounds = np.flatnonzero(np.r_[True, key_sorted[1:] != key_sorted[:-1]])
+    spans = (np.maximum.reduceat(pitches[order], bounds) - np.minimum.reduceat(pitches[order], bounds))
+    hand_span = np.zeros(n_sections)
+    np.maximum.at(hand_span, section[order][bounds], spans.astype(np.float64))
+
+    # Block chords: onsets closer together than the chord window form one cluster
+    cluster_starts = np.flatnonzero(np.r_[True, np.diff(starts) > CHORD_WINDOW_SECONDS])
+    sizes = np.diff(np.r_[cluster_starts, len(starts)])
+    chords = np.bincount(section[cluster_starts], weights=(sizes >= 3).astype(np.float64), minlength=n_sections)
+
+    # Leaps: consecutive notes of the same hand, in time order
+    by_hand = np.lexsort((starts, hand))
+    same_hand = hand[by_hand][1:] == hand[by_hand][:-1]
+    leaps = (np.abs(np.diff(pitches[by_hand])) >= LEAP_SEMITONES) & same_hand
+    moves_section = section[by_hand][1:]
+    moves = np.bincount(moves_section, weights=same_hand.astype(np.float64), minlength=n_sections)
+    leap_count = np.bincount(moves_section, weights=leaps.astype(np.float64), minlength=n_sections)
+
+    accidentals = np.bincount(section, weights=1.0 - in_key[pitches % 12], minlength=n_sections)
+
+    return {
+        "note_density": counts / safe_lengths,
+        "hand_span": hand_span,
+        "chord_density": chords / safe_lengths,
+        "accidental_ratio": accidentals / safe_counts,
+        "tempo_bpm": np.full(n_sections, float(tempo_bpm)),
+        "leap_ratio": leap_count / np.maximum(moves, 1.0),
+    }
+
+
+def estimate_difficulty(notes: np.ndarray, tempo_bpm: float = 120.0) -> DifficultyReport:
+    """Scores a time-sorted NOTE_DTYPE array for the whole song and per section."""
+    if len(notes) == 0:
+        return DifficultyReport(0.0, {name: 0.0 for name in FEATURE_SCALE}, [])
+
+    # Key signature: the major scale (or its relative minor) covering the most note time
+    histogram = np.bincount(notes["pitch"] % 12, weights=notes["duration"].astype(np.float64), minlength=12)
+    rotations = np.array([np.roll(MAJOR_SCALE, tonic) for tonic in range(12)])
+    in_key = rotations[int(np.argmax(rotations @ histogram))]
+
+    first = float(notes["start"][0])
+    end = float(np.max(notes["start"] + notes["duration"]))
+
+    whole = _features(notes, np.zeros(len(notes), dtype=np.int64), 1,
+                      np.array([end - first]), tempo_bpm, in_key)
+
+    section = ((notes["start"] - first) // SECTION_SECONDS).astype(np.int64)
+    n_sections = int(section[-1]) + 1
+    edges = first + SECTION_SECONDS * np.arange(n_sections + 1)
+    lengths = np.minimum(edges[1:], end) - edges[:-1]
+    per_section = _features(notes, section, n_sections, lengths, tempo_bpm, in_key)
+
+    return DifficultyReport(
+        score=float(_scores(whole)[0]),
+        features={name: round(float(value[0]), 3) for name, value in whole.items()},
+        sections=_scores(per_section).tolist(),
+    )
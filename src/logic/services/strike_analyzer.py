@@ -0,0 +1,80 @@
+"""
+StrikeAnalyzer — onset and release timing of a block-chord strike.
+
+Only keys that are currently held carry an onset time, so a stray note that
+was pressed and released before the chord came together no longer skews the
+measurement. When the trainer sees the chord match, it captures the held keys:
+onset spread is the time from the first to the last key down, arrival order
+lists fingers (1 = lowest key) in the order they landed, and the lagging
+finger is the last one with its delay behind the previous arrival. Once the
+attempt is committed, the release spread is measured as its keys come up.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class StrikeReport:
+    pitches: List[int]                      # Chord keys, low to high (finger 1 = lowest)
+    onset_spread_ms: float
+    arrival_order: List[int]                # Finger numbers in the order they landed
+    lagging_finger: int
+    lag_ms: float                           # Last arrival behind the one before it
+    release_spread_ms: Optional[float] = None
+    chord_name: str = ""
+    _releases: Dict[int, float] = field(default_factory=dict, repr=False)
+
+
+class StrikeAnalyzer:
+    def __init__(self):
+        self._onsets: Dict[int, float] = {}
+        self._captured: Optional[StrikeReport] = None
+        self._committed: Optional[StrikeReport] = None
+
+    def reset(self):
+        """New target: forget any capture that was never committed."""
+        self._captured = None
+        self._committed = None
+
+    def note_on(self, pitch: int, t: float):
+        self._onsets.setdefault(pitch, t)
+
+    def note_off(self, pitch: int, t: float) -> Optional[StrikeReport]:
+        """Returns the committed report once the last of its keys has been released."""
+        self._onsets.pop(pitch, None)
+        report = self._committed
+        if report is None or pitch not in report.pitches:
+            return None
+        report._releases.setdefault(pitch, t)
+        if len(report._releases) < len(report.pitches):
+            return None
+        times = report._releases.values()
+        report.release_spread_ms = (max(times) - min(times)) * 1000.0
+        self._committed = None
+        return report
+
+    def capture(self, pitches: Iterable[int]) -> Optional[StrikeReport]:
+        """Snapshot the onset timing of the given held keys (call when the chord first matches)."""
+        keys = sorted(p for p in pitches if p in self._onsets)
+        if not keys:
+            self._captured = None
+            return None
+        onsets = [self._onsets[p] for p in keys]
+        order = sorted(range(len(keys)), key=lambda i: (onsets[i], i))
+        last = order[-1]
+        lag = (onsets[last] - onsets[order[-2]]) * 1000.0 if len(order) > 1 else 0.0
+        self._captured = StrikeReport(
+            pitches=keys,
+            onset_spread_ms=(max(onsets) - min(onsets)) * 1000.0,
+            arrival_order=[i + 1 for i in order],
+            lagging_finger=last + 1,
+            lag_ms=lag,
+        )
+        return self._captured
+
+    def commit(self, chord_name: str) -> Optional[StrikeReport]:
+        """The captured strike counted as an attempt at chord_name; measure its release next."""
+        self._committed, self._captured = self._captured, None
+        if self._committed:
+            self._committed.chord_name = chord_name
+        return self._committed
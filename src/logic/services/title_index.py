@@ -0,0 +1,252 @@
+"""
+TitleIndex — fuzzy search over the titles of the MIDI files on disk.
+
+Each file in the repertoire folder becomes a document whose text is its
+title (the file name, with underscores, dashes, CamelCase and numbers split
+into words) followed by the folders it sits in relative to the root (usually
+a composer or collection). Text is folded to lowercase ASCII words and
+broken into trigrams, each word padded like "  fur " so word starts count.
+An inverted index maps every trigram to the documents containing it.
+
+A query is scored by counting, per document, the query trigrams it shares
+(one bincount over the postings of the query's trigrams). Coverage (shared
+over the query's trigram count) has to reach MIN_COVERAGE, so typos and
+partial words still match, and ranking mixes coverage with Dice similarity
+so a short exact title beats a long one that merely contains the words.
+The query's last word is not end-padded, so a title matches while it is
+still being typed.
+
+search() is for browsing and is deliberately forgiving. local_match() is
+the strict check used before skipping the network: query words naming the
+file's folders are set aside, every remaining word has to be one of the
+title's words (the last may still be a prefix), and the title has to
+contain at least LOCAL_MATCH_COVERAGE of those words' trigrams. So
+"symphony 5" doesn't settle for Symphony_9, and "beethoven pathetique"
+doesn't settle for another piece in the Beethoven folder.
+
+The index is kept on disk as JSON. refresh() compares every file's mtime
+and size with the stamps stored there and only re-indexes files that
+changed; removed documents become tombstones that are compacted away when
+they outnumber the live ones.
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+INDEX_VERSION = 1
+MIDI_SUFFIXES = (".mid", ".midi")
+MIN_COVERAGE = 0.5
+LOCAL_MATCH_COVERAGE = 0.9
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])|(?<=[0-9])(?=[A-Za-z])")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII words separated by single spaces."""
+    text = _CAMEL.sub(" ", text)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str, open_end: bool = False) -> List[str]:
+    """Distinct trigrams of normalized text; open_end leaves the last word unpadded (a word being typed)."""
+    words = text.split()
+    grams = []
+    for i, word in enumerate(words):
+        padded = f"  {word}" if open_end and i == len(words) - 1 else f"  {word} "
+        grams.extend(padded[k:k + 3] for k in range(len(padded) - 2))
+    return list(dict.fromkeys(grams))
+
+
+def title_from_path(path: Path) -> str:
+    return " ".join(path.stem.replace("_", " ").replace("-", " ").split())
+
+
+class TitleIndex:
+    def __init__(self, root: Path, index_path: Path):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._load()
+
+    # ── Index maintenance ─────────────────────────────────────────────
+
+    def _clear(self):
+        self._docs: List[Optional[Dict]] = []       # {path, title, text, stamp}; None once removed
+        self._by_path: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}   # Postings as arrays, built on first query after a change
+        self._sizes: List[int] = []                 # Trigram count per document
+        self._size_array: Optional[np.ndarray] = None
+        self._dirty = False
+
+    def _load(self):
+        self._clear()
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        self._docs = data["docs"]
+        self._postings = data["postings"]
+        self._sizes = [len(trigrams(d["text"])) if d else 0 for d in self._docs]
+        self._by_path = {d["path"]: i for i, d in enumerate(self._docs) if d}
+
+    def save(self):
+        """Writes the index if it changed since it was loaded or last saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            live = len(self._by_path)
+            if len(self._docs) - live > live:
+                self._compact()
+            data = {"version": INDEX_VERSION, "root": str(self.root), "docs": self._docs, "postings": self._postings}
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.index_path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                print(f"TitleIndex: Could not save {self.index_path}: {e}")
+
+    def _compact(self):
+        docs = [d for d in self._docs if d]
+        self._clear()
+        for doc in docs:
+            self._add(doc)
+        self._dirty = True
+
+    def _add(self, doc: Dict):
+        i = len(self._docs)
+        self._docs.append(doc)
+        grams = trigrams(doc["text"])
+        self._sizes.append(len(grams))
+        self._size_array = None
+        self._by_path[doc["path"]] = i
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(i)
+            self._arrays.pop(gram, None)
+        self._dirty = True
+
+    def _remove(self, path: str):
+        i = self._by_path.pop(path, None)
+        if i is None:
+            return
+        for gram in trigrams(self._docs[i]["text"]):
+            postings = self._postings[gram]
+            postings.remove(i)
+            if not postings:
+                del self._postings[gram]
+            self._arrays.pop(gram, None)
+        self._docs[i] = None
+        self._sizes[i] = 0
+        self._size_array = None
+        self._dirty = True
+
+    def update_file(self, path: str) -> bool:
+        """(Re)indexes one file, or drops it if it is gone; returns whether the index changed."""
+        path = str(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self._lock:
+            known = self._by_path.get(path)
+            stamp = [stat.st_mtime_ns, stat.st_size] if stat else None
+            if known is not None and stamp and self._docs[known]["stamp"] == stamp:
+                return False
+            self._remove(path)
+            if stamp:
+                file_path = Path(path)
+                title = title_from_path(file_path)
+                try:
+                    folders = " ".join(file_path.parent.relative_to(self.root).parts)
+                except ValueError:
+                    folders = ""
+                self._add({"path": path, "title": title, "text": normalize(f"{title} {folders}"), "stamp": stamp})
+            return known is not None or stamp is not None
+
+    def refresh(self) -> int:
+        """Brings the index in line with the files under root and saves it; returns how many files changed."""
+        found = set()
+        changed = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.lower().endswith(MIDI_SUFFIXES):
+                    path = os.path.join(directory, name)
+                    found.add(path)
+                    changed += self.update_file(path)
+        with self._lock:
+            gone = [p for p in self._by_path if p not in found]
+            for path in gone:
+                self._remove(path)
+        changed += len(gone)
+        self.save()
+        print(f"TitleIndex: {len(found)} files, {changed} changed")
+        return changed
+
+    # ── Queries ───────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def search(self, query: str, limit: int = 5) -> List[Dict]:
+        """Best-matching files as {path, title, score}, best first; empty if nothing is close enough."""
+        grams = trigrams(normalize(query), open_end=True)
+        if not grams or limit < 1:
+            return []
+        with self._lock:
+            hits = [self._array(g) for g in grams if g in self._postings]
+            if not hits:
+                return []
+            shared = np.bincount(np.concatenate(hits), minlength=len(self._docs))
+            candidates = np.flatnonzero(shared >= MIN_COVERAGE * len(grams))
+            if not len(candidates):
+                return []
+            if self._size_array is None:
+                self._size_array = np.array(self._sizes, dtype=np.int64)
+            counts = shared[candidates]
+            dice = 2 * counts / (len(grams) + self._size_array[candidates])
+            scores = 0.75 * counts / len(grams) + 0.25 * dice
+            # Only the top few need sorting
+            top = np.argpartition(-scores, limit - 1)[:limit] if len(scores) > limit else np.arange(len(scores))
+            top = top[np.lexsort((candidates[top], -scores[top]))]
+            return [{"path": self._docs[i]["path"], "title": self._docs[i]["title"], "score": round(float(score), 3)}
+                    for i, score in zip(candidates[top].tolist(), scores[top].tolist())]
+
+    def local_match(self, query: str) -> Optional[Dict]:
+        """The file query names, if its title clearly matches; None means ask the network."""
+        words = normalize(query).split()
+        for hit in self.search(query):
+            with self._lock:
+                i = self._by_path.get(hit["path"])
+                if i is None:
+                    continue
+                doc = self._docs[i]
+            title_words = normalize(doc["title"]).split()
+            folder_words = set(doc["text"].split()[len(title_words):])
+            last = len(words) - 1
+            rest = [(k, w) for k, w in enumerate(words) if w not in folder_words or w in title_words]
+            if not rest:
+                continue  # Only the folder matched
+            if not all(w in title_words or (k == last and len(w) >= 3 and any(t.startswith(w) for t in title_words))
+                       for k, w in rest):
+                continue
+            grams = trigrams(" ".join(w for _, w in rest), open_end=rest[-1][0] == last)
+            title_grams = set(trigrams(" ".join(title_words)))
+            if sum(g in title_grams for g in grams) >= LOCAL_MATCH_COVERAGE * len(grams):
+                return hit
+        return None
+
+    def _array(self, gram: str) -> np.ndarray:
+        array = self._arrays.get(gram)
+        if array is None:
+            array = self._arrays[gram] = np.array(self._postings[gram], dtype=np.int64)
+        return array
@@ -0,0 +1,111 @@
+"""
+WeaknessIndex — in-memory weights for weakness-targeted free practice.
+
+Each candidate chord gets a weight from its failure rate, typical response
+time and how long ago it was last played. The index is seeded once from the
+chords table and then updated in place after every attempt, so drawing the
+next free-practice target never touches the DB. Draws come from a Vose alias
+table: O(1) per draw, rebuilt (O(n) over ~80 chords) only when an attempt
+changes a weight.
+"""
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+class AliasTable:
+    """Vose's alias method for sampling a discrete distribution in O(1)."""
+
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasTable needs at least one weight")
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        self._prob = [0.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever remains is 1.0 up to rounding error
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        i = rng.randrange(len(self._prob))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+class WeaknessIndex:
+    TARGET_LATENCY_MS = 2000.0   # Response time considered "fluent"
+    STALE_HOURS = 48.0           # After this long unplayed, recency weight is maxed
+    LATENCY_ALPHA = 0.3          # EMA smoothing for per-attempt latency updates
+
+    def __init__(self, candidates: List[str], rng: Optional[random.Random] = None):
+        self.candidates = list(candidates)
+        self._slot = {name: i for i, name in enumerate(self.candidates)}
+        self._rng = rng or random.Random()
+        self._success = [0] * len(self.candidates)
+        self._fail = [0] * len(self.candidates)
+        self._latency: List[Optional[float]] = [None] * len(self.candidates)
+        self._last_played: List[Optional[float]] = [None] * len(self.candidates)
+        self._table: Optional[AliasTable] = None
+
+    def load(self, chord_stats: List[Dict]):
+        """Seeds the index from DatabaseManager.get_all_chord_stats() rows."""
+        for row in chord_stats:
+            i = self._slot.get(row.get("name"))
+            if i is None:
+                continue
+            self._success[i] = row.get("success_count") or 0
+            self._fail[i] = row.get("fail_count") or 0
+            latency = row.get("p50_latency_ms") or row.get("avg_latency_ms")
+            self._latency[i] = float(latency) if latency else None
+            try:
+                self._last_played[i] = datetime.fromisoformat(row["last_played"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                pass
+        self._table = None
+
+    def record(self, name: str, success: bool, latency_ms: float = 0.0, now: Optional[float] = None):
+        i = self._slot.get(name)
+        if i is None:
+            return
+        if success:
+            self._success[i] += 1
+            if latency_ms > 0:
+                prev = self._latency[i]
+                self._latency[i] = latency_ms if prev is None else prev + self.LATENCY_ALPHA * (latency_ms - prev)
+        else:
+            self._fail[i] += 1
+        self._last_played[i] = now if now is not None else time.time()
+        self._table = None
+
+    def weight(self, i: int, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.time()
+        attempts = self._success[i] + self._fail[i]
+        # Smoothed towards 0.25, so unseen chords still get explored but known weak spots dominate
+        fail_rate = (self._fail[i] + 0.5) / (attempts + 2)
+        latency = self._latency[i]
+        slowness = min(latency / self.TARGET_LATENCY_MS, 3.0) if latency else 0.5
+        last = self._last_played[i]
+        staleness = 1.0 if last is None else min(max(now - last, 0.0) / 3600.0 / self.STALE_HOURS, 1.0)
+        return 0.25 + 4.0 * fail_rate + slowness + 0.5 * staleness
+
+    def sample(self) -> str:
+        if self._table is None:
+            now = time.time()
+            self._table = AliasTable([self.weight(i, now) for i in range(len(self.candidates))])
+        return self.candidates[self._table.sample(self._rng)]
+
+    def weakest(self, n: int = 5) -> List[Tuple[str, float]]:
+        now = time.time()
+        ranked = sorted(((name, self.weight(i, now)) for i, name in enumerate(self.candidates)),
+                        key=lambda kv: kv[1], reverse=True)
+        return ranked[:n]
@@ -729,6 +729,7 @@ Rectangle {
             Layout.fillWidth: true
             Layout.preferredHeight: 180 * mainWindow.uiScale
             visible: root.isActive
+            showHeatmap: root.isLessonComplete
         }
         
         Item { Layout.fillHeight: true } // Spacer
@@ -138,6 +138,48 @@ Rectangle {
                 }
             }
         }
+        
+        // ── Dynamics (key velocity evenness) ──
+        ColumnLayout {
+            Layout.fillWidth: true
+            Layout.maximumWidth: 800 * mainWindow.uiScale
+            Layout.alignment: Qt.AlignHCenter
+            spacing: 16
+            visible: appState.chordTrainer.sessionDynamics.length > 0
+            
+            Rectangle { Layout.fillWidth: true; height: 1; color: "#2a2a2a" }
+            
+            Text {
+                text: "DYNAMICS"
+                font.pixelSize: 12 * mainWindow.uiScale
+                font.bold: true
+                font.letterSpacing: 2 * mainWindow.uiScale
+                color: "#666666"
+            }
+            
+            Flow {
+                Layout.fillWidth: true
+                spacing: 10
+                Repeater {
+                    model: appState.chordTrainer.sessionDynamics
+                    delegate: Rectangle {
+                        width: dynText.implicitWidth + 24
+                        height: 32
+                        color: "#1c1c1e"
+                        radius: 16
+                        border.color: modelData.evenness < 0.8 ? "#FF9800" : "#333333"
+                        
+                        Text {
+                            id: dynText
+                            anchors.centerIn: parent
+                            text: modelData.name + " · " + Math.round(modelData.evenness * 100) + "% even · ±" + Math.round(modelData.spread)
+                            color: "#cccccc"
+                            font.pixelSize: 12
+                        }
+                    }
+                }
+            }
+        }
     }
     
     // Internal Helper Component
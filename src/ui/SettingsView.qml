@@ -266,6 +266,13 @@ Rectangle {
                                         font.pixelSize: 11 * mainWindow.uiScale
                                         Layout.alignment: Qt.AlignRight
                                     }
+                                    Text {
+                                        visible: modelData.p50_latency_ms > 0
+                                        text: "p50 " + modelData.p50_latency_ms.toFixed(0) + "ms · p90 " + modelData.p90_latency_ms.toFixed(0) + "ms"
+                                        color: "#888888"
+                                        font.pixelSize: 11 * mainWindow.uiScale
+                                        Layout.alignment: Qt.AlignRight
+                                    }
                                 }
                             }
                         }
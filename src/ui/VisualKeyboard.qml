@@ -17,6 +17,16 @@ Item {
     // Array to track target pitches for the chord trainer
     property var targetKeys: []
     
+    // Practice heatmap: error rate per MIDI pitch (0..1, -1 = never played)
+    // Only fetched while shown, so a hidden overlay doesn't recompute it on every chord
+    property bool showHeatmap: false
+    property var heatmap: (visible && showHeatmap && typeof appState !== "undefined" && appState && appState.chordTrainer) ? appState.chordTrainer.keyHeatmap : []
+    
+    function heatColor(rate) {
+        // Green (clean) through amber to red (most errors)
+        return Qt.hsla(0.33 * (1.0 - Math.min(1.0, rate * 2.0)), 0.85, 0.5, 1.0);
+    }
+    
     Connections {
         target: (typeof appState !== "undefined" && appState) ? appState : null
         function onMidiNoteReceived(pitch, isOn) {
@@ -98,6 +108,7 @@ Item {
             property bool isActive: root.activeKeys[pitch] === true
             property bool isTarget: root.targetKeys.includes(pitch)
             property string targetColor: root.getColorForPitch(pitch)
+            property real heat: (root.showHeatmap && root.heatmap.length > pitch) ? root.heatmap[pitch] : -1
             
             z: isBlack ? 2 : 1
             
@@ -136,6 +147,15 @@ Item {
                 color: isActive ? (isTarget ? targetColor : "#388E3C") : (isTarget ? Qt.darker(targetColor, 1.2) : (isBlack ? "#111111" : "#e0e0e0"))
                 radius: 3
             }
+            
+            // Heatmap overlay (hidden while the key is pressed so live input stays readable)
+            Rectangle {
+                anchors.fill: parent
+                radius: 3
+                visible: heat >= 0 && !isActive
+                color: root.heatColor(heat)
+                opacity: 0.55
+            }
         }
     }
 }
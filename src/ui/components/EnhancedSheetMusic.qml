@@ -14,9 +14,36 @@ Rectangle {
     // Evaluation / scrolling mode properties (generic — reusable for MIDI playback)
     property string displayMode: "trainer"  // "trainer" or "evaluation"
     property var evalNotes: []               // Array of {pitch, start_beat, duration_beats, hand}
-    property real evalBeat: 0                // Current beat position from service
+    property real evalBeat: 0                // Playhead beat, animated locally between anchors
     property var evalNoteStates: []          // Array of "pending"/"hit"/"miss"
     property real pixelsPerBeat: width * 0.10
+
+    // The service only publishes playhead anchors (start/pause/resume/seek/stop);
+    // between them the playhead runs on the animation frame clock. Every anchor
+    // restarts it from where the anchor puts it now: beat at anchorTime, advanced
+    // by the time since then (now, on the same clock as anchorTime).
+    function syncPlayhead(beat, anchorTime, beatsPerSecond, running, now) {
+        playheadAnim.stop();
+        var current = beat;
+        if (running && beatsPerSecond > 0) {
+            current = beat + Math.max(0, now - anchorTime) * beatsPerSecond;
+        }
+        root.evalBeat = current;
+        if (running && beatsPerSecond > 0) {
+            playheadAnim.from = current;
+            playheadAnim.to = current + playheadAnim.horizonBeats;
+            playheadAnim.duration = playheadAnim.horizonBeats / beatsPerSecond * 1000;
+            playheadAnim.start();
+        }
+    }
+
+    NumberAnimation {
+        id: playheadAnim
+        property real horizonBeats: 1000  // Far beyond any sequence; the next anchor restarts it
+        target: root
+        property: "evalBeat"
+        easing.type: Easing.Linear
+    }
     
     function formatChordTitle(name) {
         if (!name) return "";
@@ -406,13 +433,6 @@ Rectangle {
             // The container x origin is at parent.noteStartX. 
             // We shift it left by currentBeat * pixelsPerBeat.
             x: - (root.evalBeat * root.pixelsPerBeat)
-            
-            Behavior on x { 
-                NumberAnimation { 
-                    duration: 33 // Slight interpolation to bridge 10ms-16ms Python ticks
-                    easing.type: Easing.Linear 
-                } 
-            }
 
             Repeater {
                 model: root.evalNotes
@@ -64,6 +64,9 @@ Rectangle {
             // Force QML to re-read properties when level changes
             root.isRunning = true;
         }
+        function onPlayheadAnchored(kind, beat, anchorTime, beatsPerSecond, running) {
+            evalStaff.syncPlayhead(beat, anchorTime, beatsPerSecond, running, root.evalEngine.clockNow());
+        }
     }
 
     // Direct listener for appState signals to ensure UI update
@@ -277,7 +280,6 @@ Rectangle {
                 
                 displayMode: "evaluation"
                 evalNotes: root.evalEngine ? root.evalEngine.sequenceNotes : []
-                evalBeat: root.evalEngine ? root.evalEngine.currentBeat : 0
                 evalNoteStates: root.evalEngine ? root.evalEngine.noteStates : []
             }
 
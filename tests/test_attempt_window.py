@@ -0,0 +1,126 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.attempt_window import RollingWindow
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.midi_replay import ReplayHarness, NoteEvent
+
+class TestRollingWindow(unittest.TestCase):
+    def test_oldest_attempts_are_evicted(self):
+        window = RollingWindow(4)
+        for success, latency in ((False, 9000), (True, 1000), (True, 3000), (True, 2000), (True, 4000)):
+            window.add(success, latency)
+        # The failure fell out of the window; latency averages successes only
+        self.assertEqual(len(window), 4)
+        self.assertEqual(window.total, 5)
+        self.assertEqual(window.accuracy, 1.0)
+        self.assertEqual(window.mean_latency_ms, 2500.0)
+
+    def test_seed_from_lifetime_counts(self):
+        window = RollingWindow(20)
+        window.seed(attempts=50, successes=40)
+        self.assertEqual(window.total, 50)
+        self.assertEqual(len(window), 20)
+        self.assertAlmostEqual(window.accuracy, 0.8)
+
+
+class TestAttemptWindowPersistence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.test_dir / "test.db"
+
+    def tearDown(self):
+        import gc
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_windows_are_warmed_from_history_at_startup(self):
+        db = DatabaseManager(self.db_path)
+        for i in range(30):
+            db.record_chord_attempt("F Minor", i % 3 != 0, 1500.0)
+        live = db.attempt_windows.get("chord", "F Minor")
+
+        reopened = DatabaseManager(self.db_path).attempt_windows.get("chord", "F Minor")
+        self.assertEqual(reopened.total, 30)
+        self.assertEqual(len(reopened), len(live))
+        self.assertAlmostEqual(reopened.accuracy, live.accuracy)
+        self.assertAlmostEqual(reopened.mean_latency_ms, 1500.0)
+
+    def test_history_is_pruned_to_the_window(self):
+        db = DatabaseManager(self.db_path)
+        for i in range(30):
+            db.record_chord_attempt("F Minor", True, float(i))
+        db.record_chord_attempt("G Major", True, 1000.0)
+        with db._get_connection() as conn:
+            rows = conn.execute("SELECT item_id, COUNT(*), MIN(latency_ms) FROM attempt_history GROUP BY item_id "
+                                "ORDER BY item_id").fetchall()
+        self.assertEqual(rows, [("F Minor", db.attempt_windows.size, 30.0 - db.attempt_windows.size),
+                                ("G Major", 1, 1000.0)])
+
+    def test_reset_clears_windows(self):
+        db = DatabaseManager(self.db_path)
+        db.record_chord_attempt("F Minor", True, 1500.0)
+        db.reset_all_stats()
+        self.assertEqual(len(db.attempt_windows.get("chord", "F Minor")), 0)
+        self.assertEqual(len(DatabaseManager(self.db_path).attempt_windows.get("chord", "F Minor")), 0)
+
+    def test_quick_review_judges_this_attempt(self):
+        db = DatabaseManager(self.db_path)
+        for _ in range(5):
+            db.record_chord_attempt("C Major", False, 9000.0)
+        clock = VirtualClock()
+        trainer = ChordTrainerService(db, clock=clock)
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+
+        # A fast, clean attempt is not flagged, however poor the recent record
+        t = clock.now() + 1.0
+        harness = ReplayHarness(clock, trainer.handle_midi_note)
+        harness.play([NoteEvent(t, p, True, 80) for p in (60, 64, 67)] +
+                     [NoteEvent(t + 0.5, p, False) for p in (60, 64, 67)])
+        self.assertEqual(trainer._struggled_items, [])
+
+        t = clock.now() + 5.0
+        harness.play([NoteEvent(t, p, True, 80) for p in (60, 64, 67)])
+        self.assertEqual([item["name"] for item in trainer._struggled_items], ["C Major"])
+        trainer.stop_session()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import contextlib
+import io
+from unittest.mock import patch
+import numpy as np
+from logic.services.midi_ingestor import MidiIngestor, NOTE_DTYPE
+from logic.services.chord_analyzer import chord_chart, chart_chords, interval_mask, window_masks, frame_histograms
+
+
+def make_notes(events):
+    """(pitch, start, duration) triples -> time-sorted NOTE_DTYPE array."""
+    notes = np.zeros(len(events), dtype=NOTE_DTYPE)
+    for i, (pitch, start, duration) in enumerate(events):
+        notes[i] = (pitch, start, duration, 80, 0, 0)
+    return notes[np.argsort(notes["start"], kind="stable")]
+
+
+FUR_ELISE = project_root / "database" / "repertoire" / "Fur_Elise.mid"
+
+
+class TestChordAnalyzer(unittest.TestCase):
+    def test_masks(self):
+        # C major block chord held for a second: one window mask with C, E and G
+        energy, bass = frame_histograms(make_notes([(48, 0.0, 1.0), (64, 0.0, 1.0), (67, 0.0, 1.0)]), 0.25)
+        self.assertEqual(energy.shape, (4, 12))
+        self.assertAlmostEqual(energy[:, 0].sum(), 1.0)
+        masks, bass_pc = window_masks(energy, bass)
+        self.assertEqual(int(masks[0]), interval_mask(0, {0, 4, 7}))
+        self.assertEqual(int(bass_pc[0]), 0)
+
+    def test_block_and_broken_chords(self):
+        events = []
+        # Two seconds each at 120 BPM: C major blocks, G7 arpeggios, then A minor over an A bass
+        for beat in range(4):
+            events += [(48, beat * 0.5, 0.5), (60, beat * 0.5, 0.5), (64, beat * 0.5, 0.5), (67, beat * 0.5, 0.5)]
+        for i, pitch in enumerate([43, 59, 62, 65] * 4):
+            events.append((pitch, 2.0 + i * 0.125, 0.125))
+        for beat in range(4):
+            events += [(45, 4.0 + beat * 0.5, 0.5), (60, 4.0 + beat * 0.5, 0.25), (64, 4.25 + beat * 0.5, 0.25)]
+        chart = chord_chart(make_notes(events), tempo_bpm=120)
+
+        self.assertEqual([s["chord"] for s in chart], ["C Major", "G Dominant 7th", "A Minor"])
+        self.assertEqual((chart[1]["root_idx"], chart[1]["chord_type_name"]), (7, "Dominant 7th"))
+        for segment, boundary in zip(chart, (0.0, 2.0, 4.0)):
+            self.assertAlmostEqual(segment["start"], boundary, delta=0.5)
+        self.assertEqual(chord_chart(make_notes([])), [])
+
+    def test_fur_elise(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            notes, meta = MidiIngestor().load_notes(str(FUR_ELISE))
+        chart = chord_chart(notes, meta["tempo_bpm"])
+        self.assertEqual([s["chord"] for s in chart[:3]], ["A Minor", "E Major", "A Minor"])
+        self.assertEqual(chart_chords(chart)[:2], ["A Minor", "E Major"])
+        self.assertTrue(all(a["end"] <= b["start"] for a, b in zip(chart, chart[1:])))
+
+    def test_chart_cached_with_parse(self):
+        cache_dir = Path(tempfile.mkdtemp())
+        try:
+            ingestor = MidiIngestor(cache_dir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                chart = ingestor.load_chord_chart(str(FUR_ELISE))
+                with patch("logic.services.midi_ingestor.chord_chart") as analyze:
+                    self.assertEqual(ingestor.load_chord_chart(str(FUR_ELISE)), chart)
+                    analyze.assert_not_called()
+            self.assertEqual(len(list(cache_dir.glob("*.chords-v*.json"))), 1)
+
+            # Evicting the parse drops its chart too
+            ingestor._cache.max_bytes = 0
+            ingestor._cache.evict()
+            self.assertEqual(list(cache_dir.iterdir()), [])
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
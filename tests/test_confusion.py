@@ -0,0 +1,98 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.confusion import NoteConfusion, expected_lookup
+from logic.services.midi_replay import ReplayHarness, NoteEvent
+
+class TestNoteConfusion(unittest.TestCase):
+    def test_wrong_note_is_charged_to_nearest_chord_tone(self):
+        lookup = expected_lookup({0, 3, 7})  # C Minor
+        self.assertEqual(lookup[4], 3)   # E stands in for Eb
+        self.assertEqual(lookup[8], 7)   # Ab stands in for G
+        self.assertEqual(lookup[7], 7)   # Chord tones map to themselves
+
+    def test_rows_are_non_zero_cells(self):
+        confusion = NoteConfusion()
+        confusion.record("C Minor", 3, 4)
+        confusion.record("C Minor", 3, 4)
+        confusion.record("C Minor", 0, 0)
+        self.assertEqual(sorted(confusion.rows()), [("C Minor", 0, 0, 1), ("C Minor", 3, 4, 2)])
+
+
+class TestConfusionFlush(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_session_confusions_reach_coach_context(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        intervals = trainer.CHORD_TYPES["Minor"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Minor", intervals, 4)
+        trainer.start_session()
+
+        events = []
+        t = self.clock.now()
+        for attempt in range(3):
+            t += 1.0
+            # C-E-G first (a major chord), then the corrected C-Eb-G
+            events += [NoteEvent(t, 60, True), NoteEvent(t, 64, True), NoteEvent(t, 67, True),
+                       NoteEvent(t + 0.3, 64, False), NoteEvent(t + 0.4, 63, True),
+                       NoteEvent(t + 0.9, 60, False), NoteEvent(t + 0.9, 63, False), NoteEvent(t + 0.9, 67, False)]
+        ReplayHarness(self.clock, trainer.handle_midi_note).play(events)
+
+        self.assertEqual(self.db.get_top_confusions(), [])  # Nothing written until the session ends
+        trainer.stop_session()
+
+        top = self.db.get_top_confusions()
+        self.assertEqual(len(top), 1)
+        self.assertEqual((top[0]["target"], top[0]["played"], top[0]["expected"], top[0]["count"]),
+                         ("C Minor", "E", "Eb", 3))
+        self.assertAlmostEqual(top[0]["rate"], 0.5)
+        self.assertIn("played E instead of Eb", self.db.get_coach_context())
+
+if __name__ == "__main__":
+    unittest.main()
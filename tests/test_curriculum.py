@@ -156,6 +156,30 @@ class TestCurriculumService(unittest.TestCase):
         self.assertEqual(ms1["status"], "completed")
         self.assertEqual(ms2["status"], "active")
 
+    def test_advancement_check_uses_in_memory_window(self):
+        """Per-attempt advancement checks are served from the rolling window, not the DB."""
+        self.db.get_curriculum_state = MagicMock(wraps=self.db.get_curriculum_state)
+        self.service.complete_exercise("C Major", success=True, track="technique", milestone_id="tech_1")
+        self.service.complete_exercise("C Major", success=True, track="technique", milestone_id="tech_2")
+        self.assertEqual(self.db.get_curriculum_state.call_count, 0)
+        window = self.db.attempt_windows.get("milestone", "technique/tech_1")
+        self.assertEqual((window.total, window.accuracy), (1, 1.0))
+
+    def test_skill_reset_reloads_milestone_status(self):
+        from logic.services.settings_service import SettingsService
+        settings = SettingsService(self.db, self.test_dir)
+        settings.curriculum = self.service
+        for success in (True, True):
+            self.service.complete_exercise("C Major", success=success, track="technique", milestone_id="tech_1")
+        self.assertEqual(self.service._milestone_status[("technique", "tech_1")], "completed")
+
+        settings.resetSkillMatrix()
+        self.assertEqual(self.service._milestone_status[("technique", "tech_1")], "active")
+        for success in (True, True):
+            self.service.complete_exercise("C Major", success=success, track="technique", milestone_id="tech_1")
+        state = {m["milestone_id"]: m["status"] for m in self.db.get_curriculum_state("technique")}
+        self.assertEqual(state, {"tech_1": "completed", "tech_2": "active"})
+
     def test_qml_properties(self):
         """Test QML-bound properties return expected data."""
         # Before planning, activeMilestones should be empty
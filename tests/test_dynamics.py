@@ -0,0 +1,94 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.dynamics import VelocityLog
+from logic.services.midi_replay import ReplayHarness, NoteEvent
+
+class TestVelocityLog(unittest.TestCase):
+    def test_step_metrics_use_last_strike_per_finger(self):
+        log = VelocityLog()
+        log.append(50, 127, 0.0)   # Previous step, outside the slice
+        start = len(log)
+        for pitch, velocity in ((60, 40), (64, 90), (67, 70), (60, 80)):  # C re-struck
+            log.append(pitch, velocity, 1.0)
+        metrics = log.step_metrics(start, [60, 64, 67])
+        self.assertEqual(metrics["velocities"], [80, 90, 70])
+        self.assertEqual(metrics["spread"], 20)
+        self.assertEqual((metrics["loudest_finger"], metrics["loudest_pitch"]), (2, 64))
+        self.assertEqual((metrics["softest_finger"], metrics["softest_pitch"]), (3, 67))
+        self.assertAlmostEqual(metrics["evenness"], 0.898, places=3)
+
+    def test_missing_finger_gives_no_metrics(self):
+        log = VelocityLog()
+        log.append(60, 80, 0.0)
+        self.assertIsNone(log.step_metrics(0, [60, 64]))
+
+
+class TestTrainerDynamics(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_chord_strike_dynamics_reach_session_summary(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+        t = self.clock.now() + 0.2
+        ReplayHarness(self.clock, trainer.handle_midi_note).play([
+            NoteEvent(t, 60, True, 100), NoteEvent(t + 0.01, 64, True, 60), NoteEvent(t + 0.02, 67, True, 80),
+        ])
+        self.clock.advance(1.0)
+
+        self.assertEqual(trainer.lastDynamics["velocities"], [100, 60, 80])
+        summary = trainer.sessionDynamics
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]["name"], "C Major")
+        self.assertEqual(summary[0]["spread"], 40)
+
+if __name__ == "__main__":
+    unittest.main()
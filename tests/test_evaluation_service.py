@@ -0,0 +1,140 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.evaluation_service import EvaluationService, NOTE_HIT, NOTE_MISS, NOTE_PENDING
+from logic.services.clock import VirtualClock
+
+
+class TestEvaluationNoteIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+        self.engine = EvaluationService(self.db, project_root, self.test_dir / "sequences.pack", clock=self.clock)
+        # 400 notes, listed out of order, two pitches alternating on each half beat
+        notes = [{"pitch": 60 + (i % 2) * 7, "start_beat": i * 0.5, "duration_beats": 0.5, "hand": "right"}
+                 for i in range(400)]
+        self.engine._sequences = [{"title": "Long", "tempo_bpm": 120, "notes": notes[::-1]}]
+        self.engine.startEvaluation(paused=True)
+        self.engine._is_running = True
+
+    def tearDown(self):
+        import gc
+        del self.engine, self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _note_at(self, beat: float) -> int:
+        return next(i for i, n in enumerate(self.engine._sequence_notes) if n["start_beat"] == beat)
+
+    def test_hit_found_within_window(self):
+        e = self.engine
+        e._current_beat = 100.25
+        e.handle_midi_note(60, True)    # Note at beat 100 (pitch 60)
+        e.handle_midi_note(67, True)    # Note at beat 100.5 (pitch 67)
+        e.handle_midi_note(72, True)    # Not in the sequence
+        self.assertEqual(e._note_states[self._note_at(100.0)], NOTE_HIT)
+        self.assertEqual(e._note_states[self._note_at(100.5)], NOTE_HIT)
+        self.assertEqual(e._note_states.count(NOTE_HIT), 2)
+        # A second press of the same pitch finds nothing else pending in the window
+        e.handle_midi_note(60, True)
+        self.assertEqual(e._note_states.count(NOTE_HIT), 2)
+
+    def test_cursor_retires_missed_notes(self):
+        e = self.engine
+        e._current_beat = 50.0
+        e._check_missed_notes()
+        # Beats 0 .. 49.5 are past their window; 50 is still playable
+        self.assertEqual(e._note_states.count(NOTE_MISS), 100)
+        self.assertEqual(e._note_states[self._note_at(49.5)], NOTE_MISS)
+        self.assertEqual(e._note_states[self._note_at(50.0)], NOTE_PENDING)
+
+        e.handle_midi_note(60, True)
+        e._current_beat = 51.0
+        e._check_missed_notes()
+        self.assertEqual(e._note_states[self._note_at(50.0)], NOTE_HIT)
+        self.assertEqual(e._note_states.count(NOTE_MISS), 101)
+        self.assertEqual(e.noteStates[self._note_at(50.0)], "hit")
+
+
+class TestPlayheadAnchors(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+        self.engine = EvaluationService(self.db, project_root, self.test_dir / "sequences.pack", clock=self.clock)
+        self.engine._sequences = [{"title": "Short", "tempo_bpm": 120, "notes": [
+            {"pitch": 60, "start_beat": b, "duration_beats": 1, "hand": "right"} for b in range(8)]}]
+        self.anchors = []
+        self.engine.playheadAnchored = MagicMock()
+        self.engine.playheadAnchored.emit.side_effect = lambda *args: self.anchors.append(args)
+
+    def tearDown(self):
+        import gc
+        del self.engine, self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_only_anchors_cross_to_the_view(self):
+        e = self.engine
+        e.startEvaluation()
+        self.clock.advance(1.0)     # 100 ticks, 2 beats at 120 BPM
+        e.togglePause()
+        self.clock.advance(5.0)
+        e.togglePause()
+        self.clock.advance(1.0)
+        # What the view computes from the resume anchor matches the engine's own beat
+        _, beat, anchor_time, beats_per_sec, _ = self.anchors[-1]
+        self.assertAlmostEqual(beat + (e.clockNow() - anchor_time) * beats_per_sec, e._current_beat, places=1)
+        e.seek(4.0)
+        self.clock.advance(10.0)    # Runs past the end of the sequence
+
+        self.assertEqual([a[0] for a in self.anchors], ["start", "pause", "resume", "seek", "stop"])
+        kind, beat, anchor_time, beats_per_sec, running = self.anchors[1]
+        self.assertAlmostEqual(beat, -2.0, places=1)
+        self.assertEqual(beats_per_sec, 2.0)
+        self.assertFalse(running)
+        self.assertTrue(self.anchors[2][4])
+        # The paused stretch did not move the playhead: resume picks up where pause left it
+        self.assertAlmostEqual(self.anchors[2][1], beat, places=6)
+        # Seeking past beats 0..3 resolves them as missed
+        self.assertGreaterEqual(e._note_states.count(NOTE_MISS), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
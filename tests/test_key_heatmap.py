@@ -0,0 +1,141 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import struct
+import zlib
+import numpy as np
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.key_heatmap import KeyHeatmap, HITS, MISSES, WRONG
+from logic.services.midi_replay import ReplayHarness, NoteEvent
+
+class TestKeyHeatmap(unittest.TestCase):
+    def test_blob_round_trip_is_small(self):
+        heatmap = KeyHeatmap()
+        for i in range(500):
+            heatmap.hit(48 + i % 36, 800.0 + i, 70)
+            if i % 7 == 0:
+                heatmap.wrong(95, 90)
+                heatmap.miss(60)
+        blob = heatmap.to_bytes()
+        self.assertLess(len(blob), 1024)
+        restored = KeyHeatmap.from_bytes(blob)
+        self.assertTrue((restored.data == heatmap.data).all())
+        self.assertAlmostEqual(restored.mean_velocity(95), 90.0)
+        rates = restored.error_rates()
+        self.assertEqual(len(rates), 128)
+        self.assertEqual(rates[100], -1)
+        self.assertEqual(rates[95], 1.0)
+        self.assertEqual(rates[60], 0.837)  # 14 hits, 72 misses
+
+    def test_sums_keep_precision(self):
+        heatmap = KeyHeatmap()
+        for _ in range(50000):
+            heatmap.hit(60, 1234.5, 77)
+        restored = KeyHeatmap.from_bytes(heatmap.to_bytes())
+        self.assertEqual(restored.mean_latency_ms(60), 1234.5)
+        self.assertEqual(restored.mean_velocity(60), 77.0)
+
+    def test_reads_float32_blobs(self):
+        data = np.zeros((128, 6), dtype=np.float32)
+        data[60, HITS], data[60, MISSES] = 3, 1
+        blob = struct.pack("<BHH", 1, 128, 6) + zlib.compress(data.tobytes())
+        self.assertEqual(KeyHeatmap.from_bytes(blob).error_rates()[60], 0.25)
+
+
+class TestHeatmapPersistence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_daily_blobs_are_summed(self):
+        day_one, day_two = KeyHeatmap(), KeyHeatmap()
+        day_one.hit(60, 1000.0)
+        day_two.hit(60, 500.0)
+        day_two.miss(64)
+        self.db.merge_key_heatmap(day_one)
+        self.db.merge_key_heatmap(day_one)  # Same day merges into one blob
+        self.db.merge_key_heatmap(day_two, day="2000-01-01")  # Outside the window
+        heatmap = self.db.get_key_heatmap(days=30)
+        self.assertEqual(heatmap.data[60, HITS], 2)
+        self.assertEqual(heatmap.data[64, MISSES], 0)
+
+    def test_trainer_updates_per_note_and_flushes(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+        t = self.clock.now() + 1.0
+        ReplayHarness(self.clock, trainer.handle_midi_note).play([
+            NoteEvent(t, 60, True, 80), NoteEvent(t, 63, True, 80), NoteEvent(t, 67, True, 80),   # Eb for E: fails
+            NoteEvent(t + 0.2, 63, False), NoteEvent(t + 0.3, 64, True, 80),
+        ])
+        data = trainer._session_heatmap.data
+        self.assertEqual((data[63, WRONG], data[64, MISSES], data[64, HITS], data[60, HITS]), (1, 1, 1, 1))
+        self.assertAlmostEqual(trainer._session_heatmap.mean_latency_ms(64), 1300.0, places=1)
+
+        trainer.stop_session()
+        self.assertFalse(trainer._session_heatmap)
+        self.assertEqual(self.db.get_key_heatmap().data[63, WRONG], 1)
+        self.assertEqual(trainer.keyHeatmap[63], 1.0)
+
+    def test_new_lesson_plan_flushes_the_previous_session(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        trainer._query_gemini_for_lesson_plan = lambda *args: None
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+        t = self.clock.now() + 1.0
+        ReplayHarness(self.clock, trainer.handle_midi_note).play([
+            NoteEvent(t, 60, True, 80), NoteEvent(t, 64, True, 80), NoteEvent(t, 67, True, 80)])
+        self.assertTrue(trainer._session_stats)
+
+        trainer.start_lesson_plan()
+        self.assertFalse(trainer._session_stats)
+        self.assertFalse(trainer._session_heatmap)
+        self.assertEqual(self.db.get_key_heatmap().data[64, HITS], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import random
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.latency_sketch import LatencySketch
+from logic.services.database_manager import DatabaseManager
+
+class TestLatencySketch(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        """p50/p90 stay within the sketch's relative error of the exact values."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(7.0, 0.6) for _ in range(20000)]
+        sketch = LatencySketch()
+        for v in values:
+            sketch.add(v)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), exact, delta=exact * 0.03)
+        self.assertEqual(sketch.count, len(values))
+
+    def test_memory_is_bounded(self):
+        """Bucket count depends on the value range, not the number of samples."""
+        sketch = LatencySketch()
+        for i in range(100000):
+            sketch.add(200 + (i % 5000))
+        self.assertLess(len(sketch._bins), 150)
+
+    def test_merge_matches_single_sketch(self):
+        """Merging two halves gives the same answer as sketching everything at once."""
+        whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+        for i in range(1, 1001):
+            whole.add(i * 3.0)
+            (first if i % 2 else second).add(i * 3.0)
+        first.merge(second)
+        self.assertEqual(first.count, whole.count)
+        self.assertEqual(first.p50, whole.p50)
+        self.assertEqual(first.p90, whole.p90)
+
+    def test_serialization_round_trip(self):
+        sketch = LatencySketch()
+        for v in (120.0, 340.0, 560.0, 4000.0):
+            sketch.add(v)
+        data = sketch.to_bytes()
+        restored = LatencySketch.from_bytes(data)
+        self.assertLess(len(data), 100)
+        self.assertEqual(restored.count, 4)
+        self.assertEqual(restored.p90, sketch.p90)
+        self.assertEqual(restored.min, 120.0)
+        self.assertEqual(LatencySketch.from_bytes(None).count, 0)
+
+
+class TestLatencySketchPersistence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_sessions_merge_in_db(self):
+        """Sketches from separate sessions accumulate in the chords table."""
+        self.db.record_chord_attempt("C Major", True, 500)
+        for session_values in ([400.0, 500.0, 600.0], [700.0, 800.0]):
+            sketch = LatencySketch()
+            for v in session_values:
+                sketch.add(v)
+            self.db.merge_latency_sketches({"C Major": sketch})
+
+        stored = self.db.get_latency_sketches()["C Major"]
+        self.assertEqual(stored.count, 5)
+        self.assertAlmostEqual(stored.p50, 600.0, delta=600.0 * 0.03)
+
+        stats = self.db.get_all_chord_stats()
+        self.assertNotIn("latency_sketch", stats[0])
+        self.assertAlmostEqual(stats[0]["p90_latency_ms"], stored.p90)
+        self.assertIn("Slowest Chords", self.db.get_coach_context())
+
+if __name__ == "__main__":
+    unittest.main()
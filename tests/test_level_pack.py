@@ -0,0 +1,100 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import json
+import os
+from logic.services.level_pack import LevelPack, compile_levels, load_level_pack
+from logic.services.evaluation_service import EvaluationService
+
+
+class TestLevelPack(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.source = project_root / "src" / "resources" / "sequences.json"
+        with open(self.source, "r", encoding="utf-8") as f:
+            self.levels = json.load(f)
+
+    def tearDown(self):
+        import gc
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_pack_decodes_to_the_json_levels(self):
+        pack = LevelPack(compile_levels(self.levels))
+        self.assertEqual(len(pack), len(self.levels))
+        for i, level in enumerate(self.levels):
+            self.assertEqual(pack[i], level)
+        self.assertEqual(pack[-1]["title"], self.levels[-1]["title"])
+        with self.assertRaises(IndexError):
+            pack[len(self.levels)]
+
+    def test_stale_pack_is_rebuilt(self):
+        source = self.test_dir / "sequences.json"
+        pack_path = self.test_dir / "cache" / "sequences.pack"
+        source.write_text(json.dumps(self.levels[:2]), encoding="utf-8")
+
+        pack = load_level_pack(source, pack_path)
+        self.assertIsInstance(pack, LevelPack)
+        self.assertEqual(len(pack), 2)
+        self.assertLess(pack_path.stat().st_size, len(source.read_bytes()))
+        pack.close()
+
+        # Unchanged source: the existing pack is reused as is
+        built_at = pack_path.stat().st_mtime_ns
+        load_level_pack(source, pack_path).close()
+        self.assertEqual(pack_path.stat().st_mtime_ns, built_at)
+
+        edited = self.levels[:3]
+        edited[0]["title"] = "Edited"
+        source.write_text(json.dumps(edited), encoding="utf-8")
+        os.utime(source, ns=(built_at + 10**9, built_at + 10**9))
+        pack = load_level_pack(source, pack_path)
+        self.assertEqual(len(pack), 3)
+        self.assertEqual(pack[0]["title"], "Edited")
+        pack.close()
+
+    def test_evaluation_service_opens_pack_lazily(self):
+        engine = EvaluationService(MagicMock(), project_root, self.test_dir / "sequences.pack")
+        self.assertIsNone(engine._levels)
+        self.assertFalse(engine._pack_path.exists())
+        engine.startEvaluation(paused=True)
+        self.assertTrue(engine._pack_path.exists())
+        self.assertEqual(engine._sequence_notes, self.levels[engine._current_level - 1]["notes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import mido
+import os
+import numpy as np
+import pretty_midi
+import time
+from unittest.mock import patch
+from logic.services.midi_ingestor import MidiIngestor, read_note_array, notes_to_blocks, PITCH_CLASS_COLORS
+from logic.services.midi_cache import MidiParseCache
+
+
+class TestArrayIngestion(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_tempo_map_running_status_and_overlaps(self):
+        mid = mido.MidiFile(type=1, ticks_per_beat=100)
+        conductor = mido.MidiTrack([
+            mido.MetaMessage("set_tempo", tempo=500000, time=0),     # 120 BPM
+            mido.MetaMessage("set_tempo", tempo=1000000, time=200),  # 60 BPM from beat 2
+        ])
+        drums = mido.MidiTrack([
+            mido.Message("note_on", channel=9, note=36, velocity=100, time=0),
+            mido.Message("note_off", channel=9, note=36, time=50),
+        ] * 50)
+        piano = mido.MidiTrack([
+            mido.MetaMessage("track_name", name="Piano", time=0),
+            mido.Message("note_on", note=60, velocity=90, time=100),
+            mido.Message("note_on", note=60, velocity=70, time=50),   # Same key again before release
+            mido.Message("note_on", note=60, velocity=0, time=50),    # Closes the first one
+            mido.Message("note_off", note=60, time=100),              # Closes the second one
+            mido.Message("note_on", note=64, velocity=80, time=0),
+        ])
+        mid.tracks.extend([conductor, drums, piano])
+        path = self.test_dir / "t.mid"
+        mid.save(str(path))  # mido writes running status for consecutive note_on messages
+
+        notes, instruments, timing = read_note_array(str(path))
+        self.assertAlmostEqual(timing["tempo_bpm"], 120.0)
+        self.assertEqual(timing["tempo_changes"], [[0.0, 120.0], [1.0, 60.0]])
+        self.assertEqual(timing["time_signature"], [4, 4])
+        self.assertEqual(len(instruments), 2)  # The conductor track has no notes
+        self.assertTrue(instruments[0]["is_drum"])
+        self.assertEqual(instruments[1]["name"], "Piano")
+        self.assertEqual(instruments[1]["note_count"], 2)  # The unreleased E is dropped
+
+        selected, metadata = MidiIngestor().load_notes(str(path))
+        self.assertEqual(metadata["selected_track"], "Piano")
+        self.assertEqual(selected["velocity"].tolist(), [90, 70])
+        # Tick 100 = 0.5s; tick 150 = 0.75s; tick 200 = 1.0s; tick 300 = 1.0s + 1 beat at 60 BPM
+        np.testing.assert_allclose(selected["start"], [0.5, 0.75])
+        np.testing.assert_allclose(selected["duration"], [0.5, 1.25])
+
+    def test_type0_file_is_split_by_channel_and_program(self):
+        mid = mido.MidiFile(type=0, ticks_per_beat=100)
+        track = mido.MidiTrack([
+            mido.MetaMessage("track_name", name="Band", time=0),
+            mido.Message("program_change", channel=1, program=48, time=0),  # Strings
+        ])
+        for i in range(8):
+            track += [
+                mido.Message("note_on", channel=0, note=60 + i, velocity=90, time=0),
+                mido.Message("note_on", channel=1, note=48 + i, velocity=60, time=0),
+                mido.Message("note_on", channel=1, note=55 + i, velocity=60, time=0),
+                mido.Message("note_on", channel=9, note=36, velocity=100, time=0),
+                mido.Message("note_off", channel=9, note=36, time=25),
+                mido.Message("note_off", channel=0, note=60 + i, time=25),
+                mido.Message("note_off", channel=1, note=48 + i, time=0),
+                mido.Message("note_off", channel=1, note=55 + i, time=0),
+            ]
+        mid.tracks.append(track)
+        path = self.test_dir / "band.mid"
+        mid.save(str(path))
+
+        _, instruments, _ = read_note_array(str(path))
+        got = sorted((t["channel"], t["program"], t["is_drum"], t["note_count"]) for t in instruments)
+        self.assertEqual(got, [(0, 0, False, 8), (1, 48, False, 16), (9, 0, True, 8)])
+
+        selected, metadata = MidiIngestor().load_notes(str(path))
+        self.assertEqual(selected["pitch"].tolist(), list(range(60, 68)))
+        self.assertEqual(metadata["selected_track"], "Band")
+        # The same notes pretty_midi picks for the piano
+        pm = pretty_midi.PrettyMIDI(str(path))
+        piano = next(inst for inst in pm.instruments if not inst.is_drum and inst.program == 0)
+        self.assertEqual(sorted(n.pitch for n in piano.notes), selected["pitch"].tolist())
+
+    def test_matches_pretty_midi(self):
+        path = project_root / "database" / "repertoire" / "Fur_Elise.mid"
+        notes, _ = MidiIngestor().load_notes(str(path))
+        pm = pretty_midi.PrettyMIDI(str(path))
+        expected = sorted((n.start, n.pitch, n.end - n.start) for n in pm.instruments[0].notes)
+        got = sorted(zip(notes["start"].tolist(), notes["pitch"].tolist(), notes["duration"].tolist()))
+        self.assertEqual(len(got), len(expected))
+        np.testing.assert_allclose(np.array(got), np.array(expected), atol=1e-5)
+        self.assertTrue(np.all(np.diff(notes["start"]) >= 0))
+
+    def test_blocks_color_by_pitch_class(self):
+        notes, _ = MidiIngestor().load_notes(str(project_root / "database" / "repertoire" / "Fur_Elise.mid"))
+        blocks = notes_to_blocks(notes[:20])
+        self.assertEqual(len(blocks), 20)
+        for block in blocks:
+            self.assertEqual(block["color"], PITCH_CLASS_COLORS[block["pitch"] % 12])
+            self.assertGreaterEqual(block["duration"], 0.05)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = self.test_dir / "cache"
+        self.midi = self.test_dir / "Fur_Elise.mid"
+        self.midi.write_bytes((project_root / "database" / "repertoire" / "Fur_Elise.mid").read_bytes())
+
+    def tearDown(self):
+        import gc
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_hit_is_memory_mapped_and_skips_parsing(self):
+        notes, metadata = MidiIngestor(self.cache_dir).load_notes(str(self.midi))
+        self.assertEqual(len(list(self.cache_dir.glob("*.npy"))), 1)
+
+        with patch("logic.services.midi_ingestor.read_note_array", side_effect=AssertionError("parsed again")):
+            start = time.perf_counter()
+            cached, cached_meta = MidiIngestor(self.cache_dir).load_notes(str(self.midi))
+            elapsed = time.perf_counter() - start
+        print(f"\nParse cache hit: {len(cached)} notes in {elapsed * 1000:.2f}ms")
+        self.assertIsInstance(cached, np.memmap)
+        self.assertEqual(cached_meta, metadata)
+        np.testing.assert_array_equal(cached, notes)
+        del cached
+
+    def test_changed_contents_miss(self):
+        ingestor = MidiIngestor(self.cache_dir)
+        ingestor.load_notes(str(self.midi))
+        mid = mido.MidiFile(str(self.midi))
+        mid.tracks[0].insert(0, mido.MetaMessage("text", text="edited", time=0))
+        mid.save(str(self.midi))
+        ingestor.load_notes(str(self.midi))
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = MidiParseCache(self.cache_dir, version=1)
+        notes = np.zeros(40, dtype=[("pitch", "u1"), ("start", "f8")])  # ~500 bytes per entry
+        for i, key in enumerate(["a", "b", "c", "d"]):
+            cache.put(key, notes, {"n": i})
+            # Entries need distinct timestamps for the recency order
+            stamp = time.time() - 100 + i
+            for path in self.cache_dir.glob(f"{key}.*"):
+                os.utime(path, (stamp, stamp))
+        self.assertIsNotNone(cache.get("a"))  # Now the most recently used
+        cache.max_bytes = 1600  # Room for three entries
+        cache.put("e", notes, {"n": 4})
+        keys = sorted(p.stem for p in self.cache_dir.glob("*.json"))
+        self.assertEqual(keys, ["a", "d", "e"])
+        total = sum(p.stat().st_size for p in self.cache_dir.iterdir())
+        self.assertLessEqual(total, 1600)
+
+
+if __name__ == "__main__":
+    unittest.main()
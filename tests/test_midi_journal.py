@@ -0,0 +1,108 @@
+import unittest
+import shutil
+import tempfile
+import time
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.midi_journal import MidiJournalWriter, MidiJournalReader, JournalPlayback, HEADER, RECORD
+from logic.services.midi_replay import NoteEvent, PedalEvent
+from logic.services.clock import VirtualClock
+
+class TestMidiJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.writer = MidiJournalWriter(self.test_dir)
+        self.path = self.writer.start()
+
+    def tearDown(self):
+        self.writer.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Messages come back with their timestamps and decode into note/pedal events."""
+        stream = [
+            (0.000, [0x90, 60, 90]),
+            (0.012, [0x90, 64, 80]),
+            (0.020, [0xB0, 64, 127]),
+            (0.500, [0x90, 60, 0]),   # Note-on with zero velocity is a release
+            (0.510, [0x80, 64, 40]),
+            (0.700, [0xB0, 64, 0]),
+            (0.800, [0xFE]),          # Active sensing is journaled but not a note
+        ]
+        for hw_time, msg in stream:
+            self.writer.append(hw_time, msg)
+        self.writer.close()
+
+        self.assertEqual(self.path.stat().st_size, HEADER.size + len(stream) * RECORD.size)
+        with MidiJournalReader(self.path) as reader:
+            self.assertEqual(len(reader), len(stream))
+            self.assertEqual(reader[1], (0.012, 0x90, 64, 80, 3))
+            self.assertEqual(reader[-1], (0.8, 0xFE, 0, 0, 1))
+            events = reader.note_events()
+
+        self.assertEqual(events, [
+            NoteEvent(0.0, 60, True, 90), NoteEvent(0.012, 64, True, 80), PedalEvent(0.02, True),
+            NoteEvent(0.5, 60, False), NoteEvent(0.51, 64, False), PedalEvent(0.7, False),
+        ])
+
+    def test_append_is_cheap(self):
+        """Recording must not stall the RtMidi callback thread."""
+        n = 20000
+        start = time.perf_counter()
+        for i in range(n):
+            self.writer.append(i * 0.001, [0x90, 60 + i % 12, 100])
+        per_event_us = (time.perf_counter() - start) / n * 1e6
+        self.writer.close()
+        self.assertLess(per_event_us, 20.0)
+        with MidiJournalReader(self.path) as reader:
+            self.assertEqual(len(reader), n)
+
+    def test_playback_keeps_original_timing(self):
+        for hw_time, msg in ((1.0, [0x90, 60, 90]), (1.25, [0x80, 60, 0]), (2.0, [0x90, 62, 90])):
+            self.writer.append(hw_time, msg)
+        self.writer.close()
+        with MidiJournalReader(self.path) as reader:
+            events = reader.note_events()
+
+        clock = VirtualClock()
+        delivered = []
+        playback = JournalPlayback(events, lambda p, on, v, t: delivered.append((round(clock.now(), 3), p, on)), clock=clock)
+        playback.start()
+        clock.advance(5.0)
+        self.assertTrue(playback.finished)
+        self.assertEqual(delivered, [(0.0, 60, True), (0.25, 60, False), (1.0, 62, True)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.evaluation_service import EvaluationService
+from logic.services.clock import VirtualClock
+from logic.services.midi_replay import LessonReplay, EvaluationReplay, build_synthetic_lesson
+
+class TestVirtualClock(unittest.TestCase):
+    def test_timers_fire_in_order(self):
+        clock = VirtualClock()
+        fired = []
+        timer = clock.create_timer()
+        timer.timeout.connect(lambda: fired.append(("tick", round(clock.now(), 3))))
+        timer.start(100)
+        clock.single_shot(250, lambda: fired.append(("shot", round(clock.now(), 3))))
+        clock.advance(0.35)
+        timer.stop()
+        clock.advance(1.0)
+        self.assertEqual(fired, [("tick", 0.1), ("tick", 0.2), ("shot", 0.25), ("tick", 0.3)])
+
+
+class TestMidiReplay(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.pack_path = self.test_dir / "sequences.pack"
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_full_lesson_replay(self):
+        """A 120-step lesson covering every exercise type completes deterministically."""
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        report = LessonReplay(trainer, self.clock).run(build_synthetic_lesson(120))
+        print(f"\nLesson replay: {report.summary()}")
+
+        self.assertTrue(trainer._is_lesson_complete)
+        self.assertEqual(report.steps_completed, 120)
+        self.assertGreater(report.events, 500)
+        # Simulated time is minutes; the replay itself must not wait on real timers
+        self.assertGreater(report.virtual_seconds, 60)
+        self.assertLess(report.wall_seconds, report.virtual_seconds / 10)
+
+        stats = {row["name"]: row for row in self.db.get_all_chord_stats()}
+        self.assertEqual(sum(row["fail_count"] for row in stats.values()), 0)
+
+    def test_evaluation_replay_stops_at_skill_level(self):
+        engine = EvaluationService(self.db, project_root, self.pack_path, clock=self.clock, placement="linear")
+        replay = EvaluationReplay(engine, self.clock, skill_level=3)
+        report = replay.run()
+        print(f"\nEvaluation replay: {report.summary()}")
+
+        self.assertFalse(engine._is_running)
+        self.assertEqual(engine._assessed_level, 3)
+        self.assertEqual(replay.levels_played, 4)
+
+    def test_adaptive_placement_matches_linear_in_fewer_sequences(self):
+        totals = {"linear": 0, "adaptive": 0}
+        print("\nPlacement  skill  assessed  sequences  virtual s  wall ms")
+        n_levels = len(EvaluationService(self.db, project_root, self.pack_path, clock=self.clock)._sequences)
+        for skill in range(n_levels + 1):
+            assessed = {}
+            for placement in ("linear", "adaptive"):
+                clock = VirtualClock()
+                engine = EvaluationService(self.db, project_root, self.pack_path, clock=clock, placement=placement)
+                replay = EvaluationReplay(engine, clock, skill_level=skill)
+                report = replay.run()
+                assessed[placement] = engine._assessed_level
+                totals[placement] += replay.levels_played
+                print(f"{placement:>9}  {skill:>5}  {engine._assessed_level:>8}  {replay.levels_played:>9}  "
+                      f"{report.virtual_seconds:>9.1f}  {report.wall_seconds * 1000:>7.1f}")
+                # Never more than a binary search plus the confirming neighbour
+                if placement == "adaptive":
+                    self.assertLessEqual(replay.levels_played, n_levels.bit_length() + 1)
+            self.assertEqual(assessed["adaptive"], skill)
+            self.assertEqual(assessed["linear"], skill)
+        print(f"Total sequences: {totals}")
+        self.assertLess(totals["adaptive"], totals["linear"])
+
+if __name__ == "__main__":
+    unittest.main()
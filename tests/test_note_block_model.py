@@ -0,0 +1,122 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import numpy as np
+from logic.services.note_block_model import BlockWindow
+
+
+class RecordingListener:
+    """Checks the rows a view would see around each change, like QAbstractItemModelTester."""
+
+    def __init__(self, window: BlockWindow):
+        self.window = window
+        self.changes = []
+
+    def begin_remove(self, first, last):
+        self.pending = ("remove", first, last, list(self.window.rows))
+
+    def end_remove(self):
+        kind, first, last, before = self.pending
+        assert self.window.rows == before[:first] + before[last + 1:]
+        self.changes.append((kind, first, last))
+
+    def begin_insert(self, first, last):
+        self.pending = ("insert", first, last, list(self.window.rows))
+
+    def end_insert(self):
+        kind, first, last, before = self.pending
+        assert self.window.rows[:first] + self.window.rows[last + 1:] == before
+        self.changes.append((kind, first, last))
+
+
+class TestBlockWindow(unittest.TestCase):
+    def setUp(self):
+        # A long held note plus a run of short ones, one every half second
+        starts = np.array([0.0, 0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+        durations = np.array([10.0, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.01])
+        self.window = BlockWindow(min_duration=0.05)
+        self.window.set_notes(starts, durations)
+        self.listener = RecordingListener(self.window)
+
+    def brute_force(self, t0, t1):
+        w = self.window
+        return [i for i in range(len(w.starts)) if w.starts[i] < t1 and w.ends[i] > t0]
+
+    def test_query_matches_scan(self):
+        for t0 in np.arange(0.0, 12.0, 0.1):
+            for width in (0.05, 0.5, 2.0):
+                self.assertEqual(self.window.query(t0, t0 + width).tolist(), self.brute_force(t0, t0 + width))
+        # Notes shorter than min_duration still get a block
+        self.assertEqual(self.window.query(3.54, 4.0).tolist(), [0, 8])
+
+    def test_scrolling_emits_row_changes(self):
+        self.window.move(0.0, 1.0, self.listener)
+        self.assertEqual(self.window.rows, [0, 1, 2])
+        self.assertEqual(self.listener.changes, [("insert", 0, 2)])
+
+        # Scrolling forward: notes leaving at the top are removed, new ones appended; the held note stays
+        self.listener.changes.clear()
+        self.window.move(1.2, 2.2, self.listener)
+        self.assertEqual(self.window.rows, [0, 3, 4, 5])
+        self.assertEqual(self.listener.changes, [("remove", 1, 2), ("insert", 1, 3)])
+
+        # Jumping away replaces everything but the held note; removals run bottom up
+        self.listener.changes.clear()
+        self.window.move(0.2, 0.3, self.listener)
+        self.assertEqual(self.window.rows, [0, 1])
+        self.assertEqual(self.listener.changes, [("remove", 1, 3), ("insert", 1, 1)])
+
+        # Past the end of the song
+        self.window.move(20.0, 25.0, self.listener)
+        self.assertEqual(self.window.rows, [])
+
+    def test_random_windows(self):
+        rng = np.random.default_rng(7)
+        starts = np.sort(rng.uniform(0, 300, 5000))
+        self.window.set_notes(starts, rng.exponential(0.5, 5000))
+        for t0 in rng.uniform(-5, 305, 200):
+            self.window.move(t0, t0 + 6.0, self.listener)
+            self.assertEqual(self.window.rows, self.brute_force(t0, t0 + 6.0))
+
+    def test_new_song_keeps_window(self):
+        self.window.move(0.0, 1.0)
+        self.window.set_notes(np.array([0.5, 5.0]), np.array([1.0, 1.0]))
+        self.assertEqual(self.window.rows, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.onset_grouper import ChordOnsetGrouper
+from logic.services.midi_replay import LessonReplay, ReplayHarness, NoteEvent, build_synthetic_lesson
+
+class TestChordOnsetGrouper(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.strikes = []
+        self.releases = []
+        self.grouper = ChordOnsetGrouper(lambda p, t, v: self.strikes.append((p, t)),
+                                         self.releases.append, window_ms=30, clock=self.clock)
+
+    def test_notes_within_window_become_one_strike(self):
+        self.grouper.note_on(60, 1.000)
+        self.grouper.note_on(64, 1.008)
+        self.grouper.note_on(67, 1.021)
+        self.assertEqual(self.strikes, [])
+        # Nothing else arrives; the window timer delivers the strike
+        self.clock.advance(0.05)
+        self.assertEqual(self.strikes, [([60, 64, 67], [1.000, 1.008, 1.021])])
+
+    def test_late_note_starts_a_new_strike(self):
+        self.grouper.note_on(60, 1.000)
+        self.grouper.note_on(64, 1.045)
+        self.assertEqual(self.strikes, [([60], [1.000])])
+        self.clock.advance(0.05)
+        self.assertEqual(self.strikes[-1], ([64], [1.045]))
+
+    def test_release_flushes_pending_strike_first(self):
+        self.grouper.note_on(60, 1.000)
+        self.grouper.note_off(60, 1.010)
+        self.assertEqual(self.strikes, [([60], [1.000])])
+        self.assertEqual(self.releases, [60])
+        # The already-flushed window must not deliver again
+        self.clock.advance(0.05)
+        self.assertEqual(len(self.strikes), 1)
+
+
+class TestChordStrikeEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _fixed_target_trainer(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+        self.db.record_chord_attempt = MagicMock(wraps=self.db.record_chord_attempt)
+        return trainer
+
+    def _brushed_strike(self, trainer):
+        """C major struck with F brushed on the way, so E-F-G arrive before C."""
+        start = self.clock.now() + 0.1
+        return [NoteEvent(start, 64, True), NoteEvent(start + 0.004, 65, True),
+                NoteEvent(start + 0.008, 67, True), NoteEvent(start + 0.015, 60, True),
+                NoteEvent(start + 0.060, 65, False)]
+
+    def test_per_note_evaluation_records_false_failure(self):
+        trainer = self._fixed_target_trainer()
+        ReplayHarness(self.clock, trainer.handle_midi_note).play(self._brushed_strike(trainer))
+        failures = [c for c in trainer.db.record_chord_attempt.call_args_list if c.args[1] is False]
+        self.assertEqual(len(failures), 1)
+
+    def test_coalesced_strike_is_evaluated_once(self):
+        trainer = self._fixed_target_trainer()
+        grouper = ChordOnsetGrouper(trainer.handle_chord_strike,
+                                    lambda pitch: trainer.handle_midi_note(pitch, False),
+                                    window_ms=30, clock=self.clock)
+        check = MagicMock(wraps=trainer._check_chord)
+        trainer._check_chord = check
+
+        def dispatch(pitch, is_on, velocity):
+            (grouper.note_on if is_on else grouper.note_off)(pitch, self.clock.now())
+
+        ReplayHarness(self.clock, dispatch).play(self._brushed_strike(trainer))
+        self.clock.advance(0.6)  # Hold the corrected chord
+
+        failures = [c for c in trainer.db.record_chord_attempt.call_args_list if c.args[1] is False]
+        self.assertEqual(failures, [])
+        # One check for the four-note strike, one when the brushed key lifts
+        self.assertEqual(check.call_count, 2)
+        # Onsets come from the strike's own timestamps, not the (later) delivery time
+        success = trainer.db.record_chord_attempt.call_args
+        self.assertTrue(success.args[1])
+        self.assertTrue(success.args[4])  # Simultaneous
+        self.assertAlmostEqual(trainer._strike._committed.onset_spread_ms, 15.0, places=3)
+
+    def test_lesson_replay_through_grouper(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        report = LessonReplay(trainer, self.clock, onset_window_ms=30).run(build_synthetic_lesson(36))
+        self.assertTrue(trainer._is_lesson_complete)
+        self.assertEqual(report.steps_completed, 36)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import time
+import mido
+import numpy as np
+from logic.services.clock import VirtualClock
+from logic.services.midi_ingestor import NOTE_DTYPE, MidiIngestor
+from logic.services.play_along import PlayAlongScorer, PlayAlongService, measure_grid
+from logic.services.evaluation_service import NOTE_MISS
+
+
+def make_notes(events):
+    """(pitch, start, duration) triples -> time-sorted NOTE_DTYPE array."""
+    notes = np.zeros(len(events), dtype=NOTE_DTYPE)
+    for i, (pitch, start, duration) in enumerate(events):
+        notes[i] = (pitch, start, duration, 80, 0, 0)
+    return notes[np.argsort(notes["start"], kind="stable")]
+
+
+def dense_song(seconds: float, chords_per_second: int = 25):
+    """Four-note chords, cycling through pitches so repeats are close together."""
+    events = []
+    for k in range(int(seconds * chords_per_second)):
+        t = k / chords_per_second
+        events += [(48 + (k + j * 5) % 36, t, 0.03) for j in range(4)]
+    return make_notes(events)
+
+
+class TestPlayAlongScorer(unittest.TestCase):
+    def setUp(self):
+        # 4/4 at 120 BPM: two-second measures
+        self.notes = make_notes([
+            (60, 0.0, 1.0), (64, 0.0, 1.0), (67, 0.0, 1.0),   # C major chord, two beats
+            (62, 1.0, 0.25), (62, 1.25, 0.25),                  # Repeated D
+            (65, 2.0, 2.0),                                     # Whole note in measure 2
+        ])
+        self.scorer = PlayAlongScorer(self.notes, measure_grid(4.0, [[0.0, 120.0]]))
+
+    def test_chords_repeats_and_measures(self):
+        s = self.scorer
+        # Chord rolled slightly, one key 100 ms late
+        self.assertGreaterEqual(s.note_on(64, 0.0), 0)
+        self.assertGreaterEqual(s.note_on(60, 0.01), 0)
+        self.assertGreaterEqual(s.note_on(67, 0.10), 0)
+        self.assertEqual(s.note_on(61, 0.5), -1)   # Wrong note
+        for pitch in (60, 64, 67):
+            s.note_off(pitch, 0.9)
+        # Both repeated Ds, in order
+        self.assertEqual(self.notes["start"][s.note_on(62, 1.02)], 1.0)
+        self.assertEqual(self.notes["start"][s.note_on(62, 1.24)], 1.25)
+        self.assertEqual(s.advance(1.9), [])
+
+        # Measure 1 is final once its end is a hit window behind
+        finished = s.advance(2.0 + s.HIT_WINDOW)
+        self.assertEqual([m for m, _ in finished], [0])
+        credit = 5 - 0.5 * (0.01 + 0.10 + 0.02 + 0.01) / s.HIT_WINDOW
+        self.assertAlmostEqual(finished[0][1], round(credit / (5 + s.EXTRA_WEIGHT), 3))
+
+        # Whole note released after a quarter of its length: half credit
+        s.note_on(65, 2.0)
+        s.note_off(65, 2.5)
+        self.assertEqual(s.advance(10.0), [(1, 0.5)])
+        self.assertEqual(s.summary()["early_releases"], 1)
+        self.assertEqual(s.summary()["misses"], 0)
+
+    def test_misses_and_late_notes(self):
+        s = self.scorer
+        # Too late for the chord: counts as a wrong note, and the chord is missed
+        self.assertEqual(s.note_on(60, 0.3), -1)
+        s.advance(4.5)
+        self.assertEqual(bytes(s.states[:3]), bytes([NOTE_MISS] * 3))
+        self.assertEqual((s.hits, s.misses, s.extra_notes), (0, 6, 1))
+        self.assertEqual(s.accuracy(), 0.0)
+        self.assertEqual(s.progress, 1.0)
+
+    def test_dense_passage_constant_cost(self):
+        def play(notes):
+            scorer = PlayAlongScorer(notes, measure_grid(float(notes["start"][-1]) + 1, [[0.0, 120.0]]))
+            pitches, starts = notes["pitch"].tolist(), notes["start"].tolist()
+            begin = time.perf_counter()
+            for k, (pitch, t) in enumerate(zip(pitches, starts)):
+                scorer.note_on(pitch, t + 0.01)
+                if k % 16 == 0:
+                    scorer.advance(t)
+            elapsed = time.perf_counter() - begin
+            scorer.advance(float("inf"))
+            return scorer, elapsed / len(pitches)
+
+        short, short_cost = play(dense_song(10))   # 100 notes a second
+        long, long_cost = play(dense_song(200))
+        self.assertEqual(long.summary()["hits"], 20000)
+        self.assertEqual(long.summary()["misses"], 0)
+        self.assertLess(long_cost, 20e-6)
+        self.assertLess(long_cost, 3 * short_cost + 2e-6)
+
+
+class TestPlayAlongService(unittest.TestCase):
+    def test_play_records_mastery(self):
+        clock = VirtualClock()
+        db = MagicMock()
+        notes = make_notes([(60 + i % 5, i * 0.5, 0.4) for i in range(16)])
+        ingestor = MagicMock(load_notes=MagicMock(return_value=(notes, {"duration": 8.0, "tempo_bpm": 120.0})))
+        service = PlayAlongService(db, ingestor, clock=clock)
+
+        service.start("/songs/Etude.mid", "Etude")
+        self.assertTrue(service.isRunning)
+        # The timer ticks as the clock advances; the first two measures are played, held to the end
+        for i, (pitch, start) in enumerate(zip(notes["pitch"].tolist(), notes["start"].tolist())):
+            clock.advance_to(service.LEAD_IN_SECONDS + start)
+            if i < 8:
+                service.handle_midi_note(pitch, True)
+                clock.advance(0.35)
+                service.handle_midi_note(pitch, False)
+        clock.advance(3.0)
+
+        self.assertFalse(service.isRunning)
+        self.assertEqual(service.measureAccuracies[:4], [1.0, 1.0, 0.0, 0.0])
+        self.assertEqual(service.accuracy, 0.5)
+        db.record_song_play.assert_called_once_with("/songs/Etude.mid", "Etude", 5.0)
+
+    def test_measures_follow_time_signature_and_tempo_map(self):
+        # 3/4: two bars at 120 BPM, then two at 60 BPM, a quarter note on every beat
+        track = mido.MidiTrack([
+            mido.MetaMessage("time_signature", numerator=3, denominator=4, time=0),
+            mido.MetaMessage("set_tempo", tempo=500000, time=0),
+        ])
+        for beat in range(12):
+            if beat == 6:
+                track.append(mido.MetaMessage("set_tempo", tempo=1000000, time=0))
+            track.append(mido.Message("note_on", note=60 + beat % 3, velocity=80, time=0))
+            track.append(mido.Message("note_off", note=60 + beat % 3, time=480))
+        mid = mido.MidiFile(type=1, ticks_per_beat=480)
+        mid.tracks.append(track)
+        test_dir = Path(tempfile.mkdtemp())
+        try:
+            path = test_dir / "Waltz.mid"
+            mid.save(str(path))
+            service = PlayAlongService(MagicMock(), MidiIngestor(), clock=VirtualClock())
+            service.start(str(path), "Waltz")
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+        self.assertEqual(service._scorer._measure_starts, [0.0, 1.5, 3.0, 6.0])
+        self.assertEqual(service._scorer.expected, [3, 3, 3, 3])
+        self.assertEqual(len(service.measureAccuracies), 4)
+
+    def test_following_a_slower_player(self):
+        clock = VirtualClock()
+        db = MagicMock()
+        notes = make_notes([(60 + i % 5, i * 0.5, 0.2) for i in range(16)])
+        ingestor = MagicMock(load_notes=MagicMock(return_value=(notes, {"duration": 8.0, "tempo_bpm": 120.0})))
+        service = PlayAlongService(db, ingestor, clock=clock)
+        service.setFollowing(True)
+
+        service.start("/songs/Etude.mid", "Etude")
+        # A late start at half the written tempo would be all misses against the clock
+        begin = service.LEAD_IN_SECONDS + 3.0
+        for pitch, start in zip(notes["pitch"].tolist(), notes["start"].tolist()):
+            clock.advance_to(begin + 2 * start)
+            service.handle_midi_note(pitch, True)
+            clock.advance(0.1)
+            service.handle_midi_note(pitch, False)
+        self.assertAlmostEqual(service.tempoRatio, 0.5, places=3)
+        clock.advance(3.0)
+
+        self.assertFalse(service.isRunning)
+        self.assertEqual(service.measureAccuracies[:2], [1.0, 1.0])
+        self.assertEqual(service.accuracy, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
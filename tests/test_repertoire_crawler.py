@@ -0,0 +1,191 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+
+import hashlib
+import threading
+from concurrent.futures import wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logic.services.repertoire_crawler import RepertoireCrawler, page_links
+
+SONGS = {
+    "fur-elise-mid": b"MThd-fur-elise",
+    "ode-to-joy-mid": b"MThd-ode-to-joy",
+}
+
+SEARCH_PAGE = """<html><body>
+<a href="/random">Random</a> <a href="/search?q=next">Next</a>
+{results}
+</body></html>"""
+SONG_PAGE = """<html><body><h1>{slug}</h1>
+<a href="/about">About</a><a href="/uploads/{file}.mid"><span>Download</span> MIDI</a>
+</body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Stand-in for BitMidi: search pages, song pages and MIDI files, all with ETags."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse shows up in client ports
+    server_version = "Fixture"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.ports.add(self.client_address[1])
+        path, _, query = self.path.partition("?")
+        if path == "/search":
+            term = query.split("=", 1)[1].lower()
+            if "elise" in term:
+                results = '<a href="/fur-elise-mid">Fur Elise</a>'
+            elif "beethoven" in term:
+                results = '<a href="/ode-to-joy-mid">Ode</a> <a href="/fur-elise-mid">Fur Elise</a>'
+            elif "ode" in term:
+                results = '<a href="/ode-to-joy-mid">Ode</a>'
+            else:
+                results = "No results"
+            body = SEARCH_PAGE.format(results=results).encode()
+        elif path.lstrip("/") in SONGS:
+            slug = path.lstrip("/")
+            body = SONG_PAGE.format(slug=slug, file=server.file_names.get(slug, slug[:-4])).encode()
+        elif path.startswith("/uploads/"):
+            slug = next(s for s in SONGS if server.file_names.get(s, s[:-4]) + ".mid" == path[9:])
+            body = SONGS[slug]
+        elif path == "/flaky":
+            server.flaky += 1
+            if server.flaky < 2:
+                return self._send(503, b"busy")
+            body = b"ok"
+        else:
+            return self._send(404, b"not found")
+
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:12]
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            return self._send(304, b"", etag)
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRepertoireCrawler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests, self.server.ports = [], set()
+        self.server.not_modified = self.server.flaky = 0
+        self.server.file_names = {}
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.crawler = self._crawler()
+
+    def tearDown(self):
+        self.crawler.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def _crawler(self, max_workers=2):
+        host, port = self.server.server_address
+        return RepertoireCrawler(self.tmp / "repertoire", self.tmp / "http", f"http://{host}:{port}",
+                                 max_workers=max_workers)
+
+    def test_page_links(self):
+        links = page_links(SONG_PAGE.format(slug="x-mid", file="x"))
+        self.assertEqual(links, [("/about", "About"), ("/uploads/x.mid", "Download MIDI")])
+
+    def test_download_then_revalidate(self):
+        path = self.crawler.download("Fur Elise")
+        self.assertEqual(Path(path), self.tmp / "repertoire" / "fur_elise.mid")
+        self.assertEqual(Path(path).read_bytes(), SONGS["fur-elise-mid"])
+        self.assertEqual(self.server.requests, ["/search?q=Fur%20Elise", "/fur-elise-mid", "/uploads/fur-elise.mid"])
+
+        # A fresh crawler (new session, same disk cache) revalidates all three and writes nothing
+        mtime = Path(path).stat().st_mtime_ns
+        self.crawler.shutdown()
+        self.crawler = self._crawler()
+        self.assertEqual(self.crawler.download("Fur Elise"), path)
+        self.assertEqual(self.server.not_modified, 3)
+        self.assertEqual(Path(path).stat().st_mtime_ns, mtime)
+
+    def test_dedupes_by_content(self):
+        first = self.crawler.download("Fur Elise")
+        # The same song under another name on the site is not stored twice
+        self.server.file_names["fur-elise-mid"] = "elise-copy"
+        self.crawler.shutdown()
+        self.crawler = self._crawler()
+        self.assertEqual(self.crawler.download("elise"), first)
+        self.assertEqual(sorted(p.name for p in (self.tmp / "repertoire").iterdir()), ["fur_elise.mid"])
+
+        # A different song whose name is taken doesn't overwrite it
+        self.server.file_names["ode-to-joy-mid"] = "fur-elise"
+        other = Path(self.crawler.download("Ode"))
+        self.assertNotEqual(str(other), first)
+        self.assertEqual(Path(first).read_bytes(), SONGS["fur-elise-mid"])
+        self.assertEqual(other.read_bytes(), SONGS["ode-to-joy-mid"])
+
+    def test_no_results_and_retries(self):
+        self.assertIsNone(self.crawler.download("Nothing Here"))
+        host, port = self.server.server_address
+        # A 503 is retried on the same session
+        self.assertEqual(self.crawler._fetch(f"http://{host}:{port}/flaky"), b"ok")
+        with self.assertRaises(Exception):
+            self.crawler._fetch(f"http://{host}:{port}/missing")
+
+    def test_concurrent_searches_share_the_pool(self):
+        queries = ["Fur Elise", "Ode", "Beethoven", "fur elise", "ODE"] * 4
+        futures = {self.crawler.search_and_download(q) for q in queries}
+        done, _ = wait(futures, timeout=10)
+        self.assertEqual(len(done), len(futures))
+        paths = {f.result() for f in done}
+        self.assertEqual({Path(p).name for p in paths}, {"fur_elise.mid", "ode_to_joy.mid"})
+        # Two workers keep at most two connections open
+        self.assertLessEqual(len(self.server.ports), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
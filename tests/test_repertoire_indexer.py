@@ -0,0 +1,183 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import os
+import json
+import mido
+import numpy as np
+from logic.services.database_manager import DatabaseManager
+from logic.services.repertoire_indexer import RepertoireIndexer, estimate_key, polyphony, index_file
+
+
+def write_scale(path: Path, tonic: int, chord: bool = False):
+    """A one-track piano file: a major scale, optionally as three-note block chords."""
+    track = mido.MidiTrack([mido.MetaMessage("track_name", name="Piano", time=0)])
+    for step in (0, 2, 4, 5, 7, 9, 11, 12):
+        pitches = [tonic + step] + ([tonic + step + 4, tonic + step + 7] if chord else [])
+        for i, p in enumerate(pitches):
+            track.append(mido.Message("note_on", note=p, velocity=80, time=0))
+        for i, p in enumerate(pitches):
+            track.append(mido.Message("note_off", note=p, time=480 if i == 0 else 0))
+    mid = mido.MidiFile(type=1, ticks_per_beat=480)
+    mid.tracks.append(track)
+    mid.save(str(path))
+
+
+class TestRepertoireIndexer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.root = self.test_dir / "repertoire"
+        (self.root / "sub").mkdir(parents=True)
+        for i in range(9):
+            write_scale(self.root / f"Scale_{i}.mid", 60 + i, chord=i % 2 == 1)
+        (self.root / "sub" / "Fur_Elise.mid").write_bytes(
+            (project_root / "database" / "repertoire" / "Fur_Elise.mid").read_bytes())
+        (self.root / "broken.mid").write_bytes(b"not midi")
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def songs(self):
+        return {Path(row["filepath"]).name: row for row in self.db.get_all_song_stats()}
+
+    def test_incremental_scan(self):
+        indexer = RepertoireIndexer(self.db, self.root, max_workers=2)
+        report = indexer.scan()
+        self.assertEqual((report.files, report.parsed, report.failed), (11, 10, 1))
+
+        songs = self.songs()
+        self.assertEqual(songs["Fur_Elise.mid"]["title"], "Fur Elise")
+        self.assertEqual(songs["Fur_Elise.mid"]["key_estimate"], "A Minor")
+        self.assertEqual(songs["Fur_Elise.mid"]["note_count"], 950)
+        self.assertEqual(songs["Fur_Elise.mid"]["piano_track"], "PIANO")
+        self.assertEqual(songs["Scale_0.mid"]["key_estimate"], "C Major")
+        self.assertEqual(songs["Scale_2.mid"]["key_estimate"], "D Major")
+        self.assertEqual(songs["Scale_0.mid"]["max_polyphony"], 1)
+        self.assertEqual(songs["Scale_1.mid"]["max_polyphony"], 3)
+        self.assertAlmostEqual(songs["Scale_0.mid"]["duration_sec"], 4.0)
+        self.assertGreater(songs["Fur_Elise.mid"]["difficulty"], songs["Scale_1.mid"]["difficulty"])
+        self.assertGreater(songs["Scale_1.mid"]["difficulty"], songs["Scale_0.mid"]["difficulty"])
+        self.assertEqual(len(json.loads(songs["Fur_Elise.mid"]["section_difficulty"])), 9)
+
+        # Played songs keep their history when re-indexed
+        self.db.record_song_play(songs["Scale_3.mid"]["filepath"], "Scale 3", 0.5)
+
+        report = indexer.scan()
+        self.assertEqual((report.skipped, report.parsed), (10, 0))
+
+        # Touched but identical: only the stamp is refreshed; edited: parsed again
+        os.utime(self.root / "Scale_0.mid", ns=(10**18, 10**18))
+        write_scale(self.root / "Scale_3.mid", 65)
+        # Same size, and file timestamps can be coarser than this test is fast
+        os.utime(self.root / "Scale_3.mid", ns=(2 * 10**18, 2 * 10**18))
+        report = indexer.scan()
+        self.assertEqual((report.skipped, report.unchanged, report.parsed), (8, 1, 1))
+        songs = self.songs()
+        self.assertEqual(songs["Scale_0.mid"]["file_mtime_ns"], 10**18)
+        self.assertEqual(songs["Scale_3.mid"]["key_estimate"], "F Major")
+        self.assertEqual(songs["Scale_3.mid"]["play_count"], 1)
+        self.assertEqual(songs["Scale_3.mid"]["mastery_score"], 0.5)
+        self.assertEqual(indexer.scan().parsed, 0)
+
+        # Rows from an older index version are parsed again, unchanged files included
+        with self.db._get_connection() as conn:
+            conn.execute("UPDATE songs SET index_version = 1, difficulty = NULL")
+            conn.commit()
+        self.assertEqual(indexer.scan().parsed, 10)
+        self.assertIsNotNone(self.songs()["Scale_0.mid"]["difficulty"])
+
+    def test_deleted_files_are_removed(self):
+        indexer = RepertoireIndexer(self.db, self.root, max_workers=1)
+        indexer.scan()
+        outside = str(self.test_dir / "Elsewhere.mid")
+        self.db.record_song_play(outside, "Elsewhere", 0.2)  # Not the indexer's to remove
+        self.db.record_song_play(self.songs()["Fur_Elise.mid"]["filepath"], "Fur Elise", 0.5)
+        fur_elise = (self.root / "sub" / "Fur_Elise.mid").read_bytes()
+        os.remove(self.root / "Scale_4.mid")
+        os.remove(self.root / "sub" / "Fur_Elise.mid")
+
+        report = indexer.scan()
+        self.assertEqual((report.files, report.removed), (9, 2))
+        songs = self.songs()
+        self.assertNotIn("Scale_4.mid", songs)
+        self.assertIn("Scale_5.mid", songs)
+        self.assertIn("Elsewhere.mid", songs)
+        # A played song keeps its history but leaves the index
+        self.assertIsNone(songs["Fur_Elise.mid"]["content_hash"])
+        self.assertIsNone(songs["Fur_Elise.mid"]["difficulty"])
+        self.assertEqual(songs["Fur_Elise.mid"]["play_count"], 1)
+        self.assertNotIn("Fur Elise", [s["title"] for s in self.db.get_songs_by_difficulty(0.0, 100.0)])
+        self.assertEqual(indexer.scan().removed, 0)
+
+        # Downloaded again: indexed anew, progress intact
+        (self.root / "sub" / "Fur_Elise.mid").write_bytes(fur_elise)
+        self.assertEqual(indexer.scan().parsed, 1)
+        song = self.songs()["Fur_Elise.mid"]
+        self.assertEqual((song["play_count"], song["mastery_score"], song["note_count"]), (1, 0.5, 950))
+
+    def test_held_note_under_a_run(self):
+        # The bass closes after every melody note, so it is read last although it starts first
+        track = mido.MidiTrack([mido.MetaMessage("track_name", name="Piano", time=0),
+                                mido.Message("note_on", note=36, velocity=80, time=0)])
+        for k in range(80):
+            track.append(mido.Message("note_on", note=72 + k % 5, velocity=80, time=0))
+            track.append(mido.Message("note_off", note=72 + k % 5, time=240))
+        track.append(mido.Message("note_off", note=36, time=0))
+        mid = mido.MidiFile(type=1, ticks_per_beat=480)
+        mid.tracks.append(track)
+        path = self.root / "Held_Bass.mid"
+        mid.save(str(path))
+
+        result = index_file(str(path), None)
+        self.assertNotIn("error", result)
+        self.assertEqual(result["note_count"], 81)
+        self.assertEqual(result["max_polyphony"], 2)
+        self.assertEqual(len(json.loads(result["section_difficulty"])), 2)  # 20 s
+
+    def test_polyphony(self):
+        starts = np.array([0.0, 0.0, 1.0, 2.0])
+        ends = np.array([1.0, 2.0, 2.0, 3.0])
+        self.assertEqual(polyphony(starts, ends), (2, 1.67))
+        self.assertEqual(estimate_key(np.array([], dtype=np.int64), np.array([])), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
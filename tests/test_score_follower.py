@@ -0,0 +1,131 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+
+import time
+import numpy as np
+from logic.services.midi_ingestor import NOTE_DTYPE
+from logic.services.score_follower import ScoreFollower, score_events
+
+
+def make_song(n_events: int, step: float = 0.25, chord_every: int = 4, seed: int = 0):
+    """A melody of n_events notes with a three-note chord under every chord_every-th one."""
+    rng = np.random.default_rng(seed)
+    events = []
+    for k in range(n_events):
+        t = k * step
+        events.append((60 + int(rng.integers(0, 12)), t))
+        if k % chord_every == 0:
+            events += [(48, t), (52, t), (55, t)]
+    notes = np.zeros(len(events), dtype=NOTE_DTYPE)
+    notes["pitch"] = [p for p, _ in events]
+    notes["start"] = [t for _, t in events]
+    notes["duration"] = step * 0.8
+    return notes[np.argsort(notes["start"], kind="stable")]
+
+
+def perform(notes, rate_at, start: float = 1.0):
+    """(pitch, performance time, score time) per note, played at rate_at(score time) x the written tempo."""
+    played, perf, last = [], start, 0.0
+    for pitch, t in zip(notes["pitch"].tolist(), notes["start"].tolist()):
+        perf += (t - last) / rate_at(t)
+        last = t
+        played.append((pitch, perf, t))
+    return played
+
+
+class TestScoreFollower(unittest.TestCase):
+    def test_score_events_group_chords(self):
+        notes = make_song(8)
+        times, event_of_note = score_events(notes)
+        self.assertEqual(len(times), 8)
+        self.assertEqual(event_of_note.tolist()[:5], [0, 0, 0, 0, 1])
+
+    def test_follows_tempo_changes(self):
+        notes = make_song(240)
+        follower = ScoreFollower(notes, start_time=1.0)
+        errors = []
+        # Slow (70%) for the first 30 seconds of music, then faster than written
+        for pitch, perf, t in perform(notes, lambda t: 0.7 if t < 30 else 1.25):
+            follower.note_on(pitch, perf)
+            errors.append(abs(follower.score_time_at(perf) - t))
+            if t == 29.75:
+                self.assertAlmostEqual(follower.tempo_ratio, 0.7, places=2)
+        self.assertAlmostEqual(follower.tempo_ratio, 1.25, places=2)
+        self.assertEqual(follower.event_index, 239)
+        self.assertLess(np.percentile(errors, 95), 0.01)
+
+    def test_recovers_from_wrong_and_skipped_notes(self):
+        notes = make_song(120)
+        follower = ScoreFollower(notes)
+        played = perform(notes, lambda t: 1.0)
+        for k, (pitch, perf, t) in enumerate(played):
+            if 100 <= k < 108:
+                continue  # A skipped beat or two
+            if k % 10 == 5:
+                follower.note_on(pitch + 1, perf)  # A wrong note on top
+            follower.note_on(pitch, perf)
+        self.assertEqual(follower.event_index, 119)
+        self.assertAlmostEqual(follower.score_time_at(played[-1][1]), 29.75, places=6)
+
+    def test_waits_for_a_player_who_stops(self):
+        notes = make_song(16)
+        follower = ScoreFollower(notes, start_time=1.0)
+        # Before the first note the song time stops at the first onset
+        self.assertEqual(follower.score_time_at(100.0), 0.0)
+        for pitch, perf, t in perform(notes, lambda t: 1.0)[:9]:
+            follower.note_on(pitch, perf)
+        self.assertEqual(follower.event_index, 4)  # Two notes into the chord at 1.0 s
+        self.assertEqual(follower.score_time_at(60.0), 1.25)  # The next onset, not beyond
+
+    def test_per_note_cost_does_not_grow_with_song_length(self):
+        def cost(n_events):
+            notes = make_song(n_events, step=0.05)
+            follower = ScoreFollower(notes)
+            played = perform(notes, lambda t: 0.9)
+            begin = time.perf_counter()
+            for pitch, perf, _ in played:
+                follower.note_on(pitch, perf)
+            self.assertEqual(follower.event_index, n_events - 1)
+            return (time.perf_counter() - begin) / len(played)
+
+        short, long = cost(200), cost(20000)
+        self.assertLess(long, 3 * short + 20e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
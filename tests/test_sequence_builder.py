@@ -0,0 +1,133 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import pretty_midi
+from unittest.mock import patch
+import mido
+import numpy as np
+from logic.services.midi_ingestor import read_note_array
+from logic.services.sequence_builder import SequenceBuilder, build_sequence, beat_times
+
+
+def write_test_midi(path: Path, bpm: float = 90.0, nudge: float = 0.0):
+    """Two bars of a right-hand melody over left-hand chords, slightly off the grid."""
+    pm = pretty_midi.PrettyMIDI(initial_tempo=bpm)
+    piano = pretty_midi.Instrument(program=0, name="Piano")
+    beat = 60.0 / bpm
+    melody = [72, 74, 76, 77, 79, 77, 76, 74]
+    for i, pitch in enumerate(melody):
+        start = i * beat + (0.03 if i % 2 else -0.02) + nudge
+        piano.notes.append(pretty_midi.Note(velocity=80, pitch=pitch, start=max(start, 0), end=start + beat * 0.9))
+        # An inner voice under the melody, which the right hand drops
+        piano.notes.append(pretty_midi.Note(velocity=60, pitch=pitch - 5, start=max(start, 0), end=start + beat * 0.9))
+    for bar in range(2):
+        for pitch in (48, 52, 55):
+            piano.notes.append(pretty_midi.Note(velocity=70, pitch=pitch, start=bar * 4 * beat, end=(bar * 4 + 4) * beat))
+    pm.instruments.append(piano)
+    pm.write(str(path))
+
+
+class TestSequenceBuilder(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.midi = self.test_dir / "Test_Piece.mid"
+        write_test_midi(self.midi)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_easy_level_is_quantized_right_hand_melody(self):
+        level = SequenceBuilder().convert(self.midi, 1)
+        self.assertEqual(level["title"], "Test Piece")
+        self.assertEqual(level["tempo_bpm"], 90)
+        self.assertEqual(level["time_signature"], [4, 4])
+        self.assertEqual([n["pitch"] for n in level["notes"]], [72, 74, 76, 77, 79, 77, 76, 74])
+        self.assertEqual([n["start_beat"] for n in level["notes"]], [float(i) for i in range(8)])
+        self.assertTrue(all(n["hand"] == "R" and n["duration_beats"] == 1.0 for n in level["notes"]))
+
+    def test_harder_level_adds_bass_line(self):
+        level = SequenceBuilder().convert(self.midi, 5)
+        left = [n for n in level["notes"] if n["hand"] == "L"]
+        self.assertEqual([(n["pitch"], n["start_beat"]) for n in left], [(48, 0.0), (48, 4.0)])
+        # Held bass notes are cut off where the next one starts
+        self.assertEqual(left[0]["duration_beats"], 4.0)
+        self.assertEqual(len([n for n in level["notes"] if n["hand"] == "R"]), 8)
+
+    def test_cache_by_file_hash(self):
+        cache = self.test_dir / "cache"
+        first = SequenceBuilder(cache).convert(self.midi, 3)
+        self.assertEqual(len(list(cache.glob("*.json"))), 1)
+
+        # A fresh builder (new process) reads the cached level instead of parsing the MIDI
+        with patch("logic.services.midi_ingestor.read_note_array", side_effect=AssertionError("MIDI was parsed again")):
+            self.assertEqual(SequenceBuilder(cache).convert(self.midi, 3), first)
+
+        # Changed file contents mean a new cache entry
+        write_test_midi(self.midi, bpm=120)
+        self.assertEqual(SequenceBuilder(cache).convert(self.midi, 3)["tempo_bpm"], 120)
+        self.assertEqual(len(list(cache.glob("*.json"))), 2)
+
+    def test_beat_grid_matches_pretty_midi(self):
+        # Tempo changes on and between beats
+        mid = mido.MidiFile(type=1, ticks_per_beat=96)
+        mid.tracks.append(mido.MidiTrack([
+            mido.MetaMessage("set_tempo", tempo=500000, time=0),
+            mido.MetaMessage("set_tempo", tempo=1000000, time=144),
+            mido.MetaMessage("set_tempo", tempo=400000, time=288),
+        ]))
+        mid.tracks.append(mido.MidiTrack([
+            mido.Message("note_on", note=60, velocity=80, time=0),
+            mido.Message("note_off", note=60, time=960),
+        ]))
+        path = self.test_dir / "tempo.mid"
+        mid.save(str(path))
+        pm = pretty_midi.PrettyMIDI(str(path))
+        _, _, timing = read_note_array(str(path))
+        expected = pm.get_beats()
+        np.testing.assert_allclose(beat_times(timing["tempo_changes"], pm.get_end_time())[:len(expected)],
+                                   expected, atol=1e-6)
+
+    def test_repertoire_file_converts(self):
+        path = project_root / "database" / "repertoire" / "Fur_Elise.mid"
+        levels = SequenceBuilder().convert_all([path], [1, 8])
+        self.assertEqual([lvl["level"] for lvl in levels], [1, 2])
+        self.assertEqual(len(levels[0]["notes"]), 14)
+        self.assertEqual(levels[1]["time_signature"], [3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
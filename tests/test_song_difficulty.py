@@ -0,0 +1,150 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import contextlib
+import io
+import json
+import time
+import numpy as np
+from logic.services.database_manager import DatabaseManager
+from logic.services.curriculum_service import CurriculumService
+from logic.services.midi_ingestor import MidiIngestor, NOTE_DTYPE
+from logic.services.song_difficulty import estimate_difficulty, SECTION_SECONDS
+
+
+def make_notes(events):
+    """(pitch, start, duration) triples -> time-sorted NOTE_DTYPE array."""
+    notes = np.zeros(len(events), dtype=NOTE_DTYPE)
+    for i, (pitch, start, duration) in enumerate(events):
+        notes[i] = (pitch, start, duration, 80, 0, 0)
+    return notes[np.argsort(notes["start"], kind="stable")]
+
+
+class TestSongDifficulty(unittest.TestCase):
+    def test_features(self):
+        # C major scale, one note a second, right hand only
+        scale = make_notes([(60 + step, float(i), 1.0) for i, step in enumerate((0, 2, 4, 5, 7, 9, 11, 12))])
+        easy = estimate_difficulty(scale, tempo_bpm=60)
+        self.assertEqual(easy.features["accidental_ratio"], 0.0)
+        self.assertEqual(easy.features["chord_density"], 0.0)
+        self.assertEqual(easy.features["leap_ratio"], 0.0)
+        self.assertAlmostEqual(easy.features["note_density"], 1.0)
+
+        # Chromatic block chords in both hands with octave jumps, four a second
+        events = []
+        for i in range(40):
+            root = 60 + (i * 13) % 24
+            events += [(root, i * 0.25, 0.25), (root + 3, i * 0.25, 0.25), (root + 6, i * 0.25, 0.25),
+                       (36 + (i * 11) % 20, i * 0.25 + 0.1, 0.2)]
+        hard = estimate_difficulty(make_notes(events), tempo_bpm=150)
+        self.assertGreater(hard.features["chord_density"], 3.5)
+        self.assertGreater(hard.features["hand_span"], 12)
+        self.assertGreater(hard.score, easy.score + 4)
+        self.assertLessEqual(hard.score, 10.0)
+
+        self.assertEqual(estimate_difficulty(scale[:0]).score, 0.0)
+
+    def test_full_song_sections_and_speed(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            notes, meta = MidiIngestor().load_notes(str(project_root / "database" / "repertoire" / "Fur_Elise.mid"))
+        start = time.perf_counter()
+        report = estimate_difficulty(notes, meta["tempo_bpm"])
+        elapsed = time.perf_counter() - start
+
+        span = float(notes["start"][-1] - notes["start"][0])
+        self.assertEqual(len(report.sections), int(span // SECTION_SECONDS) + 1)
+        self.assertTrue(min(report.sections) <= report.score <= max(report.sections) + 1.0)
+        self.assertLess(elapsed, 0.1)
+
+
+class TestRepertoireRecommendation(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        resources = self.test_dir / "resources"
+        resources.mkdir()
+        milestone = {"title": "Song", "exercise_types": ["song_application"], "target_keys": ["C"],
+                     "target_chords": [], "min_attempts_to_advance": 1, "min_accuracy_to_advance": 0.0}
+        (resources / "curriculum_tracks.json").write_text(json.dumps({"repertoire": [
+            dict(milestone, id="first_song", order=1), dict(milestone, id="second_song", order=2)]}))
+        self.db.upsert_song_index([
+            {"filepath": f"/songs/{title}.mid", "title": title, "mtime_ns": 0, "size": 0, "content_hash": title,
+             "duration_sec": 60.0, "note_count": 100, "key_estimate": "C Major", "piano_track": "Piano",
+             "max_polyphony": 3, "mean_polyphony": 1.5, "index_version": 2, "difficulty": difficulty,
+             "section_difficulty": "[]", "difficulty_features": "{}"}
+            for title, difficulty in (("Twinkle", 1.0), ("Minuet", 2.2), ("Ode", 2.6), ("Sonatina", 3.4),
+                                      ("Etude", 6.0))])
+        self.service = CurriculumService(self.db, resources)
+
+    def tearDown(self):
+        import gc
+        del self.service
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def titles(self):
+        return [s["title"] for s in self.service.recommend_repertoire()]
+
+    def test_recommendations_follow_progress(self):
+        self.assertEqual(self.titles(), ["Minuet", "Ode", "Twinkle"])
+
+        # The repertoire block of a session plan carries the same suggestions
+        plan = self.service.plan_session()
+        self.assertEqual([s["title"] for s in plan["blocks"][0]["songs"]], ["Minuet", "Ode", "Twinkle"])
+
+        # Completing a milestone raises the target to 3.0
+        self.service.complete_exercise("C Major", success=True, track="repertoire", milestone_id="first_song")
+        self.assertEqual(self.titles(), ["Ode", "Sonatina", "Minuet"])
+
+        # Mastering Sonatina lifts the target to 3.9; mastered songs aren't suggested again
+        self.db.record_song_play("/songs/Sonatina.mid", "Sonatina", 80.0)
+        self.assertEqual(self.titles(), ["Ode"])
+
+    def test_block_targets_song_chords(self):
+        charts = {"/songs/Minuet.mid": [], "/songs/Ode.mid": [
+            {"start": 0.0, "end": 1.0, "chord": "G Major", "root_idx": 7, "chord_type_name": "Major"},
+            {"start": 1.0, "end": 4.0, "chord": "C Major", "root_idx": 0, "chord_type_name": "Major"}]}
+        self.service.midi_ingestor = MagicMock(load_chord_chart=lambda path: charts[path])
+        block = self.service.plan_session()["blocks"][0]
+        # Minuet has no readable chords, so the block falls through to Ode
+        self.assertEqual(block["song_title"], "Ode")
+        self.assertEqual(block["target_chords"], ["C Major", "G Major"])
+
+
+if __name__ == "__main__":
+    unittest.main()
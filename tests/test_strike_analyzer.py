@@ -0,0 +1,111 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.strike_analyzer import StrikeAnalyzer
+from logic.services.midi_replay import ReplayHarness, NoteEvent
+
+class TestStrikeAnalyzer(unittest.TestCase):
+    def test_capture_reports_spread_order_and_lag(self):
+        strike = StrikeAnalyzer()
+        strike.note_on(64, 1.000)
+        strike.note_on(67, 1.010)
+        strike.note_on(60, 1.045)
+        report = strike.capture({60, 64, 67})
+        self.assertAlmostEqual(report.onset_spread_ms, 45.0)
+        self.assertEqual(report.arrival_order, [2, 3, 1])
+        self.assertEqual(report.lagging_finger, 1)
+        self.assertAlmostEqual(report.lag_ms, 35.0)
+
+    def test_released_stray_note_is_ignored(self):
+        strike = StrikeAnalyzer()
+        strike.note_on(60, 0.0)     # Stray C, let go before the real strike
+        strike.note_off(60, 0.2)
+        for pitch in (60, 64, 67):
+            strike.note_on(pitch, 2.0)
+        self.assertEqual(strike.capture({60, 64, 67}).onset_spread_ms, 0.0)
+
+    def test_release_spread_completes_committed_report(self):
+        strike = StrikeAnalyzer()
+        for pitch in (60, 64, 67):
+            strike.note_on(pitch, 1.0)
+        strike.capture({60, 64, 67})
+        strike.commit("C Major")
+        self.assertIsNone(strike.note_off(60, 2.00))
+        self.assertIsNone(strike.note_off(64, 2.05))
+        report = strike.note_off(67, 2.12)
+        self.assertEqual(report.chord_name, "C Major")
+        self.assertAlmostEqual(report.release_spread_ms, 120.0)
+
+
+class TestStrikePersistence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(self.test_dir / "test.db")
+        self.clock = VirtualClock()
+
+    def tearDown(self):
+        import gc
+        del self.db
+        gc.collect()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_attempt_timing_is_stored_per_strike(self):
+        trainer = ChordTrainerService(self.db, clock=self.clock)
+        intervals = trainer.CHORD_TYPES["Major"]
+        trainer._apply_random_step = lambda: trainer._setup_target(0, "Major", intervals, 4)
+        trainer.start_session()
+
+        t = self.clock.now() + 0.5
+        ReplayHarness(self.clock, trainer.handle_midi_note).play([
+            NoteEvent(t, 72, True), NoteEvent(t + 0.3, 72, False),          # Stray note before the chord
+            NoteEvent(t + 1.0, 60, True), NoteEvent(t + 1.02, 64, True), NoteEvent(t + 1.2, 67, True),
+            NoteEvent(t + 2.0, 60, False), NoteEvent(t + 2.0, 64, False), NoteEvent(t + 2.03, 67, False),
+        ])
+
+        summary = self.db.get_strike_summary()
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]["chord_name"], "C Major")
+        self.assertAlmostEqual(summary[0]["onset_spread_ms"], 200.0, places=3)
+        self.assertAlmostEqual(summary[0]["release_spread_ms"], 30.0, places=3)
+        self.assertEqual(summary[0]["lagging_finger"], 3)
+        self.assertIn("finger 3 usually arrives last", self.db.get_coach_context())
+
+if __name__ == "__main__":
+    unittest.main()
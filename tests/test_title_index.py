@@ -0,0 +1,147 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+
+import os
+from logic.services.title_index import TitleIndex, normalize, trigrams
+
+
+class TestTitleIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.root = self.tmp / "repertoire"
+        for name in ("Fur_Elise.mid", "Beethoven/Moonlight_Sonata.mid", "Beethoven/Ode-to-Joy.midi",
+                     "Chopin/NocturneOp9No2.mid", "Twinkle_Twinkle_Little_Star.mid", "notes.txt"):
+            self._write(name)
+        self.index_path = self.tmp / "cache" / "title_index.json"
+        self.index = TitleIndex(self.root, self.index_path)
+        self.index.refresh()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, data=b"MThd"):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def _best(self, query, index=None):
+        hits = (index or self.index).search(query)
+        return Path(hits[0]["path"]).name if hits else None
+
+    def test_normalize_and_trigrams(self):
+        self.assertEqual(normalize("Für_Elise (Bagatelle 59)"), "fur elise bagatelle 59")
+        self.assertEqual(normalize("NocturneOp9No2"), "nocturne op 9 no 2")
+        self.assertEqual(trigrams("ab"), ["  a", " ab", "ab "])
+        self.assertEqual(trigrams("ab", open_end=True), ["  a", " ab"])
+
+    def test_fuzzy_queries(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self._best("Für Elise"), "Fur_Elise.mid")
+        self.assertEqual(self._best("fuer elise"), "Fur_Elise.mid")       # Spelling variant
+        self.assertEqual(self._best("moonlite sonata"), "Moonlight_Sonata.mid")
+        self.assertEqual(self._best("twinkle twin"), "Twinkle_Twinkle_Little_Star.mid")  # Still typing
+        self.assertEqual(self._best("chopin nocturne"), "NocturneOp9No2.mid")           # Folder and CamelCase
+        self.assertEqual({Path(h["path"]).name for h in self.index.search("beethoven")},
+                         {"Moonlight_Sonata.mid", "Ode-to-Joy.midi"})
+        self.assertEqual(self.index.search("rachmaninoff prelude"), [])
+        self.assertEqual(self.index.search("  "), [])
+        self.assertEqual(self.index.search("fur elise", limit=0), [])
+        self.assertEqual(len(self.index.search("beethoven", limit=1)), 1)
+
+    def test_incremental_refresh_and_persistence(self):
+        self.assertEqual(self.index.refresh(), 0)
+        self._write("Clair_de_Lune.mid")
+        os.remove(self.root / "Fur_Elise.mid")
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self._best("clair de lune"), "Clair_de_Lune.mid")
+        self.assertIsNone(self._best("fur elise"))
+
+        # A new instance answers from disk before any refresh
+        reloaded = TitleIndex(self.root, self.index_path)
+        self.assertEqual(len(reloaded), 5)
+        self.assertEqual(self._best("clair de lune", reloaded), "Clair_de_Lune.mid")
+        self.assertEqual(reloaded.refresh(), 0)
+
+        # A single new file (e.g. a download) can be added without a walk
+        self.assertTrue(reloaded.update_file(str(self._write("Gymnopedie_No1.mid"))))
+        self.assertEqual(self._best("gymnopedie", reloaded), "Gymnopedie_No1.mid")
+
+    def test_tombstones_are_compacted(self):
+        for name in list(self.root.rglob("*.mid*")):
+            name.unlink()
+        self._write("Canon_in_D.mid")
+        self.index.refresh()
+        reloaded = TitleIndex(self.root, self.index_path)
+        self.assertEqual(len(reloaded._docs), 1)
+        self.assertEqual(self._best("canon in d", reloaded), "Canon_in_D.mid")
+
+    def test_local_match_needs_the_title_itself(self):
+        self._write("Beethoven/Fur_Elise.mid")
+        self._write("Beethoven/Symphony_9.mid")
+        self.index.refresh()
+
+        def local(query):
+            hit = self.index.local_match(query)
+            return str(Path(hit["path"]).relative_to(self.root)) if hit else None
+
+        self.assertEqual(local("Für Elise"), "Fur_Elise.mid")
+        self.assertEqual(local("beethoven symphony 9"), str(Path("Beethoven/Symphony_9.mid")))
+        self.assertEqual(local("moonlight son"), str(Path("Beethoven/Moonlight_Sonata.mid")))  # Still typing
+        # Near misses go to the network, however well search() ranks them
+        self.assertTrue(self.index.search("beethoven pathetique"))
+        self.assertIsNone(local("beethoven pathetique"))  # Only the folder matches
+        self.assertIsNone(local("beethoven"))
+        self.assertIsNone(local("symphony 5"))            # Numbers must agree
+        self.assertIsNone(local("moonlite sonata"))       # Typos may name another song
+        self.assertIsNone(local("ode to joy remix"))
+
+    def test_large_index(self):
+        # Timing lives in scripts/bench_title_index.py
+        words = ["sonata", "prelude", "etude", "waltz", "nocturne", "minuet", "march", "rondo", "fugue", "suite"]
+        keys = ["C", "D", "E", "F", "G", "A", "B"]
+        for k in range(2000):
+            self._write(f"Composer{k % 40}/{words[k % 10]}_{words[(k // 10) % 10]}_in_{keys[k % 7]}_No{k}.mid")
+        self.index.refresh()
+        self.assertEqual(self._best("prelude fugue no 1281"), "prelude_fugue_in_C_No1281.mid")
+        self.assertEqual(Path(self.index.local_match("prelude fugue no 1281")["path"]).name,
+                         "prelude_fugue_in_C_No1281.mid")
+        self.assertIsNone(self.index.local_match("prelude fugue no 9999"))
+
+if __name__ == "__main__":
+    unittest.main()
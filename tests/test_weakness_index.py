@@ -0,0 +1,87 @@
+import unittest
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# 1. Mock PySide6 BEFORE importing the services
+class MockSignal:
+    def __init__(self, *args, **kwargs): pass
+    def emit(self, *args, **kwargs): pass
+    def connect(self, slot): pass
+
+def MockProperty(type_hint, notify=None):
+    def decorator(func):
+        return property(func)
+    return decorator
+
+def MockSlot(*args, **kwargs):
+    def decorator(func): return func
+    return decorator
+
+mock_qt = MagicMock()
+mock_qt.QtCore.QObject = MagicMock
+mock_qt.QtCore.Signal = MockSignal
+mock_qt.QtCore.Property = MockProperty
+mock_qt.QtCore.Slot = MockSlot
+
+sys.modules['PySide6'] = mock_qt
+sys.modules['PySide6.QtCore'] = mock_qt.QtCore
+sys.modules['PySide6.QtGui'] = mock_qt
+sys.modules['PySide6.QtQml'] = mock_qt
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+import random
+from collections import Counter
+from logic.services.database_manager import DatabaseManager
+from logic.services.chord_trainer import ChordTrainerService
+from logic.services.clock import VirtualClock
+from logic.services.weakness_index import AliasTable, WeaknessIndex
+
+class TestAliasTable(unittest.TestCase):
+    def test_sampling_matches_weights(self):
+        table = AliasTable([1.0, 3.0, 0.0, 6.0])
+        rng = random.Random(7)
+        counts = Counter(table.sample(rng) for _ in range(20000))
+        self.assertEqual(counts[2], 0)
+        self.assertAlmostEqual(counts[0] / 20000, 0.1, delta=0.015)
+        self.assertAlmostEqual(counts[3] / 20000, 0.6, delta=0.015)
+
+
+class TestWeaknessIndex(unittest.TestCase):
+    def test_failures_raise_weight_incrementally(self):
+        index = WeaknessIndex(["C Major", "F# Minor"], rng=random.Random(1))
+        index.load([{"name": "C Major", "success_count": 40, "fail_count": 0, "p50_latency_ms": 900.0,
+                     "last_played": "2026-10-18T10:00:00"}])
+        now = index._last_played[0] + 60
+        self.assertLess(index.weight(0, now), index.weight(1, now))
+        index.record("C Major", False, now=now)
+        after_one = index.weight(0, now)
+        index.record("C Major", False, now=now)
+        self.assertGreater(index.weight(0, now), after_one)
+
+    def test_free_practice_draws_without_db_queries(self):
+        test_dir = Path(tempfile.mkdtemp())
+        try:
+            db = DatabaseManager(test_dir / "test.db")
+            for _ in range(30):
+                db.record_chord_attempt("Eb Diminished", False, 5000.0)
+            trainer = ChordTrainerService(db, clock=VirtualClock())
+            db.get_all_chord_stats = MagicMock(wraps=db.get_all_chord_stats)
+            trainer._weakness_index = None
+            drawn = Counter()
+            for _ in range(2000):
+                trainer._apply_random_step()
+                drawn[trainer._target_chord_name] += 1
+            # Seeded once from the DB, then every draw is served from memory
+            self.assertEqual(trainer.db.get_all_chord_stats.call_count, 1)
+            self.assertGreater(drawn["Eb Diminished"], 2 * 2000 / len(trainer._weakness_index.candidates))
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    unittest.main()